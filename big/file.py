@@ -25,8 +25,10 @@ THE USE OR OTHER DEALINGS IN THE SOFTWARE.
 """
 
 import builtins
+import concurrent.futures
 import fnmatch
 import glob
+import mmap
 import os.path
 from pathlib import Path
 import re
@@ -50,8 +52,156 @@ import shutil
 which = export(shutil.which)
 
 
+def _open(path, mode, encoding):
+    if isinstance(path, Path):
+        return path.open(mode, encoding=encoding)
+    return open(path, mode, encoding=encoding)
+
+
+# lazy fgrep and grep read str files this many characters at a time.
+_grep_block_size = 1 << 20
+
+
+def _grep_offsets(haystack, search, separator, start, end):
+    """
+    Yields (line_start, line_end) for every line in haystack[start:end]
+    containing a hit.  start must be the start of a line.
+
+    search(haystack, pos, end) returns the offset of the first
+    hit at or after pos, or -1 if there aren't any more.
+
+    Rather than splitting haystack into lines, we find the
+    next hit, then look for line boundaries only around it.
+    """
+    while start <= end:
+        hit = search(haystack, start, end)
+        if hit < 0:
+            return
+        line_start = haystack.rfind(separator, start, hit) + 1 or start
+        line_end = haystack.find(separator, hit, end)
+        if line_end < 0:
+            line_end = end
+        yield line_start, line_end
+        start = line_end + 1
+
+
+def _count_separators(buffer, separator, start, end):
+    # mmap objects don't have a count method,
+    # and slicing one makes a copy.  so count
+    # in bounded-size slices.
+    count = 0
+    while start < end:
+        stop = min(start + _grep_block_size, end)
+        count += buffer[start:stop].count(separator)
+        start = stop
+    return count
+
+
+def _grep_mmap(path, search, verify, enumerate):
+    """
+    Lazy grep for bytes.  Memory-maps the file at path
+    and searches the raw buffer.
+
+    search is as in _grep_offsets.  If verify is not None,
+    it's called on every line containing a hit; if it returns
+    false, the line doesn't match after all.
+    """
+    separator = b'\n'
+    with _open(path, 'rb', None) as f:
+        size = os.fstat(f.fileno()).st_size
+        if not size:
+            # you can't mmap an empty file.
+            # (but an empty file still has one empty line!)
+            buffer = b''
+        else:
+            buffer = mmap.mmap(f.fileno(), 0, access=mmap.ACCESS_READ)
+
+        try:
+            line_number = 1
+            counted = 0
+            for start, end in _grep_offsets(buffer, search, separator, 0, size):
+                line = buffer[start:end]
+                if verify and (not verify(line)):
+                    continue
+                if not enumerate:
+                    yield line
+                    continue
+                line_number += _count_separators(buffer, separator, counted, start)
+                counted = start
+                yield (line_number, line)
+        finally:
+            if size:
+                buffer.close()
+
+
+def _grep_blocks(path, encoding, search, verify, enumerate, lower):
+    """
+    Lazy grep for str.  Reads the file at path in text mode,
+    in blocks of _grep_block_size characters, and searches
+    each block of complete lines.  (Text mode means we get
+    the same decoding and newline translation as the eager
+    versions of fgrep and grep.)
+
+    search and verify are as in _grep_mmap.  If lower is true,
+    search is run on a lowercased copy of each block.
+    """
+    separator = '\n'
+    with _open(path, 'rt', encoding) as f:
+        read = f.read
+        line_number = 1
+        # the text we've read since the last linebreak.
+        # it never contains a linebreak, so we only search each
+        # new block for one, and only join the pieces once we find
+        # one (or hit the end of the file).  this keeps a very long
+        # line from costing quadratic time.
+        pending = []
+        while True:
+            block = read(_grep_block_size)
+            if block:
+                end = block.rfind(separator)
+                if end < 0:
+                    pending.append(block)
+                    continue
+                pending.append(block[:end])
+                text = ''.join(pending)
+                pending = [block[end + 1:]]
+            else:
+                text = ''.join(pending)
+
+            haystack = text.lower() if lower else text
+
+            if len(haystack) == len(text):
+                counted = 0
+                for start, end in _grep_offsets(haystack, search, separator, 0, len(text)):
+                    line = text[start:end]
+                    if verify and (not verify(line)):
+                        continue
+                    if not enumerate:
+                        yield line
+                        continue
+                    line_number += text.count(separator, counted, start)
+                    counted = start
+                    yield (line_number, line)
+                line_number += text.count(separator, counted)
+            else:
+                # lowercasing changed the length of the text!
+                # (str.lower turns '\u0130' into two characters.)
+                # so offsets in haystack don't line up with text.
+                # fall back to checking this block line by line.
+                for line, lower_line in zip(text.split(separator), haystack.split(separator)):
+                    if (search(lower_line, 0, len(lower_line)) >= 0) and ((not verify) or verify(line)):
+                        yield (line_number, line) if enumerate else line
+                    line_number += 1
+                line_number -= 1
+
+            if not block:
+                return
+            # count the linebreak we sliced off the end of text
+            line_number += 1
+
+
 @export
-def fgrep(path, text, *, encoding=None, enumerate=False, case_insensitive=False):
+def fgrep(path, text, *, encoding=None, enumerate=False, case_insensitive=False, lazy=False):
     """
     Find the lines of a file that match some text, like the UNIX "fgrep"
     utility program.
@@ -82,6 +232,13 @@ def fgrep(path, text, *, encoding=None, enumerate=False, case_insensitive=False)
     For simplicity of implementation, the entire file is read in to memory
     at one time.  If `case_insensitive` is True, fgrep also makes a
     lowercased copy.
+
+    If lazy is true, fgrep instead returns an iterator, which searches
+    the file incrementally and yields the same values.  If text is bytes,
+    the iterator memory-maps the file and searches the raw buffer; if
+    text is str, it reads and decodes the file in large blocks.  Either
+    way it only examines line boundaries around each match, and memory
+    use stays roughly constant no matter how large the file is.
     """
     if isinstance(text, bytes):
         if encoding is not None:
@@ -91,11 +248,30 @@ def fgrep(path, text, *, encoding=None, enumerate=False, case_insensitive=False)
     else:
         mode = 'rt'
         separator = '\n'
-    if isinstance(path, Path):
-        f = path.open(mode, encoding=encoding)
-    else:
-        f = open(path, mode, encoding=encoding)
-    with f:
+
+    if lazy:
+        if case_insensitive:
+            text = text.lower()
+        if separator in text:
+            # lines never contain a linebreak.
+            def search(haystack, pos, end):
+                return -1
+        elif case_insensitive and (mode == 'rb'):
+            # we can't lowercase an mmap.  but a bytes pattern
+            # with IGNORECASE only folds ASCII, exactly like bytes.lower.
+            search_pattern = re.compile(re.escape(text), re.IGNORECASE).search
+            def search(haystack, pos, end):
+                match = search_pattern(haystack, pos, end)
+                return match.start() if match else -1
+        else:
+            def search(haystack, pos, end):
+                return haystack.find(text, pos, end)
+
+        if mode == 'rb':
+            return _grep_mmap(path, search, None, enumerate)
+        return _grep_blocks(path, encoding, search, None, enumerate, case_insensitive)
+
+    with _open(path, mode, encoding) as f:
         contents = f.read()
         split = contents.split(separator)
         if not case_insensitive:
@@ -112,7 +288,7 @@ def fgrep(path, text, *, encoding=None, enumerate=False, case_insensitive=False)
 
 
 @export
-def grep(path, pattern, *, encoding=None, enumerate=False, flags=0):
+def grep(path, pattern, *, encoding=None, enumerate=False, flags=0, lazy=False):
     """
     Look for matches to a regular expression pattern in the lines of a file,
     like the UNIX "grep" utility program.
@@ -146,6 +322,17 @@ def grep(path, pattern, *, encoding=None, enumerate=False, flags=0):
     For simplicity of implementation, the entire file is read in to memory
     at one time.
 
+    If lazy is true, grep instead returns an iterator, which searches
+    the file incrementally and yields the same values.  If pattern uses
+    bytes, the iterator memory-maps the file and searches the raw buffer;
+    if pattern uses str, it reads and decodes the file in large blocks.
+    Either way, it searches the whole buffer (with re.MULTILINE added to
+    the pattern's flags), then confirms each hit by searching the line
+    it's in with your original pattern.  This avoids splitting every line,
+    and memory use stays roughly constant no matter how large the file is.
+    (Patterns that peek across line boundaries--using \A, \Z, or lookbehind
+    assertions, for example--may miss lines that the eager grep would find.)
+
     Tip: to perform a case-insensitive pattern match, pass in the
     re.IGNORECASE flag into flags for this function (if pattern is a string
     or bytes) or when creating your regular expression object (if pattern is
@@ -164,11 +351,18 @@ def grep(path, pattern, *, encoding=None, enumerate=False, flags=0):
     else:
         mode = 'rt'
         separator = '\n'
-    if isinstance(path, Path):
-        f = path.open(mode, encoding=encoding)
-    else:
-        f = open(path, mode, encoding=encoding)
-    with f:
+
+    if lazy:
+        search_pattern = re.compile(pattern.pattern, pattern.flags | re.MULTILINE).search
+        def search(haystack, pos, end):
+            match = search_pattern(haystack, pos, end)
+            return match.start() if match else -1
+
+        if mode == 'rb':
+            return _grep_mmap(path, search, pattern.search, enumerate)
+        return _grep_blocks(path, encoding, search, pattern.search, enumerate, False)
+
+    with _open(path, mode, encoding) as f:
         text = f.read()
         split = text.split(separator)
         if enumerate:
@@ -177,6 +371,103 @@ def grep(path, pattern, *, encoding=None, enumerate=False, flags=0):
         return [line for line in split if pattern.search(line)]
 
 
+def _grep_many_worker(path, pattern, encoding):
+    # runs in the worker.  (it's at module scope so it can be pickled.)
+    return grep(path, pattern, encoding=encoding, enumerate=True)
+
+
+def _grep_many(paths, pattern, encoding, executor, max_workers, max_pending, ordered):
+    shutdown = executor is None
+    if shutdown:
+        executor = concurrent.futures.ProcessPoolExecutor(max_workers=max_workers)
+
+    submit = executor.submit
+    paths = iter(paths)
+    # pending maps futures to their paths.
+    # (dicts preserve insertion order, so that's also submission order.)
+    pending = {}
+
+    def fill():
+        while len(pending) < max_pending:
+            for path in paths:
+                pending[submit(_grep_many_worker, path, pattern, encoding)] = path
+                break
+            else:
+                return
+
+    try:
+        fill()
+        while pending:
+            if ordered:
+                future = next(iter(pending))
+                done = (future,)
+            else:
+                done, _ = concurrent.futures.wait(pending, return_when=concurrent.futures.FIRST_COMPLETED)
+            for future in done:
+                path = pending.pop(future)
+                results = future.result()
+                # refill before yielding, so the workers
+                # stay busy while the caller processes results.
+                fill()
+                for line_number, line in results:
+                    yield (path, line_number, line)
+    finally:
+        for future in pending:
+            future.cancel()
+        if shutdown:
+            executor.shutdown(wait=True)
+
+
+@export
+def grep_many(paths, pattern, *, encoding=None, flags=0, executor=None, max_workers=None, max_pending=None, ordered=True):
+    """
+    Like grep, but searches many files in parallel.
+
+    paths should be an iterable of paths, each one an object
+    that grep accepts as its path argument.  pattern, encoding,
+    and flags behave exactly as they do with grep.
+
+    Returns an iterator yielding 3-tuples of
+        (path, line_number, line)
+    for every line matching pattern, in every file.  The first line
+    of a file is line number 1.
+
+    grep_many runs grep on each file using a concurrent.futures
+    executor.  If executor is None (the default), grep_many creates
+    a ProcessPoolExecutor with max_workers workers, and shuts it down
+    when the iterator is exhausted or closed.  Otherwise executor should
+    be a concurrent.futures.Executor; grep_many submits work to it, but
+    doesn't shut it down.  (Searching is mostly CPU-bound, so you'll
+    usually want processes, not threads.)
+
+    max_pending is the maximum number of files grep_many has in flight
+    at any time--submitted to the executor, but whose results haven't
+    been yielded yet.  This bounds the memory used by results waiting
+    for you to iterate over them.  The default is twice max_workers
+    (or twice os.cpu_count(), if max_workers is None).  grep_many
+    only reads from paths as needed to keep max_pending files in flight.
+
+    If ordered is true (the default), results are yielded in the same
+    order as paths, and in line order within each file.  If ordered is
+    false, grep_many yields each file's results as soon as that file
+    is done; results for a single file are still in line order.
+
+    If grep raises an exception for a file, iterating over grep_many
+    re-raises that exception.
+    """
+    if not isinstance(pattern, re_Pattern):
+        pattern = re.compile(pattern, flags)
+    if isinstance(pattern.pattern, bytes) and (encoding is not None):
+        raise ValueError("encoding must be None when pattern uses bytes")
+
+    if max_pending is None:
+        max_pending = 2 * (max_workers or os.cpu_count() or 1)
+    elif max_pending < 1:
+        raise ValueError("max_pending must be 1 or greater")
+
+    return _grep_many(paths, pattern, encoding, executor, max_workers, max_pending, ordered)
+
+
 @export
 class pushd:
     """
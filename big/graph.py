@@ -32,6 +32,11 @@ THE USE OR OTHER DEALINGS IN THE SOFTWARE.
 #
 
 from collections import defaultdict
+import concurrent.futures
+import heapq
+import inspect
+import os
+import time
 
 try:
     from graphlib import CycleError
@@ -48,6 +53,12 @@ __all__ = ["TopologicalSorter", "CycleError"]
 
 nodes_dict_default = lambda: [0, {}]
 
+def _timed_call(function, node):
+    # runs in the worker.  (it's at module scope so it can be pickled.)
+    start = time.perf_counter()
+    result = function(node)
+    return time.perf_counter() - start, result
+
 # only used for printing
 def _hopefully_sorted_collection(c):
     try:
@@ -218,6 +229,160 @@ class TopologicalSorter:
             self._done |= nodes
             self._yielded -= nodes
 
+        def _run_queue(self, critical_path, costs):
+            # returns a (push, pop, queue) triple.
+            # queue is a heap of (-priority, serial, node) tuples;
+            # serial keeps nodes with equal priority in FIFO order.
+            priorities = self.graph._critical_path(costs) if critical_path else {}
+            queue = []
+            serial = 0
+
+            def push(node):
+                nonlocal serial
+                heapq.heappush(queue, (-priorities.get(node, 0), serial, node))
+                serial += 1
+
+            def pop():
+                return heapq.heappop(queue)[2]
+
+            return push, pop, queue
+
+        def run(self, function, *, executor=None, max_workers=None, critical_path=False, costs=None):
+            """
+            Runs function(node) for every node remaining in the view,
+            in parallel, respecting the dependencies between nodes.
+
+            Nodes are submitted to executor, a concurrent.futures.Executor,
+            the moment they become ready.  If executor is None (the default),
+            run creates a ThreadPoolExecutor with max_workers workers, and
+            shuts it down when it's done.  Otherwise run submits work to
+            executor but doesn't shut it down.  If you use a ProcessPoolExecutor,
+            function and the nodes must be picklable.
+
+            max_workers is the maximum number of nodes run keeps in flight
+            at once.  If run creates the executor and max_workers is None,
+            it uses min(32, os.cpu_count() + 4).  If you pass in executor
+            and max_workers is None, run submits every ready node at once.
+
+            If critical_path is true, when more nodes are ready than
+            there are free workers, run starts the nodes on the longest
+            remaining path through the graph first.  costs is an optional
+            mapping of nodes to their estimated cost; nodes not in costs
+            have a cost of 1.
+
+            Returns a TopologicalSorter.RunResult object.
+
+            If function raises an exception, run stops submitting nodes,
+            cancels any nodes that haven't started, and re-raises the
+            exception.
+            """
+            if self.graph is None:
+                raise ValueError("TopologicalSorter view has already been closed")
+            if max_workers is not None and max_workers < 1:
+                raise ValueError("max_workers must be 1 or greater")
+
+            shutdown = executor is None
+            if shutdown:
+                if max_workers is None:
+                    max_workers = min(32, (os.cpu_count() or 1) + 4)
+                executor = concurrent.futures.ThreadPoolExecutor(max_workers=max_workers)
+
+            # pending maps futures to their nodes.
+            pending = {}
+            try:
+                push, pop, queue = self._run_queue(critical_path, costs)
+                submit = executor.submit
+                results = {}
+                timings = {}
+                start = time.perf_counter()
+
+                while True:
+                    for node in self.ready():
+                        push(node)
+                    while queue and ((max_workers is None) or (len(pending) < max_workers)):
+                        node = pop()
+                        pending[submit(_timed_call, function, node)] = node
+                    if not pending:
+                        break
+                    done, _ = concurrent.futures.wait(pending, return_when=concurrent.futures.FIRST_COMPLETED)
+                    for future in done:
+                        node = pending.pop(future)
+                        elapsed, result = future.result()
+                        results[node] = result
+                        timings[node] = elapsed
+                        self.done(node)
+
+                return TopologicalSorter.RunResult(results, timings, time.perf_counter() - start)
+            finally:
+                for future in pending:
+                    future.cancel()
+                if shutdown:
+                    executor.shutdown(wait=True)
+
+        async def run_async(self, function, *, max_workers=None, critical_path=False, costs=None):
+            """
+            An asyncio version of run.  Runs function(node) for every
+            node remaining in the view, in the running event loop,
+            respecting the dependencies between nodes.
+
+            function may be a normal function or a coroutine function;
+            if function(node) returns an awaitable, run_async awaits it.
+            max_workers is the maximum number of nodes in flight at once;
+            if it's None (the default), there's no limit.  critical_path
+            and costs behave the same as with run.
+
+            Returns a TopologicalSorter.RunResult object.
+
+            If function raises an exception, run_async cancels every
+            node still in flight, and re-raises the exception.
+            """
+            import asyncio
+
+            if self.graph is None:
+                raise ValueError("TopologicalSorter view has already been closed")
+            if max_workers is not None and max_workers < 1:
+                raise ValueError("max_workers must be 1 or greater")
+
+            loop = asyncio.get_running_loop()
+
+            async def call(node):
+                start = loop.time()
+                result = function(node)
+                if inspect.isawaitable(result):
+                    result = await result
+                return loop.time() - start, result
+
+            push, pop, queue = self._run_queue(critical_path, costs)
+            # pending maps tasks to their nodes.
+            pending = {}
+            results = {}
+            timings = {}
+            start = loop.time()
+
+            try:
+                while True:
+                    for node in self.ready():
+                        push(node)
+                    while queue and ((max_workers is None) or (len(pending) < max_workers)):
+                        node = pop()
+                        pending[asyncio.ensure_future(call(node))] = node
+                    if not pending:
+                        break
+                    done, _ = await asyncio.wait(pending, return_when=asyncio.FIRST_COMPLETED)
+                    for task in done:
+                        node = pending.pop(task)
+                        elapsed, result = task.result()
+                        results[node] = result
+                        timings[node] = elapsed
+                        self.done(node)
+
+                return TopologicalSorter.RunResult(results, timings, loop.time() - start)
+            finally:
+                if pending:
+                    for task in pending:
+                        task.cancel()
+                    await asyncio.gather(*pending, return_exceptions=True)
+
         #
         # These functions are internal only.
         # They're a private API between the graph
@@ -290,7 +455,9 @@ class TopologicalSorter:
                 self._conflicts[node].add(successor)
                 self._reverse_conflicts[successor].add(node)
 
-            if successor not in self._done:
+            # _predecessors only counts predecessors that aren't done yet.
+            # if node is already done, successor isn't waiting on it.
+            if conflict_1 and (successor not in self._done):
                 self._predecessors[successor] += 1
                 if self._predecessors[successor] == 1:
                     try:
@@ -300,6 +467,28 @@ class TopologicalSorter:
                         self._ready.remove(successor)
                     except ValueError:
                         pass
+
+        def _remove_edge(self, node, successor):
+            """
+            Called *after* the graph is updated.
+            successor no longer depends on node.
+            """
+            successors = self._conflicts.get(node)
+            if successors and (successor in successors):
+                successors.discard(successor)
+                if not successors:
+                    del self._conflicts[node]
+                predecessors = self._reverse_conflicts[successor]
+                predecessors.discard(node)
+                if not predecessors:
+                    del self._reverse_conflicts[successor]
+
+            if (node in self._done) or (successor in self._done):
+                return
+            self._predecessors[successor] -= 1
+            if (not self._predecessors[successor]) and (successor not in self._yielded):
+                self._ready.append(successor)
+
         def _remove_node(self, node, successors):
             """
             Called *after* the node is removed from the graph.
@@ -364,6 +553,25 @@ class TopologicalSorter:
             self.graph.print(print=print)
             print()
 
+    class RunResult:
+        """
+        The result of running a graph with run() or run_async().
+
+        results maps each node to the value function returned for it.
+        timings maps each node to the time, in seconds, function
+        spent running for that node.  makespan is the total time,
+        in seconds, from starting the run until the last node finished.
+        """
+        __slots__ = ('results', 'timings', 'makespan')
+
+        def __init__(self, results, timings, makespan):
+            self.results = results
+            self.timings = timings
+            self.makespan = makespan
+
+        def __repr__(self):
+            return f"<RunResult {len(self.results)} nodes makespan={self.makespan}>"
+
     def __bool__(self):
         """
         Returns True if more work can be done in the
@@ -406,7 +614,7 @@ class TopologicalSorter:
         """
         return self._default_view.reset()
 
-    def __init__(self, graph=None):
+    def __init__(self, graph=None, *, incremental=False, predecessors=False):
         # the graph argument is a mapping of nodes to dependencies.
 
         # self.nodes maps node -> [count-of-predecessors, list-of-successors].
@@ -424,6 +632,30 @@ class TopologicalSorter:
         # two nodes that were already in the graph.
         self.dirty = False
 
+        # If incremental is true, we detect cycles as each edge is added,
+        # using the Pearce-Kelly dynamic topological sort algorithm.
+        #
+        # self._order maps every node to an integer, maintained such that
+        # if B depends on A, self._order[A] < self._order[B].  New nodes
+        # get a number either below or above every existing number, from
+        # self._low or self._high.  When a new edge violates the order,
+        # we search only the nodes whose numbers fall between the edge's
+        # two endpoints, and shuffle their numbers around.  If that search
+        # finds a cycle, we store it in self._cycle, set self._order to None,
+        # and set the dirty flag; the next call to cycle() (after the cycle
+        # is broken by removing nodes) rebuilds self._order from scratch.
+        #
+        # If predecessors is true, self._reverse maps every node to a dict
+        # of its predecessors (the nodes it depends on), which makes remove()
+        # O(degree) rather than O(N).  Pearce-Kelly needs to walk edges
+        # backwards too, so incremental graphs always maintain it.
+        self._incremental = incremental
+        self._order = {} if incremental else None
+        self._reverse = {} if (incremental or predecessors) else None
+        self._low = -1
+        self._high = 0
+        self._cycle = None
+
         self.views = []
         self._default_view = self.View(self)
         self._stock_view = self.View(self)
@@ -441,6 +673,57 @@ class TopologicalSorter:
         """
         return self._stock_view.copy()
 
+    def run(self, function, *, executor=None, max_workers=None, critical_path=False, costs=None):
+        """
+        Runs function(node) for every node in the graph, in parallel,
+        respecting the dependencies between nodes.  Uses a new view,
+        so it doesn't disturb the default view.
+
+        See View.run for the details.
+        """
+        view = self.view()
+        try:
+            return view.run(function, executor=executor, max_workers=max_workers, critical_path=critical_path, costs=costs)
+        finally:
+            view.close()
+
+    async def run_async(self, function, *, max_workers=None, critical_path=False, costs=None):
+        """
+        Runs function(node) for every node in the graph, in the
+        running event loop, respecting the dependencies between nodes.
+        Uses a new view, so it doesn't disturb the default view.
+
+        See View.run_async for the details.
+        """
+        view = self.view()
+        try:
+            return await view.run_async(function, max_workers=max_workers, critical_path=critical_path, costs=costs)
+        finally:
+            view.close()
+
+    def _critical_path(self, costs):
+        """
+        Returns a dict mapping every node to the cost of the
+        most expensive path from that node to the end of the graph,
+        including the node itself.  Nodes in a cycle are omitted.
+        """
+        nodes = self.nodes
+        counts = {node: value[0] for node, value in nodes.items()}
+        order = [node for node, count in counts.items() if not count]
+        for node in order:
+            for successor in nodes[node][1]:
+                counts[successor] -= 1
+                if not counts[successor]:
+                    order.append(successor)
+
+        levels = {}
+        for node in reversed(order):
+            level = 0
+            for successor in nodes[node][1]:
+                level = max(level, levels[successor])
+            levels[node] = level + (costs.get(node, 1) if costs else 1)
+        return levels
+
     def add(self, node, *dependencies):
         """
         Add a node to the graph if it isn't already there.
@@ -467,9 +750,18 @@ class TopologicalSorter:
         new_nodes = []
         new_successors = []
 
+        order = self._order
+        reverse = self._reverse
+
         if not node in self.nodes:
             new_nodes.append(node)
             self.nodes[node] = nodes_dict_default()
+            if reverse is not None:
+                reverse[node] = {}
+            if order is not None:
+                # node has no successors yet, so it can go last.
+                order[node] = self._high
+                self._high += 1
 
         pc_s = self.nodes[node]
         predecessors_count, successors = pc_s
@@ -478,12 +770,23 @@ class TopologicalSorter:
             if d not in self.nodes:
                 new_nodes.append(d)
                 self.nodes[d] = nodes_dict_default()
+                if reverse is not None:
+                    reverse[d] = {}
+                if order is not None:
+                    # d has no predecessors, so it can go first.
+                    order[d] = self._low
+                    self._low -= 1
             d_pc, d_s = self.nodes[d]
             if node not in d_s:
-                self.dirty = True
                 d_s[node] = None
                 predecessors_count += 1
                 new_successors.append(d)
+                if reverse is not None:
+                    reverse[node][d] = None
+                if not self._incremental:
+                    self.dirty = True
+                elif self._order is not None:
+                    self._add_edge(d, node)
 
         pc_s[0] = predecessors_count
 
@@ -502,7 +805,8 @@ class TopologicalSorter:
         If any node P depends on a node N, this dependency
         is also removed, but P is not removed from the graph.
 
-        remove() works but it's slow (O(N)).
+        remove() works but it's slow (O(N)), unless the graph
+        tracks predecessors, in which case it's O(degree).
         TopologicalSorter is optimized for fast adds and fast views.
         """
         if node not in self.nodes:
@@ -510,7 +814,10 @@ class TopologicalSorter:
 
         predecessors = []
         predecessor_count, successors = self.nodes[node]
-        if predecessor_count:
+        reverse = self._reverse
+        if reverse is not None:
+            predecessors = list(reverse[node])
+        elif predecessor_count:
             # we have to iterate over all nodes in the graph
             # until we find all predecessors.
             for n, pc_s in self.nodes.items():
@@ -533,6 +840,18 @@ class TopologicalSorter:
 
         del self.nodes[node]
 
+        if reverse is not None:
+            for n in successors:
+                del reverse[n][node]
+            del reverse[node]
+        if self._order is not None:
+            del self._order[node]
+        if (self._cycle is not None) and (node in self._cycle):
+            # we broke the cycle we found.
+            # (there may be others!  dirty is still set,
+            # so cycle() will check the whole graph.)
+            self._cycle = None
+
         for v in self.views:
             v._remove_node(node, successors)
 
@@ -540,23 +859,136 @@ class TopologicalSorter:
         # dirty is only used for detecting cycles.
         # you can't add a cycle by removing nodes or edges.
 
+    def remove_edge(self, node, dependency):
+        """
+        Removes a single dependency from the graph:
+        afterwards, node no longer depends on dependency.
+        Both nodes remain in the graph.
+
+        Raises ValueError if either node isn't in the graph,
+        or if node doesn't depend on dependency.
+
+        remove_edge() is O(1).
+        """
+        nodes = self.nodes
+        if node not in nodes:
+            raise ValueError(f"node {node!r} not in graph")
+        if dependency not in nodes:
+            raise ValueError(f"node {dependency!r} not in graph")
+        successors = nodes[dependency][1]
+        if node not in successors:
+            raise ValueError(f"node {node!r} doesn't depend on {dependency!r}")
+
+        del successors[node]
+        nodes[node][0] -= 1
+
+        if self._reverse is not None:
+            del self._reverse[node][dependency]
+        cycle = self._cycle
+        if (cycle is not None) and (node in cycle) and (dependency in cycle):
+            # we may have broken the cycle we found.
+            # dirty is still set, so cycle() will check.
+            self._cycle = None
+
+        for v in self.views:
+            v._remove_edge(dependency, node)
+
     def copy(self):
         """
         Returns a shallow copy of the graph.  The copy also
         duplicates the state of get_ready and done.
         """
-        clone = self.__class__()
+        clone = self.__class__(incremental=self._incremental, predecessors=self._reverse is not None)
         for node, p_s in self.nodes.items():
             p, s = p_s
             clone.nodes[node] = [p, s.copy()]
 
-        clone._default_view = self._default_view.copy()
-        clone._default_view.graph = clone
-        clone._stock_view = self._stock_view.copy()
-        clone._stock_view.graph = clone
+        clone.dirty = self.dirty
+        if self._order is not None:
+            clone._order = self._order.copy()
+        else:
+            clone._order = None
+        if self._reverse is not None:
+            clone._reverse = {node: predecessors.copy() for node, predecessors in self._reverse.items()}
+        clone._low = self._low
+        clone._high = self._high
+        clone._cycle = self._cycle
+
+        # replace the views the constructor made with copies of ours.
+        # (don't use View.copy, that would register the copies with self.)
+        clone.views.clear()
+        default_view = self._default_view
+        clone._default_view = default_view.__class__(clone, original=default_view)
+        stock_view = self._stock_view
+        clone._stock_view = stock_view.__class__(clone, original=stock_view)
 
         return clone
 
+    def _add_edge(self, node, successor):
+        """
+        Pearce-Kelly: called after adding the edge node -> successor
+        to an incremental graph.  Fixes up self._order, or records
+        the cycle the new edge created.
+        """
+        order = self._order
+        lower = order[successor]
+        upper = order[node]
+        if lower > upper:
+            return
+
+        if node == successor:
+            cycle = (node,)
+        else:
+            # forward search from successor, over nodes ordered before node.
+            # if we reach node, the new edge closed a cycle.
+            nodes = self.nodes
+            forward = {successor: None}
+            stack = [successor]
+            cycle = None
+            while stack and (cycle is None):
+                n = stack.pop()
+                for s in nodes[n][1]:
+                    o = order[s]
+                    if o == upper:
+                        # s is node.  walk back to successor to find our path.
+                        path = [s]
+                        while n is not None:
+                            path.append(n)
+                            n = forward[n]
+                        path.reverse()
+                        cycle = tuple(path)
+                        break
+                    if (o < upper) and (s not in forward):
+                        forward[s] = n
+                        stack.append(s)
+
+        if cycle is not None:
+            self._cycle = cycle
+            self._order = None
+            self.dirty = True
+            return
+
+        # backward search from node, over nodes ordered after successor.
+        reverse = self._reverse
+        backward = {node}
+        stack = [node]
+        while stack:
+            n = stack.pop()
+            for p in reverse[n]:
+                if (order[p] > lower) and (p not in backward):
+                    backward.add(p)
+                    stack.append(p)
+
+        # reassign the numbers used by the nodes we visited,
+        # moving everything that leads to node in front of
+        # everything reachable from successor.
+        key = order.__getitem__
+        affected = sorted(backward, key=key)
+        affected.extend(sorted(forward, key=key))
+        numbers = sorted(order[n] for n in affected)
+        for n, number in zip(affected, numbers):
+            order[n] = number
+
     def cycle(self):
         """
         Cycle detector.
@@ -568,13 +1000,20 @@ class TopologicalSorter:
             # dirty bit is only cleared when we don't have a cycle.
             # ergo, if dirty bit isn't set, we have no cycles.
             return None
+        if self._cycle is not None:
+            # an incremental graph found this cycle when the
+            # offending edge was added, and it's still there.
+            return self._cycle
         self.dirty = False
 
         counts = {node: value[0] for node, value in self.nodes.items()}
         done = set()
         _ready = {node for node, count in counts.items() if not count}
+        sequence = [] if self._incremental else None
         while _ready:
             done |= _ready
+            if sequence is not None:
+                sequence.extend(_ready)
             _ready2 = set()
             for node in _ready:
                 successors = self.nodes[node][1]
@@ -586,6 +1025,11 @@ class TopologicalSorter:
 
         if len(done) == len(counts):
             # no cycles!
+            if sequence is not None:
+                # resume incremental cycle detection.
+                self._order = {node: i for i, node in enumerate(sequence)}
+                self._low = -1
+                self._high = len(sequence)
             return None
 
         # cycle detected.
@@ -620,7 +1064,10 @@ class TopologicalSorter:
                     # found a cycle
                     index = cycle.index(node)
                     self.dirty = True
-                    return tuple(cycle[index:])
+                    cycle = tuple(cycle[index:])
+                    if self._incremental:
+                        self._cycle = cycle
+                    return cycle
                 # descend
                 seen.add(node)
                 cycle.append(node)
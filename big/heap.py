@@ -36,6 +36,10 @@ from heapq import (
     nsmallest,
     )
 
+# heapq doesn't publish these, but they've been there since
+# the beginning, and they're exactly what remove needs.
+from heapq import _siftdown, _siftup
+
 class Heap:
     """
     An object-oriented wrapper around the heapq library, designed to be
@@ -80,8 +84,17 @@ class Heap:
         self._version += 1
 
     def remove(self, o):
-        self._queue.remove(o)
-        heapify(self._queue)
+        # finding o is O(n), but it's a fast C loop.
+        # rather than re-heapifying the whole list (O(n)
+        # Python-level comparisons), move the last value
+        # into o's slot and sift it into place (O(log n)).
+        queue = self._queue
+        i = queue.index(o)
+        last = queue.pop()
+        if i < len(queue):
+            queue[i] = last
+            _siftup(queue, i)
+            _siftdown(queue, 0, i)
         self._version += 1
 
     def popleft(self):
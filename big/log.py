@@ -25,16 +25,21 @@ THE USE OR OTHER DEALINGS IN THE SOFTWARE.
 """
 
 
+from array import array
 import atexit
 import builtins
+from collections import deque
 from functools import partial
 from io import TextIOBase
-from itertools import zip_longest
+from itertools import count, zip_longest
 import os
 from pathlib import Path
-from queue import Queue
+import pickle
+import string
+import struct
+import sys
 import tempfile
-from threading import current_thread, Lock, Thread
+from threading import Condition, current_thread, Event, Lock, Thread
 from .boundinnerclass import BoundInnerClass
 from . import time as big_time
 from . import file as big_file
@@ -319,6 +324,408 @@ def prefix_format(time_seconds_width, time_fractional_width, thread_name_width=1
     return f'[{{elapsed:0{time_width}.{time_fractional_width}f}} {{thread.name:>{thread_name_width}}}] '
 
 
+_formatter = string.Formatter()
+
+def _format_fields(format):
+    """
+    Returns a frozenset of the names of the substitutions
+    used in format.  For example, for the format
+        '[{elapsed:08.3f} {thread.name}] {message}'
+    returns frozenset({'elapsed', 'thread', 'message'}).
+
+    Returns None if format can't be parsed, or uses positional
+    fields; in that case format_map will raise the appropriate
+    exception when we try to use it.
+    """
+    fields = set()
+    try:
+        for _, field_name, format_spec, _ in _formatter.parse(format):
+            if field_name is None:
+                continue
+            name = field_name.partition('.')[0].partition('[')[0]
+            if (not name) or name.isdigit():
+                return None
+            fields.add(name)
+            if format_spec and ('{' in format_spec):
+                nested = _format_fields(format_spec)
+                if nested is None:
+                    return None
+                fields |= nested
+    except ValueError:
+        return None
+    return frozenset(fields)
+
+_all_fields = frozenset(('elapsed', 'format', 'line', 'message', 'name', 'prefix', 'thread', 'time', 'timestamp'))
+_time_fields = frozenset(('elapsed', 'time', 'timestamp'))
+
+# str() on these types is cheap to defer to the worker thread,
+# and because they're immutable, deferring it can't change the result.
+_deferred_str_types = frozenset((str, int, float, bool, complex, type(None)))
+
+_overflow_policies = ('block', 'drop-newest', 'drop-oldest', 'spill')
+
+
+def _join_print_args(args, sep, end):
+    # combines the arguments to Log.print into the logged message.
+    joined = sep.join([a if type(a) is str else str(a) for a in args]).rstrip()
+    if end is _end:
+        end = ''
+    elif end.endswith('\n'):
+        end = end[:-1]
+    return f"{joined}{end}"
+
+
+def _compress_file(source, destination):
+    # runs in RotatingFile's compressor thread.
+    import gzip
+    import shutil
+
+    tmp = destination.with_name(destination.name + '.tmp')
+    with source.open('rb') as i:
+        with gzip.open(tmp, 'wb') as o:
+            shutil.copyfileobj(i, o, 1 << 20)
+    tmp.replace(destination)
+    source.unlink()
+
+
+# The BinaryFile format.
+#
+# The file starts with _binary_magic.  After that, it's a series of
+# records.  Every record starts with a 4-byte unsigned length (the
+# length of the rest of the record), then a 1-byte record type.
+# Integers are little-endian.  Text is UTF-8.
+#
+# Event records (write, log, enter, exit) look like this:
+#     type         1 byte
+#     elapsed      8 bytes, signed, nanoseconds
+#     thread       4 bytes, unsigned, thread number (0 means None)
+#     depth        2 bytes, unsigned
+#     format       4 bytes, unsigned, format number (0 means None)
+#     message      the rest of the record
+# For write events, "message" is the formatted text.
+#
+# Format names and threads are "interned".  The first time a format
+# or thread is used, BinaryFile writes a definition record assigning
+# it a number:
+#     format definition: type, number (4 bytes), name
+#     thread definition: type, number (4 bytes), ident (8 bytes), name
+#
+# The remaining records:
+#     start: type, start_time_ns (8 bytes, signed), start_time_epoch (double)
+#     end:   type, elapsed (8 bytes, signed)
+#
+# Every start record begins a new "number", the same as a reset
+# does for Sink.
+
+_binary_magic = b'bigLog\x00\x01'
+
+_BINARY_START  = ord('S')
+_BINARY_END    = ord('E')
+_BINARY_WRITE  = ord('W')
+_BINARY_LOG    = ord('L')
+_BINARY_ENTER  = ord('N')
+_BINARY_EXIT   = ord('X')
+_BINARY_FORMAT = ord('F')
+_BINARY_THREAD = ord('T')
+
+_binary_length = struct.Struct('<I')
+_binary_event = struct.Struct('<IBqIHI')
+_binary_start = struct.Struct('<IBqd')
+_binary_end = struct.Struct('<IBq')
+_binary_format = struct.Struct('<IBI')
+_binary_thread = struct.Struct('<IBIQ')
+
+
+class _Limiter:
+    """
+    Decides whether to log a message in a rate-limited format.
+
+    Runs in the thread calling the Log, before the message is
+    dispatched, so dropping a message is as cheap as possible.
+    Call it with the time of the message (from the Log's clock).
+    It returns None if the message should be dropped; otherwise,
+    it returns the number of messages dropped since the last
+    message it let through.
+
+    "sample" keeps one message in every sample messages.
+    "rate" is a token bucket: on average it lets through rate
+    messages per second, with bursts of up to "burst" messages.
+    If you specify both, messages must pass both tests.
+
+    The counters aren't protected by a lock; if multiple threads
+    log in the same format at the same time, sampling and the
+    suppressed counts may be very slightly inaccurate.
+    """
+    __slots__ = ('sample', 'counter', 'rate', 'burst', 'tokens', 'previous', 'suppressed', 'total')
+
+    def __init__(self, sample=None, rate=None, burst=None):
+        self.sample = sample
+        self.counter = count()
+        # convert rate to tokens per nanosecond.
+        self.rate = rate / 1_000_000_000.0 if rate else None
+        if rate and (burst is None):
+            burst = max(1, rate)
+        self.burst = burst
+        self.tokens = burst
+        self.previous = None
+        # dropped since the last message we let through
+        self.suppressed = 0
+        # dropped in total
+        self.total = 0
+
+    def __call__(self, time):
+        if self.sample and (next(self.counter) % self.sample):
+            self.suppressed += 1
+            self.total += 1
+            return None
+
+        if self.rate:
+            previous = self.previous
+            self.previous = time
+            tokens = self.tokens
+            if (previous is not None) and (time > previous):
+                tokens = min(self.burst, tokens + ((time - previous) * self.rate))
+            if tokens < 1:
+                self.tokens = tokens
+                self.suppressed += 1
+                self.total += 1
+                return None
+            self.tokens = tokens - 1
+
+        suppressed = self.suppressed
+        self.suppressed = 0
+        return suppressed
+
+    def take_suppressed(self):
+        suppressed = self.suppressed
+        self.suppressed = 0
+        return suppressed
+
+
+class _WorkQueue:
+    """
+    The queue of work sent to a Log's worker thread.
+
+    Producers append work to a deque, which is atomic and
+    doesn't need a lock.  They only touch the Event if the
+    worker is asleep waiting for work.  The worker drains
+    all the waiting work at once, and processes it as a batch.
+
+    If maxsize is true, the queue holds at most maxsize work
+    lists.  When it's full, what happens depends on overflow:
+        "block"        the producer waits until the worker
+                       drains the queue.
+        "drop-newest"  the new work is discarded.
+        "drop-oldest"  the oldest work in the queue is discarded.
+        "spill"        the new work is written to a temporary
+                       file, and read back by the worker in order.
+    Only work that just logs messages is ever discarded, spilled,
+    or made to wait; the "droppable" tuple contains the callables
+    for those jobs.  Other work (enter, exit, flush, close...) is
+    always queued immediately, even if the queue is full.  (It's
+    often queued by a thread holding the Log's lock, and the worker
+    may need that lock to drain the queue.)  If the oldest work in
+    the queue isn't droppable, "drop-oldest" discards the new work
+    instead.
+
+    Spilled work is stored in the deque as a _SpillRun, standing in
+    for consecutive work lists in the spill file.  Any work queued
+    directly ends the current run, so the worker always executes
+    work in the order it was queued.
+    """
+    def __init__(self, maxsize=None, overflow='block', droppable=()):
+        self.deque = deque()
+        self.event = Event()
+        # true when the worker is (about to be) asleep in wait.
+        self.waiting = False
+        # true while the worker is processing a batch.
+        self.busy = False
+
+        self.maxsize = maxsize
+        self.overflow = overflow
+        self.droppable = droppable
+        # only used when maxsize is true.
+        self.not_full = Condition(Lock())
+        # work discarded because the queue was full.
+        self.dropped = 0
+        # number of times a producer waited because the queue was full.
+        self.blocked = 0
+        # work written to the spill file because the queue was full.
+        self.spilled = 0
+
+        # the spill file is only created the first time we spill.
+        # all these are guarded by not_full.
+        self.spill_file = None
+        # the offset in spill_file of the next work list to read.
+        self.spill_read = 0
+        # the _SpillRun we're still adding work to, if any.
+        self.spill_run = None
+        # we don't write threads to the spill file, just
+        # their index in spill_threads.
+        self.spill_thread_indexes = {}
+        self.spill_threads = []
+
+    def put(self, work):
+        d = self.deque
+        if self.maxsize:
+            if (len(d) >= self.maxsize) and self._is_droppable(work) and (not self._overflow(work)):
+                return
+            if self.spill_run:
+                # work spilled after this must come after it, too.
+                with self.not_full:
+                    self.spill_run = None
+        d.append(work)
+        if self.waiting:
+            self.event.set()
+
+    def _is_droppable(self, work):
+        droppable = self.droppable
+        for job in work:
+            if (job is None) or (job[0] not in droppable):
+                return False
+        return True
+
+    def _overflow(self, work):
+        """
+        Called when the queue is full, and work is droppable.
+        Returns True if the caller should queue work.
+        """
+        d = self.deque
+        maxsize = self.maxsize
+
+        if self.overflow == 'block':
+            with self.not_full:
+                if len(d) >= maxsize:
+                    self.blocked += 1
+                    while len(d) >= maxsize:
+                        self.not_full.wait()
+            return True
+
+        if self.overflow == 'spill':
+            self._spill(work)
+            return False
+
+        with self.not_full:
+            if (self.overflow == 'drop-oldest') and d:
+                oldest = d.popleft()
+                if self._is_droppable(oldest):
+                    self.dropped += 1
+                    return True
+                d.appendleft(oldest)
+            self.dropped += 1
+        return False
+
+    def _spill(self, work):
+        droppable = self.droppable
+        with self.not_full:
+            indexes = self.spill_thread_indexes
+            jobs = []
+            for fn, args in work:
+                thread = args[1]
+                index = indexes.get(thread)
+                if index is None:
+                    index = indexes[thread] = len(self.spill_threads)
+                    self.spill_threads.append(thread)
+                jobs.append((droppable.index(fn), index, args[:1] + args[2:]))
+
+            f = self.spill_file
+            if f is None:
+                f = self.spill_file = tempfile.TemporaryFile()
+            f.seek(0, os.SEEK_END)
+            pickle.dump(jobs, f, pickle.HIGHEST_PROTOCOL)
+            self.spilled += 1
+
+            run = self.spill_run
+            if run:
+                run.count += 1
+                return
+            self.spill_run = _SpillRun(self)
+            self.deque.append(self.spill_run)
+        if self.waiting:
+            self.event.set()
+
+    def unspill(self):
+        """
+        Reads the next work list back from the spill file.
+        Only called by the worker, from _SpillRun.
+        """
+        droppable = self.droppable
+        with self.not_full:
+            f = self.spill_file
+            f.seek(self.spill_read)
+            jobs = pickle.load(f)
+            self.spill_read = f.tell()
+            threads = self.spill_threads
+            work = [(droppable[fn], (args[0], threads[index]) + args[1:]) for fn, index, args in jobs]
+            if self.spill_read == f.seek(0, os.SEEK_END):
+                # we've read back everything we spilled.
+                # start over, so the file doesn't grow forever.
+                f.seek(0)
+                f.truncate()
+                self.spill_read = 0
+                self.spill_thread_indexes = {}
+                self.spill_threads = []
+        return work
+
+    def close(self):
+        if self.spill_file is not None:
+            self.spill_file.close()
+            self.spill_file = None
+
+    def get_batch(self):
+        """
+        Blocks until there's work, then returns a list
+        of all the work currently in the queue.
+        """
+        d = self.deque
+        self.busy = False
+        while not d:
+            # set waiting *before* checking the deque a second time.
+            # a producer appends *before* checking waiting.  so either
+            # we see its work, or it sees we're waiting and wakes us.
+            self.waiting = True
+            if not d:
+                self.event.wait()
+            self.event.clear()
+            self.waiting = False
+        self.busy = True
+        popleft = d.popleft
+        if not self.maxsize:
+            return [popleft() for _ in range(len(d))]
+        # producers handling overflow may popleft too,
+        # and may be waiting for the queue to drain.
+        with self.not_full:
+            batch = [popleft() for _ in range(len(d))]
+            self.not_full.notify_all()
+        return batch
+
+    def empty(self):
+        """
+        Returns True if there's no work in the queue,
+        and the worker has finished processing its last batch.
+        """
+        return not (self.deque or self.busy)
+
+
+class _SpillRun:
+    """
+    Stands in for consecutive work lists a _WorkQueue
+    wrote to its spill file.  Iterating over it reads them
+    back, one at a time, and yields their jobs.
+    """
+    def __init__(self, queue):
+        self.queue = queue
+        self.count = 1
+
+    def __iter__(self):
+        queue = self.queue
+        with queue.not_full:
+            if queue.spill_run is self:
+                queue.spill_run = None
+        for _ in range(self.count):
+            yield from queue.unspill()
+
+
 @export
 class Log:
     """
@@ -437,6 +844,23 @@ class Log:
     Log call, using a threading.Lock() object to ensure thread safety.
     (Log is always thread-safe, whether or not "threading" is true.)
 
+    In threaded mode, "queue_size" limits the number of calls waiting
+    for the logging thread.  The default is None, meaning no limit.
+    If the queue is full, "overflow" specifies what happens:
+        'block'        the calling thread waits until the logging
+                       thread catches up.  (The default.)
+        'drop-newest'  the new message is discarded.
+        'drop-oldest'  the oldest message in the queue is discarded.
+        'spill'        the new message is written to a temporary
+                       file, and the logging thread reads it back
+                       when it gets to it.
+    Only messages are discarded, spilled, or made to wait; enter,
+    exit, flush, close, and reset are always queued immediately.
+    The queue_depth, dropped, spilled, and blocked properties report
+    the current depth of the queue, the number of messages discarded,
+    the number of messages written to the spill file, and the number
+    of times a thread had to wait.
+
     "indent" should be an integer, the number of spaces to indent by
     when indenting the log (using Log.enter).  Default is 4.
 
@@ -509,6 +933,21 @@ class Log:
         end
             used for the final log message when the log is closed
 
+    A format dict may also contain "sample", "rate", and "burst" values,
+    which limit how many messages are logged with that format.  If
+    "sample" is specified, it should be an int N; the log keeps only
+    one in every N messages.  If "rate" is specified, it should be
+    a number; the log keeps at most "rate" messages per second, on
+    average, allowing bursts of up to "burst" messages (by default,
+    "rate" messages, minimum 1).  Dropped messages are discarded in the
+    calling thread, before the message is formatted or sent to the
+    worker thread.  The next time a message in that format is logged
+    (or the log is flushed or closed), the log logs a line saying how
+    many messages were dropped.  Log.suppressed is a dict mapping
+    these formats to the total number of messages each has dropped.
+    These values aren't supported for the "start", "end", "enter",
+    and "exit" formats.
+
     You may also add your own user-defined formats; simply add these
     to the dict you pass in as the formats parameter.  The Log instance
     will add a method with the name of format which logs using this
@@ -533,6 +972,9 @@ class Log:
 
             prefix=prefix_format(3, 10, 12),
             formats = {},
+
+            queue_size=None,
+            overflow='block',
             ):
 
         t1 = clock()
@@ -543,6 +985,15 @@ class Log:
         self._name = name
         self._threading = threading
 
+        if (queue_size is not None) and not (isinstance(queue_size, int) and (queue_size >= 1)):
+            raise ValueError(f"queue_size must be None or an int >= 1, not {queue_size!r}")
+        if overflow not in _overflow_policies:
+            raise ValueError(f"overflow must be one of {', '.join(repr(o) for o in _overflow_policies)}, not {overflow!r}")
+        self._queue_size = queue_size
+        self._overflow = overflow
+        # totals from worker threads that have exited.
+        self._dropped = self._spilled = self._blocked = 0
+
         self._clock = clock
         self._timestamp_clock = timestamp_clock
 
@@ -553,6 +1004,12 @@ class Log:
         self._spaces = ''
         self._timestamp_format = timestamp_format
 
+        # maps format strings to the set of substitutions they use.
+        # see _format_fields.
+        self._compiled_formats = {}
+        # (second, head, tail), see _timestamp.
+        self._timestamp_cache = (None, None, None)
+
         self._formats_parameter = formats
 
         self._reset(start_time_ns, start_time_epoch)
@@ -580,6 +1037,10 @@ class Log:
                 append(destination)
                 destination.register(self)
 
+        # if no destination uses the formatted text of log messages,
+        # _log doesn't compute it.
+        self._format_log = any(d.uses_formatted for d in self._destinations)
+
         self._manage_thread()
 
         atexit.register(self._atexit)
@@ -660,6 +1121,46 @@ class Log:
     def threading(self):
         return self._threading
 
+    @property
+    def queue_size(self):
+        return self._queue_size
+
+    @property
+    def overflow(self):
+        return self._overflow
+
+    @property
+    def queue_depth(self):
+        """
+        The number of work items waiting for the worker thread.
+        Always 0 if the log isn't in threaded mode.
+        """
+        queue = self._queue
+        return len(queue.deque) if queue else 0
+
+    @property
+    def dropped(self):
+        """
+        The number of messages discarded because the queue was full.
+        """
+        return self._dropped + (self._queue.dropped if self._queue else 0)
+
+    @property
+    def spilled(self):
+        """
+        The number of messages written to the spill
+        file because the queue was full.
+        """
+        return self._spilled + (self._queue.spilled if self._queue else 0)
+
+    @property
+    def blocked(self):
+        """
+        The number of times a thread had to wait
+        because the queue was full.
+        """
+        return self._blocked + (self._queue.blocked if self._queue else 0)
+
     @property
     def timestamp_format(self):
         return self._timestamp_format
@@ -706,6 +1207,14 @@ class Log:
         with self._lock:
             return len(self._nesting)
 
+    @property
+    def suppressed(self):
+        """
+        A dict mapping the name of every sampled or rate-limited
+        format to the total number of messages it has dropped.
+        """
+        return {format: limiter.total for format, limiter in self._limiters.items()}
+
     def _elapsed(self, t):
         # t should be a value returned by _clock.
         # returns t converted to elapsed time
@@ -744,6 +1253,7 @@ class Log:
         }
 
         result = {}
+        limiters = {}
 
         for key, value in formats.items():
             if value is None:
@@ -784,6 +1294,20 @@ class Log:
 
             template = value['template']
             line = value.get('line', '')
+
+            sample = value.get('sample', None)
+            rate = value.get('rate', None)
+            burst = value.get('burst', None)
+            if (sample is not None) or (rate is not None):
+                if key in ('start', 'end', 'enter', 'exit'):
+                    raise ValueError(f"system format {key!r} can't be sampled or rate-limited")
+                if (sample is not None) and not (isinstance(sample, int) and (sample >= 1)):
+                    raise ValueError(f"format dicts 'sample' value, if specified, must be an int >= 1, not {sample!r}")
+                if (rate is not None) and not (isinstance(rate, (int, float)) and (rate > 0)):
+                    raise ValueError(f"format dicts 'rate' value, if specified, must be a number > 0, not {rate!r}")
+                if (burst is not None) and not (isinstance(burst, (int, float)) and (burst >= 1)):
+                    raise ValueError(f"format dicts 'burst' value, if specified, must be a number >= 1, not {burst!r}")
+                limiters[key] = _Limiter(sample, rate, burst)
             if line:
                 repeated_line = line * ((self._width // len(line)) + 1)
             else:
@@ -820,17 +1344,35 @@ class Log:
                 def make_method(key):
                     def method(message=''):
                         time = self._clock()
-                        thread = current_thread()
 
                         if not isinstance(message, str):
                             raise TypeError('message must be str')
 
-                        self._dispatch([(self._log, (time, thread, key, message))])
+                        suppressed = self._limit(time, key)
+                        if suppressed is None:
+                            return
+
+                        thread = current_thread()
+
+                        work = [(self._log, (time, thread, key, message))]
+                        if suppressed:
+                            work.insert(0, self._suppressed_job(time, thread, key, suppressed))
+                        self._dispatch(work)
                     method.__doc__ = f"Writes a message to the log using the {key!r} format."
                     return method
                 setattr(self, key, make_method(key))
 
         self._formats = result
+        self._limiters = limiters
+
+        # precompile all our format strings.
+        self._compile_format(self._prefix)
+        for f in result.values():
+            if f is None:
+                continue
+            for state in (f.prologue, f.body, f.epilogue):
+                for template, _ in state:
+                    self._compile_format(template)
 
 
     def _format_message(self, elapsed, thread, format, message):
@@ -901,22 +1443,69 @@ class Log:
         self._spaces = ''
 
 
+    def _compile_format(self, format):
+        fields = _format_fields(format)
+        if fields is None:
+            fields = _all_fields
+        self._compiled_formats[format] = fields
+        return fields
+
+    def _timestamp(self, epoch):
+        """
+        Returns timestamp_format(epoch).
+
+        timestamp_human is expensive, and the default Log format calls
+        it for every line logged.  But everything except the microseconds
+        only changes once a second.  So if we're using timestamp_human,
+        we cache the text before and after the microseconds, and only
+        call timestamp_human when the second changes.
+        """
+        if self._timestamp_format is not big_time.timestamp_human:
+            return self._timestamp_format(epoch)
+
+        if not isinstance(epoch, float):
+            return big_time.timestamp_human(epoch)
+
+        # mirror datetime.fromtimestamp, which rounds
+        # microseconds using round-half-even.
+        second = int(epoch)
+        microseconds = round((epoch - second) * 1_000_000)
+        if microseconds >= 1_000_000:
+            second += 1
+            microseconds -= 1_000_000
+
+        cached_second, head, tail = self._timestamp_cache
+        if second != cached_second:
+            s = big_time.timestamp_human(float(second))
+            head, dot, tail = s.rpartition('.000000')
+            if not dot: # pragma: no cover
+                return big_time.timestamp_human(epoch)
+            self._timestamp_cache = (second, head, tail)
+        return f"{head}.{microseconds:06}{tail}"
+
     def _format_s(self, elapsed, thread, format, *, message=None, line=None, prefix=None):
         if not format:
             return ''
 
-        elapsed = self._ns_to_float(elapsed)
-        epoch = elapsed + self._start_time_epoch
-        timestamp = self._timestamp_format(epoch)
-
-        substitutions = {
-            "elapsed": elapsed,
-            "format": format,
-            "name": self._name,
-            "thread": thread,
-            "time": epoch,
-            "timestamp": timestamp,
-            }
+        fields = self._compiled_formats.get(format)
+        if fields is None:
+            fields = self._compile_format(format)
+
+        # only compute the substitutions the format actually uses.
+        substitutions = {}
+        if not fields.isdisjoint(_time_fields):
+            elapsed = self._ns_to_float(elapsed)
+            epoch = elapsed + self._start_time_epoch
+            substitutions['elapsed'] = elapsed
+            substitutions['time'] = epoch
+            if 'timestamp' in fields:
+                substitutions['timestamp'] = self._timestamp(epoch)
+        if 'format' in fields:
+            substitutions['format'] = format
+        if 'name' in fields:
+            substitutions['name'] = self._name
+        if 'thread' in fields:
+            substitutions['thread'] = thread
         if message is not None:
             substitutions['message'] = message
         if line is not None:
@@ -936,20 +1525,29 @@ class Log:
             fn(*args)
         return False
 
+    def _end_batch(self):
+        if self._state == 'logged':
+            for destination in self._destinations:
+                destination.end_batch()
+
     def _worker_thread(self, q):
-        get = q.get
+        get_batch = q.get_batch
+        execute = self._execute
+        end_batch = self._end_batch
 
         while True:
-            work = get()
-            if self._execute(work):
-                return
+            for work in get_batch():
+                if execute(work):
+                    return
+            end_batch()
 
     def _manage_thread(self):
         if not self._threading:
             self._queue = self._thread = None
             return
 
-        self._queue = Queue()
+        droppable = (self._print, self._log, self._write)
+        self._queue = _WorkQueue(self._queue_size, self._overflow, droppable)
         self._thread = Thread(target=self._worker_thread, args=(self._queue,), daemon=True)
         self._thread.start()
 
@@ -980,9 +1578,13 @@ class Log:
             # shut down the queue
             with self._lock:
                 self._thread = self._queue = None
+                self._dropped += queue.dropped
+                self._spilled += queue.spilled
+                self._blocked += queue.blocked
 
             queue.put([None])
             thread.join()
+            queue.close()
 
     def _atexit(self):
         clock = self._clock
@@ -1016,6 +1618,13 @@ class Log:
         thread.  If threaded is False, the work is executed
         immediately, in the current thread, while holding self._lock.
 
+        The worker thread doesn't process work one list at a time.
+        It drains all the work waiting in the queue and executes it
+        as one batch, then sends an "end_batch" event to the
+        destinations.  (In unthreaded mode, every call to _dispatch
+        is its own batch.)  This lets destinations like FileHandle
+        combine all the text from a batch into a single write.
+
         None is also a legal "job"; it must be the last "job"
         in a work list.  If threaded is True, this causes the
         worker thread to exit; if threaded is False, it causes
@@ -1037,9 +1646,16 @@ class Log:
         guarantees the notify callable will be called at some
         point after the work has been completed.
         """
+        # fast path: threaded, and no notify.
+        queue = self._queue
+        if (queue is not None) and (not notify):
+            queue.put(work)
+            return
+
         if not self._thread:
             try:
                 self._execute(work)
+                self._end_batch()
             finally:
                 if notify:
                     notify()
@@ -1309,6 +1925,35 @@ class Log:
                 lock.release()
 
 
+    def _limit(self, time, format):
+        # sampling and rate limiting for a message in format.
+        # returns None if the message should be dropped; otherwise
+        # returns the number of messages in format dropped since
+        # the last one we let through (see _Limiter).  everything
+        # that logs a message calls this first--including
+        # LogAggregator, for messages from other processes.
+        limiter = self._limiters.get(format)
+        if not limiter:
+            return 0
+        return limiter(time)
+
+    def _suppressed_job(self, time, thread, format, suppressed):
+        message = f"[suppressed {suppressed} {format!r} message{'s' if suppressed != 1 else ''}]"
+        return (self._log, (time, thread, 'print', message))
+
+    def _suppressed_work(self, time):
+        # logs the "suppressed" summary for every rate-limited
+        # format that has dropped messages since it last logged one.
+        work = []
+        thread = None
+        for format, limiter in self._limiters.items():
+            suppressed = limiter.take_suppressed()
+            if suppressed:
+                if thread is None:
+                    thread = current_thread()
+                work.append(self._suppressed_job(time, thread, format, suppressed))
+        return work
+
     def reset(self):
         """
         Resets the log to 'initial' state.
@@ -1331,7 +1976,7 @@ class Log:
         ns2 = clock()
         ns = (ns1 + ns2) // 2
 
-        self._dispatch( [(self._ensure_state, ('initial', ns, epoch)),] )
+        self._dispatch(self._suppressed_work(ns) + [(self._ensure_state, ('initial', ns, epoch)),] )
 
     def _flush(self, blocker=None):
         if self._dirty:
@@ -1361,7 +2006,7 @@ class Log:
                 blocker.acquire()
                 notify = blocker.release
 
-            self._dispatch([(self._flush, ())], notify=notify)
+            self._dispatch(self._suppressed_work(self._clock()) + [(self._flush, ())], notify=notify)
 
         finally:
             if notify:
@@ -1403,7 +2048,7 @@ class Log:
                 blocker.acquire()
                 notify = blocker.release
 
-            self._dispatch([(self._ensure_state, ('closed', ns, epoch))], notify=notify)
+            self._dispatch(self._suppressed_work(ns) + [(self._ensure_state, ('closed', ns, epoch))], notify=notify)
 
         finally:
             if notify:
@@ -1472,8 +2117,15 @@ class Log:
         """
 
         elapsed = self._elapsed(time)
-        formatted = self._format_message(elapsed, thread, format, message)
-        if not (formatted and self._ensure_state('logged')):
+        if self._format_log:
+            formatted = self._format_message(elapsed, thread, format, message)
+            if not formatted:
+                return
+        elif self._formats[format] is None:
+            return
+        else:
+            formatted = None
+        if not self._ensure_state('logged'):
             return
 
         for destination in self._destinations:
@@ -1482,14 +2134,7 @@ class Log:
 
 
     def _print(self, time, thread, args, sep, end, flush, format):
-        joined = sep.join(args).rstrip()
-        if end is _end:
-            end = ''
-        elif end.endswith('\n'):
-            end = end[:-1]
-        message = f"{joined}{end}"
-
-        self._log(time, thread, format, message)
+        self._log(time, thread, format, _join_print_args(args, sep, end))
 
 
     def __call__(self, *args, sep=_sep, end=_end, flush=False, format='print'):
@@ -1506,9 +2151,7 @@ class Log:
         """
 
         time = self._clock()
-        thread = current_thread()
 
-        str_args = [str(a) for a in args]
         if (sep is not _sep) and (not isinstance(sep, str)):
             raise TypeError(f"sep must be str, not {type(sep).__name__}")
         if (end is not _end) and (not isinstance(end, str)):
@@ -1519,7 +2162,28 @@ class Log:
         if format in ('start', 'end', 'enter', 'exit'):
             raise ValueError(f"system format {format!r} can't be used with log.print or log.__call__")
 
-        self._dispatch([(self._print, (time, thread, str_args, sep, end, flush, format))])
+        # sampling and rate limiting happen before we convert args
+        # to str, so dropping a message costs as little as possible.
+        # but a dropped message still honors flush.
+        suppressed = self._limit(time, format)
+        if suppressed is None:
+            if flush:
+                self.flush(block=False)
+            return
+
+        thread = current_thread()
+
+        # convert args to str now, in case they're mutable and change
+        # before the worker thread gets to them.  but for simple
+        # immutable types, leave it for the worker thread.
+        str_args = [a if type(a) in _deferred_str_types else str(a) for a in args]
+
+        work = [(self._print, (time, thread, str_args, sep, end, flush, format))]
+        if suppressed:
+            work.insert(0, self._suppressed_job(time, thread, format, suppressed))
+        if flush:
+            work.append((self._flush, ()))
+        self._dispatch(work)
 
     def print(self, *args, end=_end, sep=_sep, flush=False, format='print'):
         """
@@ -1640,7 +2304,7 @@ class Log:
             write(elapsed, thread, formatted)
 
         In addition, Destination subclasses may optionally override
-        the following seven events / methods:
+        the following eight events / methods:
 
             log(self, elapsed, thread, format, message, formatted)
             flush()
@@ -1649,9 +2313,10 @@ class Log:
             end(elapsed)
             enter(elapsed, thread, message)
             exit(elapsed, thread)
+            end_batch()
 
         For all these methods, Destination subclasses need not
-        call the base class method.  The last six are do-nothing
+        call the base class method.  The last seven are do-nothing
         functions (just "pass").  log is the only one where the
         default implementation does something:
 
@@ -1661,6 +2326,12 @@ class Log:
         If you don't want this behavior, simply override log
         and *don't* super().log.
 
+        A Destination subclass whose log method never uses the
+        "formatted" argument may set the class attribute
+        uses_formatted to False.  If none of a Log's destinations
+        use it, the Log doesn't bother formatting log messages,
+        and passes None for "formatted" to log.
+
         Finally, Destination subclasses may also override this method:
 
             register(owner)
@@ -1728,6 +2399,14 @@ class Log:
         If the log is dirty at the time it's closed, Log
         automatically sends a "flush" before the "end".
 
+        While the log is in "logged" state, it also sends an
+        "end_batch" event after processing each batch of work.
+        In threaded mode, a batch is everything that was waiting
+        in the queue when the worker thread woke up; in unthreaded
+        mode, every call to the log is its own batch.  A Destination
+        may hold on to the text written during a batch, and write it
+        all at once when it receives "end_batch" (or "flush").
+
         If the log is reset, and the log is not in "initial" state,
         it closes the log (sending [flush] / end as appropriate),
         then sends a "reset" event, at which time the log will be
@@ -1738,6 +2417,8 @@ class Log:
         *any* events to its destinations besides the initial
         "register".
         """
+        uses_formatted = True
+
         def __init__(self):
             self.owner = None
 
@@ -1770,6 +2451,9 @@ class Log:
         def exit(self, elapsed, thread):
             pass
 
+        def end_batch(self):
+            pass
+
 
 
     class Callable(Destination):
@@ -1793,15 +2477,29 @@ class Log:
 
         Calls
             builtins.print(formatted, end='', flush=True)
-        for every formatted log message.
+        for every formatted log message.  When owned by a Log,
+        Print joins all the messages from a batch together
+        and prints them with one call.
         """
         "A Destination wrapping builtins.print."
         def __init__(self):
             super().__init__()
             self.print = builtins.print
+            self.batch = []
 
         def write(self, elapsed, thread, formatted):
-            self.print(formatted, end='', flush=True)
+            if self.owner is None:
+                self.print(formatted, end='', flush=True)
+            else:
+                self.batch.append(formatted)
+
+        def end_batch(self):
+            if self.batch:
+                formatted = "".join(self.batch)
+                self.batch.clear()
+                self.print(formatted, end='', flush=True)
+
+        flush = end_batch
 
 
 
@@ -1873,11 +2571,11 @@ class Log:
         buffered messages, opens the file, writes to it with one
         write call, and closes it.
 
-        If flush=True, the file is opened and kept open.  Every
-        time it receives a formatted log message, it writes the
-        message immediately and flushes the file handle.  If File
-        receives a "close" message, it closes the file; if it
-        receives a "reset" message, it reopens the file.
+        If flush=True, the file is opened and kept open.  At the
+        end of every batch of log messages, File writes the messages
+        from that batch with one write call, and flushes the file
+        handle.  If File receives a "close" message, it closes the
+        file; if it receives a "reset" message, it reopens the file.
 
         The first time the file is opened, it's opened using the
         "initial_mode" passed in, by default "at".  After the first
@@ -1908,15 +2606,21 @@ class Log:
                 self.mode = "at"
 
         def write(self, elapsed, thread, formatted):
-            if self._flush:
-                self.f.write(formatted)
-                self.f.flush()
-            elif formatted:
+            if formatted:
                 self.array.append(formatted)
 
+        def end_batch(self):
+            if self._flush and self.array:
+                contents = "".join(self.array)
+                self.array.clear()
+                self.f.write(contents)
+                self.f.flush()
+
         def flush(self):
             if self.array:
-                assert not self._flush
+                if self._flush:
+                    self.end_batch()
+                    return
                 assert not self.f
                 contents = "".join(self.array)
                 self.array.clear()
@@ -1959,6 +2663,229 @@ class Log:
             super().start(start_time_ns, start_time_epoch)
 
 
+    class RotatingFile(Destination):
+        """
+        A Destination writing to a file in the filesystem,
+        which "rotates" the file to keep its size bounded.
+
+        RotatingFile keeps the file at path open, writing log messages
+        to it through a large write buffer (buffer_size bytes), and only
+        flushes the file when the log is flushed.  The file is encoded
+        using encoding.  If the file already exists, RotatingFile appends
+        to it.
+
+        If max_bytes is not None, RotatingFile rotates the file before
+        writing a message that would make it larger than max_bytes bytes.
+        If interval is not None, RotatingFile rotates the file before
+        writing a message if interval seconds have passed since the
+        file was opened.  You can specify both.
+
+        Rotating closes the file, renames it to path + ".1", and opens
+        a new, empty file at path.  Existing rotated files are renamed
+        too: ".1" becomes ".2", and so on.  RotatingFile keeps at most
+        backups rotated files; older files are deleted.  If backups is 0,
+        rotating simply truncates the file.
+
+        If compress is true, rotated files are compressed with gzip,
+        in a background thread, and have ".gz" appended to their names.
+        """
+        def __init__(self, path, *, max_bytes=None, interval=None, backups=5, compress=False, encoding='utf-8', buffer_size=1 << 20):
+            super().__init__()
+            if (max_bytes is not None) and (max_bytes < 1):
+                raise ValueError("max_bytes must be 1 or greater")
+            if (interval is not None) and (interval <= 0):
+                raise ValueError("interval must be greater than 0")
+            if backups < 0:
+                raise ValueError("backups must be 0 or greater")
+
+            self.path = Path(path)
+            self.max_bytes = max_bytes
+            self.interval = interval
+            self.backups = backups
+            self.compress = compress
+            self.encoding = encoding
+            self.buffer_size = buffer_size
+
+            self.f = None
+            self.size = 0
+            self.rollover_time = None
+            self.compressor = None
+
+        def _open(self):
+            self.f = self.path.open('ab', buffering=self.buffer_size)
+            self.size = self.f.tell()
+            if self.interval is not None:
+                self.rollover_time = time.time() + self.interval
+
+        def _close(self):
+            if self.f:
+                f = self.f
+                self.f = None
+                f.close()
+
+        def _wait_for_compressor(self):
+            if self.compressor:
+                self.compressor.join()
+                self.compressor = None
+
+        def _generation(self, n):
+            suffix = f".{n}.gz" if self.compress else f".{n}"
+            return self.path.with_name(self.path.name + suffix)
+
+        def _rotate(self):
+            self._close()
+            # don't rename files out from under the compressor.
+            self._wait_for_compressor()
+
+            if not self.backups:
+                if self.path.exists():
+                    self.path.unlink()
+            else:
+                oldest = self._generation(self.backups)
+                if oldest.exists():
+                    oldest.unlink()
+                for n in range(self.backups - 1, 0, -1):
+                    generation = self._generation(n)
+                    if generation.exists():
+                        generation.replace(self._generation(n + 1))
+
+                if not self.compress:
+                    self.path.replace(self._generation(1))
+                else:
+                    uncompressed = self.path.with_name(self.path.name + ".1")
+                    self.path.replace(uncompressed)
+                    self.compressor = Thread(target=_compress_file, args=(uncompressed, self._generation(1)))
+                    self.compressor.start()
+
+            self._open()
+
+        def start(self, start_time_ns, start_time_epoch):
+            super().start(start_time_ns, start_time_epoch)
+            self._open()
+
+        def end(self, elapsed):
+            super().end(elapsed)
+            self._close()
+            self._wait_for_compressor()
+
+        def write(self, elapsed, thread, formatted):
+            data = formatted.encode(self.encoding)
+            if self.size and (
+                ((self.max_bytes is not None) and ((self.size + len(data)) > self.max_bytes))
+                or ((self.rollover_time is not None) and (time.time() >= self.rollover_time))
+                ):
+                self._rotate()
+            self.f.write(data)
+            self.size += len(data)
+
+        def flush(self):
+            if self.f:
+                self.f.flush()
+
+
+    class BinaryFile(Destination):
+        """
+        A Destination writing log events to a file in a compact binary format.
+
+        Every event is written as a small length-prefixed record: the event
+        type, the elapsed time in nanoseconds, the thread, the depth,
+        the format, and the message.  Format names and threads are
+        "interned"; they're written to the file once, and events refer
+        to them by number.
+
+        BinaryFile doesn't store the formatted text for log events,
+        only the message.  (For write events, there is no message,
+        so BinaryFile stores the formatted text.)  If all of a Log's
+        destinations are BinaryFile objects, the Log doesn't format
+        log messages at all.
+
+        The file is written through a write buffer of buffer_size bytes,
+        and flushed when the log is flushed.  If the file already exists,
+        BinaryFile appends to it.
+
+        Use read_binary_log to read the events back as SinkEvent objects,
+        or print_binary_log to print them as text.
+        """
+        uses_formatted = False
+
+        def __init__(self, path, *, buffer_size=1 << 20):
+            super().__init__()
+            self.path = Path(path)
+            self.buffer_size = buffer_size
+            self.f = None
+            self.formats = {None: 0}
+            self.threads = {}
+            self.depth = 0
+
+        def _define_format(self, format):
+            number = len(self.formats)
+            self.formats[format] = number
+            data = format.encode('utf-8')
+            self.f.write(_binary_format.pack(_binary_format.size - 4 + len(data), _BINARY_FORMAT, number) + data)
+            return number
+
+        def _define_thread(self, key):
+            number = len(self.threads) + 1
+            self.threads[key] = number
+            ident, name = key
+            data = name.encode('utf-8')
+            self.f.write(_binary_thread.pack(_binary_thread.size - 4 + len(data), _BINARY_THREAD, number, ident or 0) + data)
+            return number
+
+        def _event(self, type, elapsed, thread, format, message):
+            if thread is None:
+                thread_number = 0
+            else:
+                key = (thread.ident, thread.name)
+                thread_number = self.threads.get(key)
+                if thread_number is None:
+                    thread_number = self._define_thread(key)
+
+            format_number = self.formats.get(format)
+            if format_number is None:
+                format_number = self._define_format(format)
+
+            data = message.encode('utf-8') if message else b''
+            self.f.write(_binary_event.pack(_binary_event.size - 4 + len(data), type, elapsed, thread_number, self.depth, format_number) + data)
+
+        def start(self, start_time_ns, start_time_epoch):
+            super().start(start_time_ns, start_time_epoch)
+            self.f = self.path.open('ab', buffering=self.buffer_size)
+            if not self.f.tell():
+                self.f.write(_binary_magic)
+            # interned values are per-file-handle;
+            # after a reset, we start over.
+            self.formats = {None: 0}
+            self.threads.clear()
+            self.depth = 0
+            self.f.write(_binary_start.pack(_binary_start.size - 4, _BINARY_START, start_time_ns, start_time_epoch))
+
+        def end(self, elapsed):
+            super().end(elapsed)
+            self.f.write(_binary_end.pack(_binary_end.size - 4, _BINARY_END, elapsed))
+            f = self.f
+            self.f = None
+            f.close()
+
+        def write(self, elapsed, thread, formatted):
+            self._event(_BINARY_WRITE, elapsed, thread, None, formatted)
+
+        def log(self, elapsed, thread, format, message, formatted):
+            self._event(_BINARY_LOG, elapsed, thread, format, message)
+
+        def enter(self, elapsed, thread, message):
+            self._event(_BINARY_ENTER, elapsed, thread, None, message)
+            self.depth += 1
+
+        def exit(self, elapsed, thread):
+            self.depth -= 1
+            self._event(_BINARY_EXIT, elapsed, thread, None, None)
+
+        def flush(self):
+            if self.f:
+                self.f.flush()
+
+
     class FileHandle(Destination):
         """
         A Destination wrapping an open Python file handle.
@@ -1967,8 +2894,9 @@ class Log:
         It will never close the file handle; it will only ever
         write to it, and flush it.
 
-        Every time a formatted log message is received,
-        FileHandle writes it immediately to the file handle.
+        When owned by a Log, FileHandle joins all the formatted
+        log messages from a batch together, and writes them to the
+        file handle with one write call at the end of the batch.
         If flush=True, FileHandle will immediately flush the
         file handle after writing; by default flush is False.
         """
@@ -1978,13 +2906,26 @@ class Log:
                 raise TypeError(f"invalid file handle {handle}")
             self.handle = handle
             self._flush = flush
+            self.batch = []
 
         def write(self, elapsed, thread, formatted):
-            self.handle.write(formatted)
-            if self._flush:
-                self.handle.flush()
+            if self.owner is None:
+                self.handle.write(formatted)
+                if self._flush:
+                    self.handle.flush()
+            else:
+                self.batch.append(formatted)
+
+        def end_batch(self):
+            if self.batch:
+                formatted = "".join(self.batch)
+                self.batch.clear()
+                self.handle.write(formatted)
+                if self._flush:
+                    self.handle.flush()
 
         def flush(self):
+            self.end_batch()
             self.handle.flush()
 
 
@@ -2006,10 +2947,13 @@ class Log:
         def __init__(self):
             super().__init__()
             self.number = 1
-            self.events = []
+            self._init_events()
             self.longest_message = 0
             self._reset()
 
+        def _init_events(self):
+            self.events = []
+
         def _reset(self):
             self.depth = 0
             self.previous_message_elapsed = 0
@@ -2030,8 +2974,8 @@ class Log:
             self.number += 1
             self._reset()
 
-        def start(self, start_time_ns, start_time_epoch):
-            configuration = {
+        def _configuration(self):
+            return {
                 "name" : self.owner.name,
                 "threading" : self.owner.threading,
                 "indent" : self.owner.indent,
@@ -2042,7 +2986,9 @@ class Log:
                 "prefix" : self.owner.prefix,
                 "formats " : dict(self.owner.formats),
             }
-            self._event(SinkStartEvent(self.number, start_time_ns, start_time_epoch, configuration))
+
+        def start(self, start_time_ns, start_time_epoch):
+            self._event(SinkStartEvent(self.number, start_time_ns, start_time_epoch, self._configuration()))
 
         def end(self, elapsed):
             self._event(SinkEndEvent(self.number, elapsed))
@@ -2106,10 +3052,620 @@ class Log:
                     print(prefix_str + line)
                     prefix_str = space_str
 
+
+    class RingSink(Sink):
+        """
+        A Sink that only retains the most recent log events,
+        using a bounded amount of memory.
+
+        RingSink works like a "flight recorder".  It retains
+        at most capacity events; once it's full, every new event
+        replaces the oldest one.  If max_bytes is not None, RingSink
+        also discards the oldest events whenever the text it retains
+        (the message and formatted text of its events, as measured by
+        sys.getsizeof) would exceed max_bytes bytes.  RingSink always
+        retains at least the most recent event.
+
+        RingSink doesn't create SinkEvent objects when it receives
+        events.  Instead, it stores their fields in arrays allocated
+        once, in the constructor.  It only creates SinkEvent objects
+        when you iterate over it, or use the events attribute or the
+        print method.
+
+        RingSink.dump() writes the formatted text of the retained
+        events to another Destination.  If you pass in dump_destination,
+        RingSink dumps to it automatically when the log ends.
+        Since the Log ends itself at exit, this includes when the
+        program exits because of an unhandled exception.
+        """
+
+        _START, _END, _WRITE, _LOG, _ENTER, _EXIT = range(6)
+
+        def __init__(self, capacity=1024, *, max_bytes=None, dump_destination=None):
+            if capacity < 1:
+                raise ValueError(f"capacity must be at least 1, not {capacity!r}")
+            if (max_bytes is not None) and (max_bytes < 1):
+                raise ValueError(f"max_bytes must be at least 1, not {max_bytes!r}")
+            self.capacity = capacity
+            self.max_bytes = max_bytes
+            self.dump_destination = Log.map_destination(dump_destination) if dump_destination is not None else None
+            super().__init__()
+
+        def _init_events(self):
+            capacity = self.capacity
+            zeroes = bytes(8 * capacity)
+
+            self._types = bytearray(capacity)
+            self._numbers = array('q', zeroes)
+            self._depths = array('q', zeroes)
+            self._elapseds = array('q', zeroes)
+            self._durations = array('q', zeroes)
+            self._sizes = array('q', zeroes)
+            self._threads = [None] * capacity
+            self._formats = [None] * capacity
+            self._messages = [None] * capacity
+            self._formatteds = [None] * capacity
+            # (start_time_ns, start_time_epoch, configuration), start events only
+            self._starts = [None] * capacity
+
+            # the oldest event is at index _head
+            self._head = 0
+            self._count = 0
+            self._bytes = 0
+
+        def _discard_oldest(self):
+            i = self._head
+            self._bytes -= self._sizes[i]
+            self._sizes[i] = 0
+            self._threads[i] = self._formats[i] = self._messages[i] = self._formatteds[i] = self._starts[i] = None
+            self._head = (i + 1) % self.capacity
+            self._count -= 1
+
+        def _store(self, type, depth, elapsed, thread, format, message, formatted, start=None):
+            if message is not None:
+                self.longest_message = max(self.longest_message, len(message))
+
+            duration = elapsed - self.previous_message_elapsed
+            assert duration >= 0, f"duration should be >= 0 but it's {duration}"
+            self.previous_message_elapsed = elapsed
+
+            if self._count == self.capacity:
+                self._discard_oldest()
+            i = (self._head + self._count) % self.capacity
+            self._count += 1
+
+            self._types[i] = type
+            self._numbers[i] = self.number
+            self._depths[i] = depth
+            self._elapseds[i] = elapsed
+            self._durations[i] = duration
+            self._threads[i] = thread
+            self._formats[i] = format
+            self._messages[i] = message
+            self._formatteds[i] = formatted
+            self._starts[i] = start
+
+            max_bytes = self.max_bytes
+            if max_bytes is not None:
+                size = 0
+                if message is not None:
+                    size += sys.getsizeof(message)
+                if formatted is not None:
+                    size += sys.getsizeof(formatted)
+                self._sizes[i] = size
+                self._bytes += size
+                while (self._bytes > max_bytes) and (self._count > 1):
+                    self._discard_oldest()
+
+        def _event_at(self, i):
+            type = self._types[i]
+            number = self._numbers[i]
+            depth = self._depths[i]
+            elapsed = self._elapseds[i]
+            thread = self._threads[i]
+
+            if type == self._LOG:
+                event = SinkLogEvent(number, depth, elapsed, thread, self._formats[i], self._messages[i], self._formatteds[i])
+            elif type == self._WRITE:
+                event = SinkWriteEvent(number, depth, elapsed, thread, self._formatteds[i])
+            elif type == self._ENTER:
+                event = SinkEnterEvent(number, depth, elapsed, thread, self._messages[i])
+            elif type == self._EXIT:
+                event = SinkExitEvent(number, depth, elapsed, thread)
+            elif type == self._START:
+                start_time_ns, start_time_epoch, configuration = self._starts[i]
+                event = SinkStartEvent(number, start_time_ns, start_time_epoch, configuration)
+            else:
+                event = SinkEndEvent(number, elapsed)
+            event._duration = self._durations[i]
+            return event
+
+        @property
+        def events(self):
+            return list(self)
+
+        def __iter__(self):
+            head = self._head
+            capacity = self.capacity
+            for offset in range(self._count):
+                yield self._event_at((head + offset) % capacity)
+
+        def __len__(self):
+            return self._count
+
+        def start(self, start_time_ns, start_time_epoch):
+            self._store(self._START, 0, 0, None, None, None, None, (start_time_ns, start_time_epoch, self._configuration()))
+
+        def end(self, elapsed):
+            self._store(self._END, 0, elapsed, None, None, None, None)
+            self.depth = 0
+            if self.dump_destination is not None:
+                self.dump(self.dump_destination)
+
+        def write(self, elapsed, thread, formatted):
+            self._store(self._WRITE, self.depth, elapsed, thread, None, None, formatted)
+
+        def log(self, elapsed, thread, format, message, formatted):
+            self._store(self._LOG, self.depth, elapsed, thread, format, message, formatted)
+
+        def enter(self, elapsed, thread, message):
+            self._store(self._ENTER, self.depth, elapsed, thread, None, message, None)
+            self.depth += 1
+
+        def exit(self, elapsed, thread):
+            self.depth -= 1
+            self._store(self._EXIT, self.depth, elapsed, thread, None, None, None)
+
+        def dump(self, destination=None):
+            """
+            Writes the formatted text of the retained events to destination.
+
+            Concatenates the formatted text of every retained "write"
+            and "log" event, writes it to destination with one write call,
+            then flushes destination.  destination may be anything
+            Log.map_destination accepts; by default, dump prints.
+            """
+            destination = Log.map_destination(destination) if destination is not None else Log.Print()
+            head = self._head
+            capacity = self.capacity
+            texts = []
+            elapsed = thread = None
+            for offset in range(self._count):
+                i = (head + offset) % capacity
+                if self._types[i] in (self._WRITE, self._LOG):
+                    formatted = self._formatteds[i]
+                    if formatted:
+                        texts.append(formatted)
+                        elapsed = self._elapseds[i]
+                        thread = self._threads[i]
+            if texts:
+                destination.write(elapsed, thread, "".join(texts))
+                destination.flush()
+
 TMPFILE = Log.TmpFile()
 export("TMPFILE")
 
 
+class _BinaryLogThread:
+    """
+    Stands in for the threading.Thread objects
+    in events read by read_binary_log.
+    """
+    __slots__ = ('ident', 'name')
+
+    def __init__(self, ident, name):
+        self.ident = ident
+        self.name = name
+
+    def __repr__(self):
+        return f"<thread {self.name!r} ident={self.ident}>"
+
+    def __eq__(self, other):
+        return isinstance(other, _BinaryLogThread) and (self.ident == other.ident) and (self.name == other.name)
+
+    def __hash__(self):
+        return hash((self.ident, self.name))
+
+
+@export
+def read_binary_log(path):
+    """
+    Reads a file written by Log.BinaryFile.
+
+    Returns an iterator yielding the events in the file,
+    as SinkEvent objects, in the same order the Log sent them.
+    The "thread" attribute of each event is a simple object with
+    "name" and "ident" attributes, rather than a threading.Thread.
+
+    SinkLogEvent objects have formatted set to None,
+    because BinaryFile doesn't store the formatted text.
+
+    read_binary_log reads the file one record at a time,
+    so reading a large log doesn't load it all into memory.
+
+    If the file ends with an incomplete record (for example,
+    if the program crashed while writing it), read_binary_log
+    silently ignores the incomplete record.
+    """
+    # each record is read separately, so reading a log
+    # never needs more memory than its largest record.
+    # these structs are the records without their length.
+    event_record = struct.Struct('<' + _binary_event.format[2:])
+    start_record = struct.Struct('<' + _binary_start.format[2:])
+    end_record = struct.Struct('<' + _binary_end.format[2:])
+    format_record = struct.Struct('<' + _binary_format.format[2:])
+    thread_record = struct.Struct('<' + _binary_thread.format[2:])
+
+    length_size = _binary_length.size
+    unpack_length = _binary_length.unpack
+
+    number = 0
+    formats = {0: None}
+    threads = {0: None}
+    previous_elapsed = 0
+
+    def event(e):
+        nonlocal previous_elapsed
+        e._duration = e._elapsed - previous_elapsed
+        previous_elapsed = e._elapsed
+        return e
+
+    with open(path, 'rb', buffering=1 << 16) as f:
+        read = f.read
+        if read(len(_binary_magic)) != _binary_magic:
+            raise ValueError(f"{path!r} isn't a binary log file")
+        offset = len(_binary_magic)
+
+        while True:
+            data = read(length_size)
+            if len(data) < length_size:
+                break
+            length = unpack_length(data)[0]
+            if not length:
+                raise ValueError(f"empty record at offset {offset}")
+            record = read(length)
+            if len(record) < length:
+                break
+            type = record[0]
+
+            if type in (_BINARY_WRITE, _BINARY_LOG, _BINARY_ENTER, _BINARY_EXIT):
+                _, elapsed, thread, depth, format = event_record.unpack_from(record)
+                message = record[event_record.size:].decode('utf-8')
+                thread = threads[thread]
+                if type == _BINARY_WRITE:
+                    yield event(SinkWriteEvent(number, depth, elapsed, thread, message))
+                elif type == _BINARY_LOG:
+                    yield event(SinkLogEvent(number, depth, elapsed, thread, formats[format], message, None))
+                elif type == _BINARY_ENTER:
+                    yield event(SinkEnterEvent(number, depth, elapsed, thread, message))
+                else:
+                    yield event(SinkExitEvent(number, depth, elapsed, thread))
+            elif type == _BINARY_FORMAT:
+                _, format = format_record.unpack_from(record)
+                formats[format] = record[format_record.size:].decode('utf-8')
+            elif type == _BINARY_THREAD:
+                _, thread, ident = thread_record.unpack_from(record)
+                name = record[thread_record.size:].decode('utf-8')
+                threads[thread] = _BinaryLogThread(ident, name)
+            elif type == _BINARY_START:
+                _, start_time_ns, start_time_epoch = start_record.unpack_from(record)
+                number += 1
+                formats = {0: None}
+                threads = {0: None}
+                previous_elapsed = 0
+                yield event(SinkStartEvent(number, start_time_ns, start_time_epoch, None))
+            elif type == _BINARY_END:
+                _, elapsed = end_record.unpack_from(record)
+                yield event(SinkEndEvent(number, elapsed))
+            else:
+                raise ValueError(f"unknown record type {type!r} at offset {offset}")
+
+            offset += length_size + length
+
+
+@export
+def print_binary_log(path, *, indent=4, print=None):
+    """
+    Prints the contents of a file written by Log.BinaryFile, as text.
+
+    Prints one line for every line of every logged message
+    (and every write), in this format:
+        [elapsed thread.name format] message
+    Messages are indented by indent spaces per level of depth.
+
+    print is the function used for printing;
+    it should behave identically to the builtin print function.
+    """
+    if not print:
+        print = builtins.print
+
+    for e in read_binary_log(path):
+        if e.type == SinkEvent.TYPE_LOG:
+            text = e.message
+            format = e.format
+        elif e.type == SinkEvent.TYPE_WRITE:
+            text = e.formatted.rstrip('\n')
+            format = ''
+        else:
+            continue
+        elapsed = e.elapsed / 1_000_000_000.0
+        name = e.thread.name if e.thread else ''
+        prefix = f"[{elapsed:014.10f} {name:>12} {format:>8}] " + (' ' * (e.depth * indent))
+        for line in text.split('\n'):
+            print(prefix + line)
+
+
+class _RemoteThread:
+    """
+    Stands in for the threading.Thread objects of threads
+    in other processes, in messages received by LogAggregator.
+    """
+    __slots__ = ('ident', 'name', 'pid')
+
+    def __init__(self, ident, name, pid):
+        self.ident = ident
+        self.name = name
+        self.pid = pid
+
+    def __repr__(self):
+        return f"<thread {self.name!r} ident={self.ident} pid={self.pid}>"
+
+
+@export
+class LogProxy:
+    """
+    A lightweight stand-in for a Log, for use in another process.
+
+    Don't create LogProxy objects directly; call LogAggregator.proxy().
+    Pass the proxy to the other process when you start it--for example,
+    as an argument to multiprocessing.Process, or in the initargs for a
+    concurrent.futures.ProcessPoolExecutor.
+
+    LogProxy supports the Log methods that log messages:
+    calling it, print, write, enter, exit, and one method
+    for every user-defined format (like box).  These lightly
+    preformat the message in the calling process, then send it,
+    along with the time and the calling thread, to the
+    LogAggregator in the parent process.  Sending takes no file lock.
+    The calling thread only puts the message on a multiprocessing
+    queue, which briefly takes that queue's in-process locks.  The
+    queue's background "feeder" thread writes the message to the pipe,
+    holding the queue's write lock--a lock shared across processes--
+    while it writes each message.
+
+    LogProxy.flush() asks the parent process to flush the Log.
+    LogProxy.close() stops sending messages; after that,
+    all messages are silently ignored.  Once the LogAggregator
+    is closed, all messages are silently ignored too.
+    """
+    def __init__(self, queue, clock, formats, stopped):
+        self._queue = queue
+        self._clock = clock
+        self._formats = formats
+        self._stopped = stopped
+        self._closed = False
+
+    def __getattr__(self, name):
+        # methods for user-defined formats, like Log.box().
+        formats = self.__dict__.get('_formats', ())
+        if name not in formats:
+            raise AttributeError(f"{self.__class__.__name__!r} object has no attribute {name!r}")
+        def method(message=''):
+            if not isinstance(message, str):
+                raise TypeError('message must be str')
+            self._send('log', name, message)
+        return method
+
+    def _send(self, kind, format, message):
+        if self._closed:
+            return
+        if self._stopped.value:
+            # the aggregator is closed, and nobody will read
+            # the queue again.  don't let anything we already
+            # sent keep this process from exiting.
+            self._closed = True
+            self._queue.cancel_join_thread()
+            return
+        thread = current_thread()
+        self._queue.put((self._clock(), kind, os.getpid(), thread.ident, thread.name, format, message))
+
+    def __call__(self, *args, sep=_sep, end=_end, flush=False, format='print'):
+        if (sep is not _sep) and (not isinstance(sep, str)):
+            raise TypeError(f"sep must be str, not {type(sep).__name__}")
+        if (end is not _end) and (not isinstance(end, str)):
+            raise TypeError(f"end must be str, not {type(end).__name__}")
+        if format not in self._formats:
+            raise ValueError(f"undefined format {format!r}")
+        self._send('log', format, _join_print_args(args, sep, end))
+        if flush:
+            self._send('flush', None, None)
+
+    def print(self, *args, end=_end, sep=_sep, flush=False, format='print'):
+        return self(*args, end=end, sep=sep, flush=flush, format=format)
+
+    def write(self, formatted):
+        if not isinstance(formatted, str):
+            raise TypeError('formatted must be str')
+        if formatted:
+            self._send('write', None, formatted)
+
+    def enter(self, message):
+        self._send('enter', None, message)
+        return Log.LogEnterAndExitContextManager(self)
+
+    def exit(self):
+        self._send('exit', None, None)
+
+    def flush(self):
+        self._send('flush', None, None)
+
+    def close(self):
+        self._closed = True
+
+
+@export
+class LogAggregator:
+    """
+    Merges log messages from other processes into a Log.
+
+    Create a LogAggregator in the parent process, passing in the Log.
+    Then call proxy() to create a LogProxy, and pass that to your
+    child processes.  The children log using the proxy; the aggregator
+    receives their messages in a background thread and logs them to the
+    Log, so they go to the Log's destinations.  The child processes don't
+    have their own Log objects, and the Log only emits one set of banners.
+
+    All the proxies from one aggregator send their messages over a single
+    multiprocessing queue.  The aggregator receives messages in batches:
+    it sorts each batch by time before logging it, and never logs a message
+    with a time earlier than the message it logged before.  The times
+    come from the Log's clock, called in the child process.  The default
+    clock, time.monotonic_ns, is the same in every process on the machine;
+    if you use your own clock, it must be too.
+
+    Messages from proxies obey the Log's sampling and rate limits,
+    just like messages logged directly.  They're applied in the
+    parent process, when the aggregator receives the messages.
+
+    The threads in messages from child processes are simple objects
+    with name, ident, and pid attributes.  Their name is the pid
+    and the name of the thread, like "12345:MainThread".
+
+    "context" is the multiprocessing context used to create the queue;
+    by default, LogAggregator uses the multiprocessing module itself.
+
+    Call close() when your child processes are done, to log all
+    outstanding messages and stop the background thread.  You may
+    also use a LogAggregator as a context manager; it closes itself
+    when the "with" block exits.
+    """
+    def __init__(self, log, *, context=None):
+        if context is None:
+            import multiprocessing as context
+
+        self._log = log
+        self._queue = context.Queue()
+        # shared with every proxy, so they know to stop
+        # sending once we're closed.  reading a RawValue
+        # doesn't take a lock.
+        self._stopped = context.RawValue('b', 0)
+        self._threads = {}
+        self._previous_time = None
+        self._thread = Thread(target=self._receive, daemon=True)
+        self._thread.start()
+
+    def proxy(self):
+        """
+        Returns a new LogProxy that sends messages to this aggregator.
+        """
+        log = self._log
+        formats = frozenset(
+            name
+            for name, f in log._formats.items()
+            if (f is not None) and (name not in ('start', 'end', 'enter', 'exit'))
+            )
+        return LogProxy(self._queue, log.clock, formats, self._stopped)
+
+    def _thread_for(self, pid, ident, name):
+        key = (pid, ident, name)
+        thread = self._threads.get(key)
+        if thread is None:
+            thread = self._threads[key] = _RemoteThread(ident, f"{pid}:{name}", pid)
+        return thread
+
+    def _receive(self):
+        from queue import Empty
+
+        log = self._log
+        get = self._queue.get
+        get_nowait = self._queue.get_nowait
+        time_key = lambda record: record[0]
+
+        while True:
+            batch = [get()]
+            while True:
+                try:
+                    batch.append(get_nowait())
+                except Empty:
+                    break
+
+            done = None in batch
+            if done:
+                del batch[batch.index(None):]
+            batch.sort(key=time_key)
+
+            work = []
+            append = work.append
+            flush = False
+            for time, kind, pid, ident, name, format, message in batch:
+                previous_time = self._previous_time
+                if (previous_time is not None) and (time < previous_time):
+                    time = previous_time
+                self._previous_time = time
+
+                thread = self._thread_for(pid, ident, name)
+                if kind == 'log':
+                    # apply the log's sampling and rate limits,
+                    # just like Log.__call__ does.
+                    suppressed = log._limit(time, format)
+                    if suppressed is None:
+                        continue
+                    if suppressed:
+                        append(log._suppressed_job(time, thread, format, suppressed))
+                    append((log._log, (time, thread, format, message)))
+                elif kind == 'write':
+                    append((log._write, (time, thread, message)))
+                elif kind == 'enter':
+                    append((log._enter, (time, thread, message)))
+                elif kind == 'exit':
+                    append((log._exit, (time, thread)))
+                else:
+                    assert kind == 'flush'
+                    flush = True
+            if flush:
+                append((log._flush, ()))
+            if work:
+                log._dispatch(work)
+            if done:
+                return
+
+    def close(self):
+        """
+        Logs all outstanding messages, and stops the aggregator.
+
+        Once the aggregator is closed, proxies stop sending messages,
+        and silently ignore anything else they're asked to log.
+        A message a child process is in the middle of sending when
+        close() is called may be lost; for best results, make sure
+        your child processes are done logging before you call close().
+        """
+        from queue import Empty
+
+        if not self._thread:
+            return
+        thread = self._thread
+        self._thread = None
+        self._stopped.value = 1
+        self._queue.put(None)
+        thread.join()
+
+        # discard anything a proxy sent after our sentinel,
+        # so it doesn't sit in the pipe.
+        get_nowait = self._queue.get_nowait
+        while True:
+            try:
+                get_nowait()
+            except Empty:
+                break
+        self._queue.close()
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, exc_type, exc_value, traceback):
+        self.close()
+
+
 @export
 class OldDestination(Log.Destination):
     """
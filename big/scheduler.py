@@ -25,7 +25,7 @@ THE USE OR OTHER DEALINGS IN THE SOFTWARE.
 """
 
 
-__all__ = ['Regulator', 'SingleThreadedRegulator', 'ThreadSafeRegulator', 'Scheduler']
+__all__ = ['Regulator', 'SingleThreadedRegulator', 'ThreadSafeRegulator', 'AsyncioRegulator', 'Scheduler']
 
 
 from abc import abstractmethod
@@ -83,6 +83,10 @@ class Regulator:
       with numbers (integers and floats), and `0` must
       represent both the earliest time and a zero-length
       interval of time.
+
+    If you want to iterate over a Scheduler with "async for",
+    its Regulator must also implement a coroutine method
+    called 'async_sleep'.  See AsyncioRegulator.
     """
 
     # A context manager that provides thread-safety
@@ -188,6 +192,64 @@ class ThreadSafeRegulator(Regulator):
         self.event.wait(interval)
 
 
+def _wake_waiter(waiter):
+    if not waiter.done():
+        waiter.set_result(None)
+
+@export
+class AsyncioRegulator(Regulator):
+    """
+    A Regulator object designed for use with asyncio.
+    Supports iterating over a Scheduler with "async for".
+
+    Sleeping doesn't block a thread; async_sleep awaits
+    a future, scheduled to complete with the event loop's
+    call_at method.  So one event loop can run many
+    Schedulers at once.
+
+    AsyncioRegulator isn't thread-safe.  Only use it (and
+    its Scheduler) from the thread running the event loop.
+    """
+
+    def __init__(self):
+        self.waiters = set()
+
+    def __repr__(self): # pragma: no cover
+        return f"<AsyncioRegulator waiters={len(self.waiters)}>"
+
+    def now(self):
+        return time.monotonic()
+
+    def wake(self):
+        for waiter in self.waiters:
+            _wake_waiter(waiter)
+
+    def sleep(self, interval):
+        time.sleep(interval)
+
+    async def async_sleep(self, interval):
+        """
+        Sleeps for interval seconds, without blocking
+        the event loop.  If wake is called while sleeping,
+        async_sleep returns immediately.
+        """
+        import asyncio
+
+        if interval <= 0:
+            await asyncio.sleep(0)
+            return
+
+        loop = asyncio.get_running_loop()
+        waiter = loop.create_future()
+        handle = loop.call_at(loop.time() + interval, _wake_waiter, waiter)
+        self.waiters.add(waiter)
+        try:
+            await waiter
+        finally:
+            handle.cancel()
+            self.waiters.discard(waiter)
+
+
 DEFAULT_PRIORITY = 100
 export('DEFAULT_PRIORITY')
 
@@ -206,6 +268,8 @@ class Event:
         self.time = time
         self.priority = priority
         self.sequence = sequence
+        # true until the event is yielded or canceled.
+        self.scheduled = True
 
     def __lt__(self, other):
         if self.time < other.time:
@@ -268,12 +332,24 @@ class Scheduler:
     (If you need the scheduler to be thread-safe, pass in
     an instance of a thread-safe Regulator class like
     ThreadSafeRegulator.)
+
+    If you use an AsyncioRegulator, you can iterate over
+    the Scheduler with "async for", which awaits events
+    rather than blocking the thread.
     """
 
     def __init__(self, regulator=default_regulator):
         self.regulator = regulator
         self.heap = Heap()
         self.event_id_counter = 0
+        # canceling an event doesn't remove it from the heap,
+        # it just marks it as no longer scheduled.  (this makes
+        # cancel O(1) rather than O(n).)  _next discards canceled
+        # events when they reach the front of the heap.  canceled
+        # is the number of canceled events still in the heap;
+        # if they ever outnumber the live events, cancel
+        # rebuilds the heap without them.
+        self.canceled = 0
 
     def schedule(self, o, time, *, absolute=False, priority=DEFAULT_PRIORITY):
         """Schedule a new event to be yielded at a specific future time.
@@ -309,7 +385,13 @@ class Scheduler:
         If the event is not in the queue, raises ValueError.
         """
         with self.regulator.lock:
-            self.heap.remove(event)
+            if (event.scheduler is not self) or (not event.scheduled):
+                raise ValueError("event not in scheduler")
+            event.scheduled = False
+            self.canceled += 1
+            if (self.canceled * 2) > len(self.heap):
+                self.heap = Heap([e for e in self.heap._queue if e.scheduled])
+                self.canceled = 0
             self.regulator.wake()
 
     def __bool__(self):
@@ -320,7 +402,7 @@ class Scheduler:
         yet to be yielded by the Scheduler.
         """
         with self.regulator.lock:
-            return bool(self.heap)
+            return len(self.heap) > self.canceled
 
     @property
     def queue(self):
@@ -338,7 +420,7 @@ class Scheduler:
         # having this exact property, so I kept it.
 
         with self.regulator.lock:
-            return self.heap.queue
+            return [e for e in self.heap.queue if e.scheduled]
 
     def _next(self, blocking=True):
         # Why a loop?  In case we get woken up early.
@@ -354,12 +436,18 @@ class Scheduler:
                 if not self.heap:
                     raise StopIteration
 
-                now = self.regulator.now()
                 ev = self.heap[0]
+                if not ev.scheduled:
+                    self.heap.popleft()
+                    self.canceled -= 1
+                    continue
+
+                now = self.regulator.now()
                 time_to_next_event = ev.time - now
 
                 if time_to_next_event <= 0:
                     self.heap.popleft()
+                    ev.scheduled = False
                     return ev.event
 
                 # Don't sleep while holding the lock!
@@ -383,6 +471,40 @@ class Scheduler:
     def __next__(self):
         return self._next()
 
+    def __aiter__(self):
+        return self
+
+    async def __anext__(self):
+        # the same as _next, except it awaits
+        # the regulator's async_sleep.
+        while True:
+
+            with self.regulator.lock:
+                if not self.heap:
+                    raise StopAsyncIteration
+
+                ev = self.heap[0]
+                if not ev.scheduled:
+                    self.heap.popleft()
+                    self.canceled -= 1
+                    continue
+
+                now = self.regulator.now()
+                time_to_next_event = ev.time - now
+
+                if time_to_next_event <= 0:
+                    self.heap.popleft()
+                    ev.scheduled = False
+                    return ev.event
+
+                sleep = getattr(self.regulator, 'async_sleep', None)
+
+            if sleep is None:
+                raise TypeError(f"can't use async for with {self.regulator!r}, it has no async_sleep method (try AsyncioRegulator)")
+
+            # assert time_to_next_event > 0
+            await sleep(time_to_next_event)
+
 
     class NonBlockingSchedulerIterator:
         def __init__(self, scheduler):
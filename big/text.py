@@ -25,6 +25,8 @@ THE USE OR OTHER DEALINGS IN THE SOFTWARE.
 """
 
 from .boundinnerclass import BoundInnerClass
+import bisect
+import concurrent.futures
 import enum
 import functools
 import heapq
@@ -44,6 +46,11 @@ try: # pragma: no cover
 except ImportError: # pragma: no cover
     re_Pattern = re._pattern_type
 
+try: # pragma: no cover
+    from re import _parser as _sre_parse
+except ImportError: # pragma: no cover
+    import sre_parse as _sre_parse
+
 try: # pragma: no cover
     import regex
     regex_Pattern = regex.Pattern
@@ -357,6 +364,13 @@ _reversed_builtin_separators = {
     bytes_linebreaks_without_crlf: bytes_linebreaks_without_crlf,
     }
 
+def _multisplit_reversed_separators(separators):
+    separators = tuple(separators)
+    s2 = _reversed_builtin_separators.get(separators, None)
+    if s2 is not None:
+        return s2
+    return _multisplit_reversed(separators, 'separators')
+
 
 def _re_quote(s):
     # don't bother escaping whitespace.
@@ -481,24 +495,21 @@ def reversed_re_finditer(pattern, string):
     # so what we do is: we ask re.finditer for all the forward
     # matches.  then, for every match it found, we check every
     # overlapping character to see if there's a different match
-    # there that we might prefer.  if we prefer one of those,
-    # we yield that--but we keep around the other matches,
-    # because one of those (or a truncated version of it) might
-    # also work.
-
-
-    # matches and overlapping_matches are lists of 3-tuples of:
-    #    (end_pos, -start_pos, match)
-    # If we sort one of those lists, the last element will be
-    # the correct last match in "reverse" order.  See
-    #    https://en.wikipedia.org/wiki/Schwartzian_transform
-    #
-    # matches contains the list of matches we got directly from
-    # re.finditer(), reversed.  since this was found using re in
-    # "forward" order, we need to check every match in this list
+    # there that we might prefer.  each time, we yield the match
+    # that ends rightmost (and of those, the longest)--but we keep
+    # around the other matches, because one of those (or a
+    # truncated version of it) might also work.
+
+
+    # forward is a list of 3-tuples of:
+    #    (start_pos, end_pos, match)
+    # for the matches we got directly from re.finditer().
+    # finditer yields them in order, so forward is already
+    # sorted.  since these were found using re in "forward"
+    # order, we need to check every match in this list
     # for potential overlapping matches.
-    matches = [(match.end(), -match.start(), match) for match in pattern.finditer(string)]
-    if not matches:
+    forward = [(match.start(), match.end(), match) for match in pattern.finditer(string)]
+    if not forward:
         return
 
     # Does this pattern match zero-length strings?
@@ -542,23 +553,22 @@ def reversed_re_finditer(pattern, string):
         #
         # So specifically we're going to do this:
         #
-        # for every match m in matches:
+        # for every match m in forward:
         #   if m has nonzero length,
         #     and the pattern matches a zero-length string
         #       starting at m,
-        #     ensure that the zero-length match is also in matches.
+        #     ensure that the zero-length match is also in forward,
+        #     just before m.
         #   elif m has zero length,
         #     if we've already ensured that a zero-length
         #     match starting at m.start() is in matches,
         #     discard m.
 
         zeroes = set()
-        new_matches = []
-        append = new_matches.append
-        last_start = -1
-        for t in matches:
-            match = t[2]
-            start, end = match.span()
+        new_forward = []
+        append = new_forward.append
+        for t in forward:
+            start, end, match = t
 
             if start not in zeroes:
                 if (start == end):
@@ -568,22 +578,92 @@ def reversed_re_finditer(pattern, string):
 
                 zero_match = pattern.match(string, start, start)
                 if zero_match:
-                    t_zero_length = (start, -start, zero_match)
+                    t_zero_length = (start, start, zero_match)
                     append(t_zero_length)
                 zeroes.add(start)
             append(t)
         # del zeroes
-        matches = new_matches
-
-    matches.sort()
-
-    # overlapping_matches is a list of the possibly-viable
-    # overlapping matches we found from checking a match
-    # we got from "matches".
-    overlapping_matches = []
+        forward = new_forward
+
+    # The match we want might start at any position inside any
+    # forward match, not just the one nearest the end.  A match
+    # starting inside an earlier forward match can end later than
+    # anything inside the later one.  With '[ab]b|b|b|cab' and
+    # 'cabb', the forward matches are 'cab' and 'b', but the match
+    # we want is 'bb', starting inside 'cab'.
+    #
+    # But re-matching at every position inside every forward match
+    # is expensive.  So we "scan" forward matches lazily, right to
+    # left, only as far as we need to.  Scanning a forward match
+    # adds it, and the match at every position inside it, to the
+    # lists below.  (A position between forward matches can't match,
+    # or finditer would have found it.)  We stop scanning once we're sure no
+    # match starting further left can end as far right as the best
+    # match we've found.  We can be sure two ways:
+    #
+    #   * if the pattern has a maximum width, no match starting
+    #     inside a forward match can end more than width-1
+    #     characters past its end.  "bounds" is a running maximum
+    #     of that for the forward matches.
+    #   * otherwise, we ask re.  "reaching" compiles a variant of
+    #     the pattern that only matches if it can end at or after
+    #     a given position, and we search for that once.  This
+    #     examines every position to the left in one pass in C,
+    #     which is much faster than re-matching at each of them.
+    #     But each search still costs about as much as a pass over
+    #     the string, so we only spend about one pass's worth on
+    #     them.  After that, we give up and scan everything.
+    #
+    # The variant only works if the pattern never looks to the
+    # right of the match (otherwise the truncated matches we yield
+    # could disagree with it), so other patterns skip straight
+    # to scanning everything.
+    width, safe = _reversed_re_finditer_general_limits(pattern)
+    if width is not None:
+        bounds = list(itertools.accumulate((end if ((end - start) < 2) else (end - 1 + width) for start, end, _ in forward), max))
+    else:
+        bounds = None
+    budget = len(string) if safe else -1
+
+    # "starts", "ends", and "found" are parallel lists of the matches
+    # we might yield from the forward matches we've scanned so far,
+    # sorted by start position.  forward[:unscanned] haven't been
+    # scanned yet; every match they contain starts at or before
+    # forward[unscanned]'s start.
+    #
+    # found holds the match object, or None if we haven't kept it.
+    # For the matches inside forward matches, we only store the
+    # start and end, and match again if we yield one.  (There can
+    # be a great many of them, and keeping hundreds of thousands
+    # of match objects--or tuples--alive makes the cyclic garbage
+    # collector very busy.)  An end of -1 means we already yielded
+    # this one, or it stopped matching.
+    starts = []
+    ends = []
+    found = []
+    unscanned = len(forward)
+
+    # Most matches inside a forward match end inside it too, and
+    # while the forward match is still viable, it beats all of them:
+    # it ends at least as far right, and starts further left.  So
+    # for patterns that never look to the right of the match, we
+    # only keep the ones that end past their forward match.  If we
+    # yield one of those, the forward match gets truncated, so we
+    # go back and "restore" the others.  "hidden" is the set of
+    # indexes into forward of the forward matches we've done this to.
+    hidden = set()
+    if safe:
+        forward_starts = [t[0] for t in forward]
+
+    # reach[i] is the furthest any of ends[0] through ends[i] reaches.
+    # truncating a match never makes it longer, so once reach[i] is
+    # less than the end of the best match we've found, nothing at
+    # or before index i can beat it.  (a pattern that looks to the
+    # right of the match could break that rule; we accept that.)
+    reach = []
 
-    result = []
-    match = None
+    pattern_match = pattern.match
+    pattern_search = pattern.search
 
     # We truncate each match at the start
     # of the previously yielded match.
@@ -592,108 +672,384 @@ def reversed_re_finditer(pattern, string):
     # to extend all the way to the end of the string.
     previous_match_start = len(string)
 
-    # cache some method lookups
-    pattern_match = pattern.match
-    append = overlapping_matches.append
-
     while True:
-        if overlapping_matches:
-            # overlapping_matches contains the overlapping
-            # matches found *last* time around, before we
-            # yielded the most recent match.
-            #
-            # The thing is, some of these matches might overlap that match.
-            # But we only yield *non*-overlapping matches.  So we need to
-            # filter the matches in overlapping_matches accordingly.
-
-            truncated_matches = []
-            # (overlapping_matches will be set to truncated_matches in a few lines)
-            append = truncated_matches.append
-
-            for t in overlapping_matches:
-                end, negated_start, match = t
-                start = -negated_start
-                if start > previous_match_start:
-                    # This match starts *after* the previous match started.
-                    # All matches starting at this position are no longer
-                    # viable.  Throw away the match.
-                    continue
-                if end <= previous_match_start:
-                    # This match ends *before* the previous match started.
-                    # In other words, this match is still 100% viable.
-                    # Keep it, we don't need to change it at all.
-                    append(t)
+        # matches starting *after* the previous match started
+        # are no longer viable.  they're all at the end of the
+        # lists, or of the unscanned forward matches.
+        i = len(starts)
+        while i and (starts[i - 1] > previous_match_start):
+            i -= 1
+        if i < len(starts):
+            del starts[i:], ends[i:], found[i:], reach[i:]
+        while unscanned and (forward[unscanned - 1][0] > previous_match_start):
+            unscanned -= 1
+
+        if hidden:
+            # if the previous match started inside a forward match,
+            # restore the matches we didn't keep from inside it.
+            k = bisect.bisect_left(forward_starts, previous_match_start) - 1
+            if (k in hidden) and (forward[k][1] > previous_match_start):
+                hidden.remove(k)
+                forward_start, forward_end, _ = forward[k]
+                restored = []
+                pos = forward_start + 1
+                while pos < previous_match_start:
+                    match = pattern_search(string, pos)
+                    if not match:
+                        break
+                    pos = match.start()
+                    if pos >= previous_match_start:
+                        break
+                    end = match.end()
+                    if end <= forward_end:
+                        restored.append((pos, end, None))
+                    pos += 1
+                # everything after the forward match in the
+                # lists is from inside it.
+                i = len(starts)
+                while i and (starts[i - 1] > forward_start):
+                    i -= 1
+                restored.extend(zip(starts[i:], ends[i:], found[i:]))
+                restored.sort(key=operator.itemgetter(0))
+                starts[i:] = [t[0] for t in restored]
+                ends[i:] = [t[1] for t in restored]
+                found[i:] = [t[2] for t in restored]
+                del reach[i:]
+                furthest = reach[-1] if reach else -1
+                for end in ends[i:]:
+                    if furthest < end:
+                        furthest = end
+                    reach.append(furthest)
+
+        chunk = 1
+        checked = False
+        while True:
+            # we want the match ending rightmost, and of those,
+            # the one starting leftmost (the longest).
+            best_index = -1
+            best_end = -1
+            i = len(starts)
+            while i:
+                i -= 1
+                if reach[i] < best_end:
+                    break
+                end = ends[i]
+                if end < 0:
                     continue
+                if end > previous_match_start:
+                    # This match overlaps the previous match, so it's
+                    # no longer viable.  But there might be a *different*
+                    # match starting at this position in the string.
+                    # So we do a fresh re.match here, stopping at the
+                    # start of the previously yielded match.
+                    match = pattern_match(string, starts[i], previous_match_start)
+                    if not match:
+                        ends[i] = -1
+                        found[i] = None
+                        continue
+                    ends[i] = end = match.end()
+                    found[i] = match
+                if end >= best_end:
+                    best_index = i
+                    best_end = end
 
-                # This match starts before the previous match started,
-                # but ends after the previous match start.
-                # In other words, it overlaps the previous match.
-                #
-                # So this match is itself no longer viable.  But!
-                # There might be a *different* match starting at this
-                # position in the string.  So we do a fresh re.match here,
-                # stopping at the start of the previously yielded match.
-                # (That's the third parameter, "endpos".)
-
-                match = pattern_match(string, start, previous_match_start)
-                if match:
-                    append((match.end(), -start, match))
-
-            overlapping_matches = truncated_matches
-
-        if (not overlapping_matches) and matches:
-            # We don't currently have any pre-screened
-            # overlapping matches we can use.
-            #
-            # But we *do* have a match (or matches) found in forwards mode.
-            # Grab the next one that's still viable.
-
-            scan_for_overlapping_matches = False
-            while matches:
-                t = matches.pop()
-                end, negated_start, match = t
-                start = -negated_start
-                if end <= previous_match_start:
-                    assert start <= previous_match_start
-                    append(t)
-                    start += 1
-                    scan_for_overlapping_matches = True
-                    break
+            if (not unscanned) or checked:
+                break
 
-            if scan_for_overlapping_matches:
-                # We scan every** position inside the match for an
-                # overlapping match.  All the matches we find go in
-                # overlapping_matches, then we sort it and yield
-                # the last one.
-                #
-                # ** We don't actually need to check the *first* position,
-                #    "start", because we already know what we'll find:
-                #    the match that we got from re.finditer() and
-                #    scanned for overlaps.
-                #
-                # As mentioned, the match we got from finditer
-                # is viable here, so add it to the list.
-
-                end = min(end, previous_match_start)
-                for pos in range(start, end):
-                    match = pattern_match(string, pos, previous_match_start)
-                    if match:
-                        append((match.end(), -pos, match))
-
-        if not overlapping_matches:
-            # matches and overlapping matches are both empty.
+            # Could a match in the unscanned forward matches
+            # end at or after best_end?  (If it ties, it starts
+            # further left, so it wins.)
+            lo = 0
+            if best_end >= 0:
+                if bounds is not None:
+                    if bounds[unscanned - 1] < best_end:
+                        break
+                    lo = max(0, unscanned - chunk)
+                    chunk *= 2
+                else:
+                    boundary = forward[unscanned][0] if (unscanned < len(forward)) else previous_match_start
+                    if best_end <= boundary:
+                        lo = max(0, unscanned - chunk)
+                        chunk *= 2
+                    elif budget >= boundary:
+                        budget -= boundary
+                        reaching = _reversed_re_finditer_reaching(pattern, previous_match_start - best_end + 1)
+                        if reaching:
+                            match = reaching.search(string, 0, previous_match_start)
+                            if (not match) or (match.start() >= boundary):
+                                break
+                            # scan every forward match that could
+                            # contain match.start() or anything after it.
+                            # nothing further left can reach best_end.
+                            position = match.start()
+                            lo = unscanned
+                            while lo and (forward[lo - 1][1] >= position):
+                                lo -= 1
+                            checked = True
+            else:
+                lo = max(0, unscanned - chunk)
+                chunk *= 2
+
+            new_starts = []
+            new_ends = []
+            new_found = []
+            append_start = new_starts.append
+            append_end = new_ends.append
+            append_found = new_found.append
+            for k in range(lo, unscanned):
+                start, forward_end, match = forward[k]
+                append_start(start)
+                append_end(forward_end)
+                append_found(match)
+                # use search rather than match, so re skips
+                # over the positions where nothing matches for us.
+                pos = start + 1
+                while pos < forward_end:
+                    match = pattern_search(string, pos)
+                    if not match:
+                        break
+                    pos = match.start()
+                    if pos >= forward_end:
+                        break
+                    end = match.end()
+                    if safe and (end <= forward_end):
+                        hidden.add(k)
+                    else:
+                        append_start(pos)
+                        append_end(end)
+                        append_found(None)
+                    pos += 1
+            starts[0:0] = new_starts
+            ends[0:0] = new_ends
+            found[0:0] = new_found
+            reach = list(itertools.accumulate(ends, max))
+            unscanned = lo
+
+        if best_end < 0:
             # We've exhausted the matches.  Stop iterating.
             return
 
-        # overlapping_matches is now guaranteed current and non-empty.
-        # We sort it so the rightmost match is last, and yield that.
-        overlapping_matches.sort()
-        match = overlapping_matches.pop()[2]
-        previous_match_start = match.start()
+        start = starts[best_index]
+        match = found[best_index]
+        if not match:
+            match = pattern_match(string, start)
+        ends[best_index] = -1
+        found[best_index] = None
+        previous_match_start = start
         yield match
 
 _reversed_re_finditer = reversed_re_finditer
 
+
+# see _reversed_re_finditer.
+_reversed_re_finditer_leading_flags = re.compile(r'(?:\(\?[aiLmsux]+\))*')
+_reversed_re_finditer_leading_flags_bytes = re.compile(rb'(?:\(\?[aiLmsux]+\))*')
+
+@functools.lru_cache(re._MAXCACHE)
+def _reversed_re_finditer_general_limits(pattern):
+    """
+    Returns (width, safe) for the general algorithm.
+    width is the length of the longest string pattern can match,
+    or None if it's unbounded (or we can't tell).  safe is true
+    if pattern never looks to the right of the end of the match.
+    """
+    if not isinstance(pattern, re_Pattern):
+        return (None, False)
+    try:
+        parsed = _sre_parse.parse(pattern.pattern, pattern.flags)
+        minimum, maximum = parsed.getwidth()
+    except Exception: # pragma: no cover
+        return (None, False)
+    if maximum >= _sre_parse.MAXREPEAT:
+        maximum = None
+    return (maximum, _reversed_re_finditer_safe(parsed))
+
+def _reversed_re_finditer_reaching(pattern, n):
+    """
+    Returns a variant of pattern that only matches where
+    pattern can match ending less than n characters before
+    endpos.  It may match where pattern's own match wouldn't;
+    it tries every way pattern could match, not just the first.
+
+    Returns None if we can't make one.
+    """
+    source = pattern.pattern
+    if isinstance(source, bytes):
+        source = source[_reversed_re_finditer_leading_flags_bytes.match(source).end():]
+        newline = b'\n'
+        template = b'(?:%s%s)(?!(?s:.){%d})'
+    else:
+        source = source[_reversed_re_finditer_leading_flags.match(source).end():]
+        newline = '\n'
+        template = '(?:%s%s)(?!(?s:.){%d})'
+    # in verbose mode, source could end with a comment.
+    if not (pattern.flags & re.VERBOSE):
+        newline = newline[:0]
+    try:
+        return re.compile(template % (source, newline, n), pattern.flags)
+    except (re.error, OverflowError):
+        return None
+
+
+# the longest match a pattern can produce
+# for us to use _reversed_re_finditer_bounded.
+_reversed_re_finditer_max_width = 1024
+
+# zero-width assertions that behave differently
+# when re.match truncates the string with endpos.
+_reversed_re_finditer_unsafe_at_codes = {
+    _sre_parse.AT_BOUNDARY,
+    _sre_parse.AT_END,
+    _sre_parse.AT_END_LINE,
+    _sre_parse.AT_END_STRING,
+    _sre_parse.AT_LOC_BOUNDARY,
+    _sre_parse.AT_LOC_NON_BOUNDARY,
+    _sre_parse.AT_NON_BOUNDARY,
+    _sre_parse.AT_UNI_BOUNDARY,
+    _sre_parse.AT_UNI_NON_BOUNDARY,
+    }
+
+def _reversed_re_finditer_safe(subpattern):
+    # returns True if nothing in subpattern looks to the right:
+    # no lookahead assertions, no $ or \Z, and no \b or \B.
+    SubPattern = _sre_parse.SubPattern
+    for op, av in subpattern:
+        if op is _sre_parse.AT:
+            if av in _reversed_re_finditer_unsafe_at_codes:
+                return False
+            continue
+        if (op is _sre_parse.ASSERT) or (op is _sre_parse.ASSERT_NOT):
+            direction = av[0]
+            if direction > 0:
+                return False
+        if isinstance(av, (tuple, list)):
+            for o in av:
+                if isinstance(o, list):
+                    subpatterns = o
+                else:
+                    subpatterns = (o,)
+                for o in subpatterns:
+                    if isinstance(o, SubPattern) and not _reversed_re_finditer_safe(o):
+                        return False
+    return True
+
+@functools.lru_cache(re._MAXCACHE)
+def _reversed_re_finditer_width(pattern):
+    """
+    If _reversed_re_finditer_bounded can handle pattern,
+    returns the length of the longest string it can match.
+    Otherwise returns None.
+
+    It can handle patterns that can't match an empty string,
+    with a maximum match length, that never look to the right
+    of the end of the match.
+    """
+    try:
+        parsed = _sre_parse.parse(pattern.pattern, pattern.flags)
+        minimum, maximum = parsed.getwidth()
+    except Exception: # pragma: no cover
+        return None
+    if (minimum < 1) or (maximum > _reversed_re_finditer_max_width):
+        return None
+    if not _reversed_re_finditer_safe(parsed):
+        return None
+    return maximum
+
+def _reversed_re_finditer_bounded(pattern, string, width):
+    # linear-time reversed_re_finditer, for patterns whose matches
+    # are never longer than width (see _reversed_re_finditer_width).
+    #
+    # we yield the matches the general algorithm is trying to find:
+    # of all the matches ending at or before "limit" (the start
+    # of the previous match we yielded), the one that ends
+    # rightmost, and of those, the longest.  (we match with
+    # endpos=limit, so matches can't extend past it.)
+    #
+    # since no match is longer than width, the winner always starts
+    # less than width characters before the end of any other match
+    # we know about.  so we only need to look a little way back
+    # from limit.
+    #
+    # "known" is a list of every match starting between known_start
+    # and limit, sorted by start, as (start, end, match) tuples.
+    # we extend it to the left, in chunks that double in size,
+    # until we're sure we've seen the winner.  then we yield the
+    # winner, and set limit to its start.
+    #
+    # a match in known that ends at or before the new limit is
+    # exactly the match we'd get if we matched again with the new
+    # endpos.  (the pattern never looks to the right of the match.)
+    # and a position that didn't match before still won't.  so we only
+    # re-match the few matches that overlap the new limit, and we
+    # examine every position in the string at most once.
+    search = pattern.search
+    match_at = pattern.match
+    limit = len(string)
+    known = []
+    known_start = limit
+    initial_chunk = max(2 * width, 256)
+
+    while limit > 0:
+        # discard matches starting at or after limit,
+        # and re-match the ones extending past it.
+        i = len(known)
+        while i:
+            i -= 1
+            start, end, match = known[i]
+            if end <= limit:
+                if (start + width) <= limit:
+                    break
+                continue
+            if start < limit:
+                match = match_at(string, start, limit)
+                if match:
+                    known[i] = (start, match.end(), match)
+                    continue
+            del known[i]
+        known_start = min(known_start, limit)
+
+        chunk = initial_chunk
+        while True:
+            # find the winner among the matches we know about.
+            best = None
+            best_start = best_end = -1
+            for start, end, match in reversed(known):
+                if (start + width) < best_end:
+                    break
+                if end >= best_end:
+                    best = match
+                    best_start = start
+                    best_end = end
+
+            if best and ((best_end - width) >= known_start):
+                break
+            if not known_start:
+                if best:
+                    break
+                return
+
+            # look further left.
+            new_start = max(0, known_start - chunk)
+            new = []
+            append = new.append
+            pos = new_start
+            while pos < known_start:
+                match = search(string, pos, limit)
+                if not match:
+                    break
+                start = match.start()
+                if start >= known_start:
+                    break
+                append((start, match.end(), match))
+                pos = start + 1
+            known[0:0] = new
+            known_start = new_start
+            chunk *= 2
+
+        yield best
+        limit = best_start
+
+
 @export
 def reversed_re_finditer(pattern, string, flags=0):
     """
@@ -707,10 +1063,20 @@ def reversed_re_finditer(pattern, string, flags=0):
     the flags you passed in.
 
     string should be the same type as pattern (or pattern.pattern).
+
+    If pattern can't match an empty string, has a maximum match
+    length of 1024 or less, and never looks to the right of the match
+    (no lookahead, $, or \\b), reversed_re_finditer runs in linear time,
+    and only examines as much of the end of string as it needs.
     """
     if not isinstance_re_pattern(pattern):
         pattern = re.compile(pattern, flags=flags)
 
+    if isinstance(pattern, re_Pattern):
+        width = _reversed_re_finditer_width(pattern)
+        if width:
+            return _reversed_re_finditer_bounded(pattern, string, width)
+
     return _reversed_re_finditer(pattern, string)
 
 
@@ -808,8 +1174,130 @@ def re_rpartition(s, pattern, count=1, *, flags=0):
     return extension + tuple(result)
 
 
-@functools.lru_cache(re._MAXCACHE)
+# with at least this many separators, __separators_to_re
+# builds a trie-shaped pattern (see _separators_to_trie_re)
+# rather than one long alternation.  None means never.
+# set it with set_multisplit_trie_threshold.
+_separators_trie_threshold = 32
+
+@export
+def set_multisplit_trie_threshold(threshold):
+    """
+    Sets how many separators multisplit needs before it
+    builds a trie-shaped regular expression, rather than
+    one long alternation.  threshold must be an int >= 1,
+    or None, which means multisplit never builds a trie.
+    The default is 32.
+
+    This affects multisplit, multistrip, multipartition,
+    normalize_whitespace, and the functions built on them.
+    A Splitter compiles its pattern when you create it,
+    so it keeps using the threshold in effect at that time.
+
+    The results are identical either way; only the speed
+    changes.  Returns the previous threshold.
+    """
+    global _separators_trie_threshold
+    if threshold is not None:
+        if not isinstance(threshold, int):
+            raise TypeError("threshold must be an int or None")
+        if threshold < 1:
+            raise ValueError("threshold must be >= 1")
+    previous = _separators_trie_threshold
+    _separators_trie_threshold = threshold
+    return previous
+
+# the deepest nesting of groups we'll put in a trie-shaped
+# pattern.  if the trie needs more, we use the alternation.
+_separators_trie_max_depth = 100
+
+def _separators_to_trie_re(separators, separators_is_bytes):
+    """
+    Returns a regular expression that matches any of separators,
+    preferring longer separators to shorter ones, just like the
+    alternation __separators_to_re builds.  Returns None if the
+    pattern would nest groups too deeply.
+
+    An alternation of n separators makes re try all n of them,
+    one at a time, at every position in the string.  Instead,
+    we build a trie of the separators, and turn each node into
+    a group.  The separators starting with "abc" and "abd" become
+
+        ab(?:c|d)
+
+    and if "ab" is a separator too, the group is optional:
+
+        ab(?:c|d)?
+
+    The branches of a group all start with different characters,
+    so re tries at most one of them, and finds all the separators
+    matching at a position in time proportional to the length
+    of the longest separator.  re tries the longer separators
+    first, because it tries a greedy optional group before
+    skipping it; when it backtracks, it tries the shorter ones,
+    in the same order the alternation would.  So the trie
+    matches exactly the same spans as the alternation.
+    """
+    if separators_is_bytes:
+        empty = b''
+        pipe = b'|'
+        group_start = b'(?:'
+        group_end = b')'
+        optional = b'?'
+    else:
+        empty = ''
+        pipe = '|'
+        group_start = '(?:'
+        group_end = ')'
+        optional = '?'
+
+    # each node is a dict mapping the next character to a child node.
+    # None marks the end of a separator.
+    trie = {}
+    for separator in separators:
+        node = trie
+        for i in range(len(separator)):
+            node = node.setdefault(separator[i:i+1], {})
+        node[None] = None
+
+    def to_re(node, depth):
+        if depth > _separators_trie_max_depth:
+            return None
+        branches = []
+        for c, child in node.items():
+            if c is None:
+                continue
+            # collapse runs of nodes with only one child
+            # into one literal string.
+            literal = [c]
+            while (len(child) == 1) and (None not in child):
+                for c, child in child.items():
+                    literal.append(c)
+            branch = _re_quote(empty.join(literal))
+            if len(child) > 1:
+                subpattern = to_re(child, depth + 1)
+                if subpattern is None:
+                    return None
+                branch += subpattern
+            branches.append(branch)
+
+        pattern = pipe.join(branches)
+        if not depth:
+            # the root.  (it never ends a separator.)
+            return pattern
+        if None in node:
+            return group_start + pattern + group_end + optional
+        return group_start + pattern + group_end
+
+    return to_re(trie, 0)
+
 def __separators_to_re(separators, separators_is_bytes, separate=False, keep=False):
+    threshold = _separators_trie_threshold
+    trie = (threshold is not None) and (len(separators) >= threshold)
+    return _separators_to_re_cached(separators, separators_is_bytes, separate, keep, trie)
+
+@functools.lru_cache(re._MAXCACHE)
+def _separators_to_re_cached(separators, separators_is_bytes, separate, keep, trie):
     if separators_is_bytes:
         pipe = b'|'
         separate_start = b'(?:'
@@ -823,12 +1311,16 @@ def __separators_to_re(separators, separators_is_bytes, separate=False, keep=Fal
         keep_start = '('
         keep_end = ')'
 
-    # sort longer separator strings earlier.
-    # re processes | operator from left-to-right,
-    # so you want to match against longer strings first.
-    separators = list(separators)
-    separators.sort(key=lambda o: -len(o))
-    pattern = pipe.join(_re_quote(o) for o in separators)
+    pattern = None
+    if trie:
+        pattern = _separators_to_trie_re(separators, separators_is_bytes)
+    if pattern is None:
+        # sort longer separator strings earlier.
+        # re processes | operator from left-to-right,
+        # so you want to match against longer strings first.
+        separators = list(separators)
+        separators.sort(key=lambda o: -len(o))
+        pattern = pipe.join(_re_quote(o) for o in separators)
     if not separate:
         pattern = separate_start + pattern + separate_end
     if keep:
@@ -880,11 +1372,40 @@ def multistrip(s, separators, left=True, right=True):
     and/or trailing separators stripped.
     """
 
+    separators, is_bytes = _multistrip_separators(s, separators)
+
+    # deliberately do this *after* checking types,
+    # so we complain about bad types even if this is a do-nothing call.
+    if not (left or right):
+        return s
+
+    left_match, right_search = _multistrip_patterns(separators, is_bytes)
+
+    if left:
+        match = left_match(s)
+        if match:
+            start = match.end(0)
+            s = s[start:]
+    if right:
+        match = right_search(s)
+        if match:
+            end = match.start(0)
+            s = s[:end]
+    return s
+
+def _multistrip_separators(s, separators):
+    """
+    Validates the separators argument for multistrip.
+    s is the string we'll strip, or a sample of it, used only
+    for its type.
+
+    Returns a tuple (separators, is_bytes), where separators
+    is now guaranteed to be a non-empty tuple of non-empty
+    objects the same type as s.
+    """
     is_bytes = isinstance(s, bytes)
     if is_bytes:
         s_type = bytes
-        head = b'^'
-        tail = b'$'
 
         if isinstance(separators, str):
             raise TypeError("separators must be an iterable of non-empty objects the same type as s")
@@ -898,8 +1419,6 @@ def multistrip(s, separators, left=True, right=True):
             check_separators = True
     else:
         s_type = str
-        head = '^'
-        tail = '$'
 
         if isinstance(separators, bytes):
             raise TypeError("separators must be an iterable of non-empty objects the same type as s")
@@ -921,26 +1440,191 @@ def multistrip(s, separators, left=True, right=True):
     if not separators:
         raise ValueError("separators must be an iterable of non-empty objects the same type as s")
 
-    # deliberately do this *after* checking types,
-    # so we complain about bad types even if this is a do-nothing call.
-    if not (left or right):
-        return s
+    return separators, is_bytes
 
+def _multistrip_patterns(separators, is_bytes):
+    """
+    Returns a tuple (left_match, right_search) of the
+    compiled match and search methods multistrip uses.
+    separators must be a tuple.
+    """
     # We can sidestep the hashability test of _separators_to_re.
-    # separators is always guaranteed to be a tuple at this point.
+    # separators is always guaranteed to be a tuple here.
     pattern = __separators_to_re(separators, is_bytes, separate=False, keep=False)
 
-    if left:
-        left_match = re.match(head + pattern, s)
-        if left_match:
-            start = left_match.end(0)
-            s = s[start:]
-    if right:
-        right_match = re.search(pattern + tail, s)
-        if right_match:
-            end = right_match.start(0)
-            s = s[:end]
-    return s
+    if is_bytes:
+        head = b'^'
+        tail = b'\\Z'
+    else:
+        head = '^'
+        # not '$'!  '$' also matches just before a trailing '\n',
+        # which would strip that '\n' along with the separators.
+        tail = '\\Z'
+
+    return re.compile(head + pattern).match, re.compile(pattern + tail).search
+
+
+def _map_many(name, iterable, prepare, max_workers, chunk_size):
+    """
+    The engine behind multistrip_many and normalize_whitespace_many.
+
+    Calls prepare(sample), where sample is the first string in
+    iterable.  prepare validates the rest of the arguments,
+    raising if they're bad, and returns a function mapping one
+    string to its result.  _map_many calls that function on
+    every string in iterable, and returns a list of the results.
+
+    If iterable is a NumPy array, returns a NumPy array of
+    the same shape.
+
+    If max_workers is not None, splits the strings into lists
+    of chunk_size strings each, and processes the lists in a
+    ThreadPoolExecutor with max_workers threads.
+    """
+    if chunk_size < 1:
+        raise ValueError("chunk_size must be 1 or greater")
+
+    # if iterable is a NumPy array, NumPy must already be imported.
+    # (this way we don't import NumPy ourselves, which is slow.)
+    numpy = sys.modules.get('numpy')
+    if (numpy is not None) and isinstance(iterable, numpy.ndarray):
+        array = iterable
+        strings = array.ravel().tolist()
+    else:
+        array = None
+        strings = iterable if type(iterable) is list else list(iterable)
+
+    if strings:
+        sample = strings[0]
+        s_type = bytes if isinstance(sample, bytes) else str
+        function = prepare(sample)
+
+        def process(strings):
+            for s in strings:
+                if not isinstance(s, s_type):
+                    raise TypeError(f"{name}: every string must be the same type; expected {s_type.__name__}, got {s!r}")
+            return [function(s) for s in strings]
+
+        if max_workers is None:
+            result = process(strings)
+        else:
+            chunks = [strings[i:i + chunk_size] for i in range(0, len(strings), chunk_size)]
+            result = []
+            with concurrent.futures.ThreadPoolExecutor(max_workers=max_workers) as executor:
+                for processed in executor.map(process, chunks):
+                    result.extend(processed)
+    else:
+        result = []
+
+    if array is None:
+        return result
+
+    kind = array.dtype.kind
+    if kind in 'SU':
+        # let NumPy pick the width.
+        return numpy.array(result, dtype=kind).reshape(array.shape)
+    a = numpy.empty(len(result), dtype=object)
+    a[:] = result
+    return a.reshape(array.shape)
+
+@export
+def multistrip_many(iterable, separators, left=True, right=True, *, max_workers=None, chunk_size=4096):
+    """
+    Like multistrip, but strips every string in iterable.
+
+    iterable should be an iterable of str or bytes objects,
+    all the same type.  separators, left, and right work just
+    like they do with multistrip.  multistrip_many validates
+    separators and compiles its regular expressions once,
+    rather than once per string.
+
+    Returns a list of the stripped strings, in the same order.
+    If iterable is a NumPy array, returns a NumPy array
+    of the same shape instead.
+
+    If max_workers is not None, multistrip_many strips the
+    strings in a ThreadPoolExecutor with max_workers threads,
+    in batches of chunk_size strings.  Python's re module
+    holds the GIL, so this is only faster on free-threaded
+    builds of Python.
+    """
+    def prepare(sample):
+        nonlocal separators
+        separators, is_bytes = _multistrip_separators(sample, separators)
+        if not (left or right):
+            return lambda s: s
+
+        left_match, right_search = _multistrip_patterns(separators, is_bytes)
+
+        def strip(s):
+            if left:
+                match = left_match(s)
+                if match:
+                    s = s[match.end(0):]
+            if right:
+                match = right_search(s)
+                if match:
+                    s = s[:match.start(0)]
+            return s
+        return strip
+
+    return _map_many('multistrip_many', iterable, prepare, max_workers, chunk_size)
+
+
+def _multisplit_separators(s, separators):
+    """
+    Validates the separators argument for multisplit (and friends).
+    s is the string we'll split, or a sample of it, used only
+    for its type.
+
+    Returns a tuple (separators, is_bytes), where separators
+    is now guaranteed to be a non-empty tuple of non-empty
+    objects the same type as s.
+    """
+    is_bytes = isinstance(s, bytes)
+    separators_is_bytes = isinstance(separators, bytes)
+    separators_is_str = isinstance(separators, str)
+
+    if is_bytes:
+        if separators_is_bytes:
+            # not iterable of bytes, literally a bytes string.
+            # split it ourselves.
+            separators = tuple(_iterate_over_bytes(separators))
+            check_separators = False
+        else:
+            if separators_is_str:
+                raise TypeError(f"separators must be either None or an iterable of objects the same type as s; s is {type(s).__name__}, separators is {separators!r}")
+            check_separators = True
+        s_type = bytes
+    else:
+        if separators_is_bytes:
+            raise TypeError(f"separators must be either None or an iterable of objects the same type as s; s is {type(s).__name__}, separators is {separators!r}")
+        check_separators = True
+        s_type = str
+
+    if separators is None:
+        separators = bytes_whitespace if is_bytes else whitespace
+        check_separators = False
+
+    # check_separators is True if separators isn't str or bytes
+    # or something we split ourselves.
+    if check_separators:
+        if not hasattr(separators, '__iter__'):
+            raise TypeError(f"separators must be either None or an iterable of objects the same type as s; s is {type(s).__name__}, separators is {separators!r}")
+        s2 = []
+        for o in separators:
+            if not isinstance(o, s_type):
+                raise TypeError(f"separators must be either None or an iterable of objects the same type as s; s is {type(s).__name__}, separators is {separators!r}")
+            if not o:
+                raise TypeError(f"separators cannot contain an empty str/bytes object")
+            s2.append(o)
+        separators = tuple(s2)
+
+    if separators is not None:
+        if not separators:
+            raise ValueError(f"separators must be either None or an iterable of objects the same type as s; s is {type(s).__name__}, separators is {separators!r}")
+
+    return separators, is_bytes
 
 
 # for keep
@@ -957,7 +1641,48 @@ export(RIGHT)
 PROGRESSIVE = "PROGRESSIVE"
 export(PROGRESSIVE)
 
-def multisplit(s, separators, keep, maxsplit, reverse, separate, strip, is_bytes, internally_keep_separators):
+# how many characters from the end of s
+# _multisplit_reversed_finditer reverses at first.
+_multisplit_reversed_window = 1024
+
+def _multisplit_reversed_finditer(s, finditer, maxlen, unlimited):
+    """
+    Yields the matches finditer would find in the reversed s,
+    but only reverses as much of the end of s as it needs to.
+
+    finditer must be the finditer method of the pattern matching
+    the reversed separators, and maxlen the length of the longest
+    separator.  Match offsets are relative to the reversed s.
+
+    We reverse a window at the end of s, doubling it whenever we
+    need to look further left.  A match is only certain once
+    there are at least maxlen characters in the window after it;
+    otherwise a longer separator, or another separator continuing
+    a run of them, might start there.
+
+    If unlimited is true, we're going to look at all of s anyway,
+    so we start with a window covering the whole thing.
+    """
+    length = len(s)
+    window = length if unlimited else min(length, _multisplit_reversed_window)
+    pos = 0
+    while True:
+        reversed_s = s[length - window:][::-1]
+        for match in finditer(reversed_s, pos):
+            if ((match.end() + maxlen) > window) and (window < length):
+                break
+            yield match
+            pos = match.end()
+        else:
+            if window == length:
+                return
+        window = min(length, window * 2)
+
+
+def multisplit(s, separators, keep, maxsplit, reverse, separate, strip, is_bytes, internally_keep_separators, finditer=None):
+    # finditer, if specified, is the finditer method of the
+    # precompiled separators pattern (see Splitter).
+    # in reverse mode it must match the reversed separators.
     if maxsplit is None:
         maxsplit = -1
     elif maxsplit == 0:
@@ -976,17 +1701,21 @@ def multisplit(s, separators, keep, maxsplit, reverse, separate, strip, is_bytes
         # Eric Smith had the brainstorm: reverse the string
         # and the separators, split, and reverse the output
         # and the strings in the output.
-        original_s = s
-        s = _multisplit_reversed(s, 's')
+        #
+        # (we don't actually reverse all of s, though.
+        # _multisplit_reversed_finditer only reverses as much
+        # of the end of s as it needs to look at.)
+        if finditer is None:
+            separators = _multisplit_reversed_separators(separators)
 
-        separators = tuple(separators)
-        s2 = _reversed_builtin_separators.get(separators, None)
-        if s2 is not None:
-            separators = s2
-        else:
-            separators = _multisplit_reversed(separators, 'separators')
+    if finditer is None:
+        pattern = _separators_to_re(separators, is_bytes, keep=internally_keep_separators, separate=separate)
+        finditer = re.compile(pattern).finditer
 
-    pattern = _separators_to_re(separators, is_bytes, keep=internally_keep_separators, separate=separate)
+    if reverse:
+        matches = _multisplit_reversed_finditer(s, finditer, max(len(o) for o in separators), maxsplit < 0)
+    else:
+        matches = finditer(s)
 
     # we write down the lengths, it's easier if we're reversing
     splits_remaining = maxsplit
@@ -995,9 +1724,7 @@ def multisplit(s, separators, keep, maxsplit, reverse, separate, strip, is_bytes
     len_s = len(s)
     zero_replacement = -len_s # this reverses properly, 0 doesn't
     previous_match_end = zero_replacement
-    for match in re.finditer(pattern, s):
-        if not splits_remaining:
-            break
+    for match in matches:
         start = match.start() or zero_replacement
         end = match.end() or zero_replacement
         # segment
@@ -1005,8 +1732,12 @@ def multisplit(s, separators, keep, maxsplit, reverse, separate, strip, is_bytes
         if internally_keep_separators:
             # separator
             append((start, end))
-        splits_remaining -= 1
         previous_match_end = end
+        splits_remaining -= 1
+        if not splits_remaining:
+            # stop now, rather than asking for another match.
+            # in reverse mode that could read more of s.
+            break
 
     # final segment
     append((previous_match_end, len_s))
@@ -1062,7 +1793,6 @@ def multisplit(s, separators, keep, maxsplit, reverse, separate, strip, is_bytes
 
     if reverse:
         l = _multisplit_reversed(l, 'l')
-        s = original_s
 
     l.reverse()
 
@@ -1225,53 +1955,12 @@ def multisplit(s, separators=None, *,
     for s and elements of separators, but the base class
     for both must be the same (str or bytes).
     """
-    is_bytes = isinstance(s, bytes)
-    separators_is_bytes = isinstance(separators, bytes)
-    separators_is_str = isinstance(separators, str)
+    separators, is_bytes = _multisplit_separators(s, separators)
 
-    if is_bytes:
-        if separators_is_bytes:
-            # not iterable of bytes, literally a bytes string.
-            # split it ourselves.
-            separators = tuple(_iterate_over_bytes(separators))
-            check_separators = False
-        else:
-            if separators_is_str:
-                raise TypeError(f"separators must be either None or an iterable of objects the same type as s; s is {type(s).__name__}, separators is {separators!r}")
-            check_separators = True
-        s_type = bytes
-    else:
-        if separators_is_bytes:
-            raise TypeError(f"separators must be either None or an iterable of objects the same type as s; s is {type(s).__name__}, separators is {separators!r}")
-        check_separators = True
-        s_type = str
+    if maxsplit is not None:
+        maxsplit = operator.index(maxsplit)
 
-    if separators is None:
-        separators = bytes_whitespace if is_bytes else whitespace
-        check_separators = False
-
-    # check_separators is True if separators isn't str or bytes
-    # or something we split ourselves.
-    if check_separators:
-        if not hasattr(separators, '__iter__'):
-            raise TypeError(f"separators must be either None or an iterable of objects the same type as s; s is {type(s).__name__}, separators is {separators!r}")
-        s2 = []
-        for o in separators:
-            if not isinstance(o, s_type):
-                raise TypeError(f"separators must be either None or an iterable of objects the same type as s; s is {type(s).__name__}, separators is {separators!r}")
-            if not o:
-                raise TypeError(f"separators cannot contain an empty str/bytes object")
-            s2.append(o)
-        separators = tuple(s2)
-
-    if separators is not None:
-        if not separators:
-            raise ValueError(f"separators must be either None or an iterable of objects the same type as s; s is {type(s).__name__}, separators is {separators!r}")
-
-    if maxsplit is not None:
-        maxsplit = operator.index(maxsplit)
-
-    internally_keep_separators = keep
+    internally_keep_separators = keep
 
     if strip:
         if strip == PROGRESSIVE:
@@ -1293,6 +1982,277 @@ def multisplit(s, separators=None, *,
     return _multisplit(s, separators, keep, maxsplit, reverse, separate, strip, is_bytes, internally_keep_separators)
 
 
+def _multisplit_stream_chunks(stream, chunk_size):
+    # if stream is a file-like object, read it in chunk_size pieces.
+    # otherwise, assume it's an iterable of str or bytes chunks.
+    read = getattr(stream, 'read', None)
+    if read is None:
+        yield from stream
+        return
+    while True:
+        chunk = read(chunk_size)
+        if not chunk:
+            return
+        yield chunk
+
+
+def _multisplit_stream(chunks, buffer, separators, is_bytes, separate, maxsplit, left, right):
+    """
+    The engine powering multisplit_stream.  Yields the
+    alternating non-separator and separator strings,
+    as if you'd called
+        multisplit(s, keep=ALTERNATING, strip=...)
+    always starting and ending with a non-separator string.
+
+    chunks is an iterator yielding the remainder of
+    the input, buffer is the first chunk.
+
+    The trick: we only yield a separator once we're certain
+    re would have found exactly the same match if it could
+    see the entire input.  That's true once the match, and
+    the next maxlen characters after it, are all in our
+    buffer.  (Any longer separator starting inside the match,
+    or any additional separator continuing a run of them,
+    would have to fit in that window.)
+    """
+    empty = buffer[0:0]
+    join = empty.join
+    s_type = bytes if is_bytes else str
+
+    maxlen = max(len(o) for o in separators)
+    pattern = re.compile(__separators_to_re(separators, is_bytes, separate=bool(separate), keep=False))
+    pattern_search = pattern.search
+
+    # multistrip semantics: strip runs of separators, found with separate=False.
+    run_pattern = __separators_to_re(separators, is_bytes, separate=False, keep=False)
+    if left:
+        left_match = re.compile((b'^' if is_bytes else '^') + run_pattern).match
+    if right:
+        right_search = re.compile(run_pattern + (b'\\Z' if is_bytes else '\\Z')).search
+        # every character that appears in any separator.
+        # the right strip can't extend to the left of
+        # the rightmost character *not* in this set.
+        alphabet = join(separators)
+        alphabet = bytes(set(alphabet)) if is_bytes else join(set(alphabet))
+
+    def type_check(chunk):
+        if not isinstance(chunk, s_type):
+            raise TypeError(f"all chunks must be the same type as the first chunk ({s_type.__name__}), got {chunk!r}")
+
+    # the current non-separator string is join(parts) + buffer[pos:...].
+    # no separator starts in buffer[pos:search].
+    parts = []
+    pos = search = 0
+    # floor is how much of buffer we know would survive a right strip.
+    floor = len(buffer.rstrip(alphabet)) if right else 0
+    splits_remaining = maxsplit
+    eof = False
+
+    while True:
+        if left:
+            match = left_match(buffer)
+            if match:
+                end = match.end()
+                if eof or ((end + maxlen) <= len(buffer)):
+                    pos = search = end
+                    left = False
+            elif eof or (maxlen <= len(buffer)):
+                left = False
+
+        elif splits_remaining and not eof:
+            limit = floor if right else len(buffer)
+            match = pattern_search(buffer, search)
+            if match:
+                start, end = match.span()
+                if ((start if separate else end) + maxlen) <= limit:
+                    segment = buffer[pos:start]
+                    if parts:
+                        parts.append(segment)
+                        segment = join(parts)
+                        parts.clear()
+                    yield segment
+                    yield match.group(0)
+                    pos = search = end
+                    splits_remaining -= 1
+                    continue
+                search = max(search, min(start, len(buffer) - maxlen + 1))
+            else:
+                search = max(search, len(buffer) - maxlen + 1)
+
+        else:
+            break
+
+        # we need more text.
+        chunk = next(chunks, None)
+        if chunk is None:
+            eof = True
+            continue
+        type_check(chunk)
+        if search > pos:
+            parts.append(buffer[pos:search])
+        buffer = buffer[search:] + chunk
+        floor = max(floor - search, 0)
+        pos = search = 0
+        if right:
+            floor = max(floor, len(buffer.rstrip(alphabet)))
+
+    # we've either hit maxsplit or the end of the input.
+    # either way, everything left is (at most) one more chunk of
+    # text to split, and we have to read all of it.
+    parts.append(buffer[pos:])
+    if not eof:
+        for chunk in chunks:
+            type_check(chunk)
+            parts.append(chunk)
+    text = join(parts)
+    del parts
+
+    if right:
+        match = right_search(text)
+        if match:
+            text = text[:match.start()]
+
+    previous_end = 0
+    if splits_remaining:
+        for match in pattern.finditer(text):
+            start, end = match.span()
+            yield text[previous_end:start]
+            yield match.group(0)
+            previous_end = end
+            splits_remaining -= 1
+            if not splits_remaining:
+                break
+    yield text[previous_end:]
+
+
+@export
+def multisplit_stream(stream, separators=None, *,
+    keep=False,
+    maxsplit=-1,
+    separate=False,
+    strip=False,
+    chunk_size=65536,
+    ):
+    """
+    Like multisplit, but splits a stream of text incrementally.
+
+    stream can be a file-like object (anything with a read
+    method), or an iterable of str or bytes chunks.  If it's
+    a file-like object, multisplit_stream reads it chunk_size
+    characters (or bytes) at a time.  All the chunks must be
+    the same type, and separators must match that type,
+    following the same rules as multisplit.
+
+    Returns an iterator yielding exactly the same values
+    multisplit would yield if you'd passed in the concatenation
+    of all the chunks:
+
+        list(multisplit_stream(chunks, separators, **kwargs))
+            == list(multisplit(''.join(chunks), separators, **kwargs))
+
+    But multisplit_stream yields each value as soon as it's
+    certain, and only holds onto the text it hasn't yielded yet.
+    Peak memory use is roughly the size of one chunk, plus the
+    longest separator, plus the longest value it yields.
+
+    keep, maxsplit, separate, and strip work the same as they
+    do with multisplit.  (There's no reverse; you can't split
+    a stream starting from the end.)  Note that when splitting
+    stops due to maxsplit, the final value is the entire
+    remainder of the stream, and when strip strips from the
+    right, multisplit_stream can't yield a value until it sees
+    a non-separator character after it.
+
+    If stream is empty, multisplit_stream behaves as if you'd
+    split an empty string, using the type of separators
+    (str if separators is None).
+    """
+    chunks = _multisplit_stream_chunks(stream, chunk_size)
+    buffer = next(chunks, None)
+    if buffer is not None:
+        if not isinstance(buffer, (str, bytes)):
+            raise TypeError(f"stream must yield str or bytes, not {buffer!r}")
+    else:
+        # empty stream.  determine the type from separators, if we can.
+        if (separators is None) or isinstance(separators, (str, bytes)):
+            sample = separators
+        else:
+            separators = tuple(separators)
+            sample = separators[0] if separators else None
+        buffer = b'' if isinstance(sample, bytes) else ''
+
+    separators, is_bytes = _multisplit_separators(buffer, separators)
+
+    if maxsplit is None:
+        maxsplit = -1
+    else:
+        maxsplit = operator.index(maxsplit)
+
+    left = right = progressive = False
+    if strip:
+        if strip == PROGRESSIVE:
+            if maxsplit == -1:
+                left = right = True
+            else:
+                left = progressive = True
+        else:
+            left = strip != RIGHT
+            right = strip != LEFT
+
+    return _multisplit_stream_format(
+        _multisplit_stream(chunks, buffer, separators, is_bytes, separate, maxsplit, left, right),
+        buffer[0:0], keep, maxsplit, progressive)
+
+
+def _multisplit_stream_format(pieces, empty, keep, maxsplit, progressive):
+    # pieces alternates non-separator and separator strings,
+    # starting and ending with a non-separator string.
+    # reproduces multisplit's handling of keep and
+    # strip=PROGRESSIVE.
+
+    if progressive:
+        # if splitting reached the end of the string,
+        # strip trailing separators (and the empty strings
+        # between them).  so hold back separator/empty pairs
+        # until we see a non-empty string.
+        #
+        # (splits is how many separators we've passed,
+        # held is the separator/empty pairs we're holding.)
+        def progressive_pieces(pieces):
+            splits = 0
+            held = []
+            iterator = iter(pieces)
+            yield next(iterator)
+            for separator in iterator:
+                segment = next(iterator)
+                held.append(separator)
+                held.append(segment)
+                if segment:
+                    yield from held
+                    splits += len(held) // 2
+                    held.clear()
+            if held and (maxsplit < (splits + 1)):
+                yield from held
+        pieces = progressive_pieces(pieces)
+
+    if (not keep) or (keep == ALTERNATING):
+        iterator = iter(pieces)
+        for segment in iterator:
+            yield segment
+            separator = next(iterator, None)
+            if (separator is not None) and keep:
+                yield separator
+        return
+
+    iterator = iter(pieces)
+    for segment in iterator:
+        separator = next(iterator, empty)
+        if keep == AS_PAIRS:
+            yield (segment, separator)
+        else:
+            yield segment + separator
+
+
 @export
 def multipartition(s, separators, count=1, *, reverse=False, separate=True):
     """
@@ -1358,6 +2318,10 @@ def multipartition(s, separators, count=1, *, reverse=False, separate=True):
         separate=separate,
         strip=False,
         maxsplit=count))
+    return _multipartition_result(s, result, count, reverse)
+
+def _multipartition_result(s, result, count, reverse):
+    # pads the list returned by multisplit out to (2*count)+1 elements.
     desired_length = (2 * count) + 1
     result_length = len(result)
     if result_length < desired_length:
@@ -1377,6 +2341,165 @@ def multirpartition(s, separators, count=1, *, reverse=False, separate=True):
     "Like big.multipartition, but partitions from the right by default, like str.rpartition."
     return multipartition(s, separators, count=count, reverse=not reverse, separate=separate)
 
+
+@export
+class Splitter:
+    """
+    A precompiled, reusable multisplit.
+
+    Splitter is to multisplit, multistrip, and multipartition
+    what re.compile is to the functions in the re module.
+    It validates separators, and builds and compiles its
+    regular expressions, once, in the constructor.  Its
+    methods then skip all that per-call setup:
+
+        split(s, maxsplit=-1)
+            Like multisplit(s, separators, keep=keep,
+                maxsplit=maxsplit, reverse=reverse,
+                separate=separate, strip=strip).
+
+        split_many(iterable, maxsplit=-1)
+            Returns an iterator yielding list(split(s, maxsplit))
+            for every s in iterable.
+
+        strip(s, left=True, right=True)
+            Like multistrip(s, separators, left, right).
+
+        partition(s, count=1)
+            Like multipartition(s, separators, count,
+                reverse=reverse, separate=separate).
+
+        rpartition(s, count=1)
+            Like multirpartition(s, separators, count,
+                reverse=reverse, separate=separate).
+
+    separators works like the separators argument to multisplit,
+    and determines whether the Splitter works with str or bytes.
+    If separators is None, the Splitter splits str objects on
+    whitespace; to split bytes on whitespace, pass in
+    bytes_whitespace.
+
+    Note that partition and rpartition use the Splitter's
+    separate value, which defaults to False.  (multipartition's
+    separate parameter defaults to True.)
+    """
+    def __init__(self, separators=None, *, keep=False, reverse=False, separate=False, strip=False):
+        if (separators is not None) and not isinstance(separators, (str, bytes)) and hasattr(separators, '__iter__'):
+            separators = tuple(separators)
+            is_bytes = bool(separators) and isinstance(separators[0], bytes)
+        else:
+            is_bytes = isinstance(separators, bytes)
+        empty = b'' if is_bytes else ''
+        separators, is_bytes = _multisplit_separators(empty, separators)
+
+        self.separators = separators
+        self.keep = keep
+        self.reverse = reverse
+        self.separate = separate
+        self.strip_mode = strip
+
+        self._is_bytes = is_bytes
+        self._s_type = bytes if is_bytes else str
+
+        separate = bool(separate)
+        self._finditer = re.compile(_separators_to_re(separators, is_bytes, separate=separate, keep=False)).finditer
+        reversed_separators = _multisplit_reversed_separators(separators)
+        self._reversed_finditer = re.compile(_separators_to_re(reversed_separators, is_bytes, separate=separate, keep=False)).finditer
+
+        pattern = _separators_to_re(separators, is_bytes, separate=False, keep=False)
+        if is_bytes:
+            self._left_match = re.compile(b'^' + pattern).match
+            self._right_search = re.compile(pattern + b'\\Z').search
+        else:
+            self._left_match = re.compile('^' + pattern).match
+            self._right_search = re.compile(pattern + '\\Z').search
+
+    def __repr__(self):
+        return f"{self.__class__.__name__}({self.separators!r}, keep={self.keep!r}, reverse={self.reverse!r}, separate={self.separate!r}, strip={self.strip_mode!r})"
+
+    def _check(self, s):
+        if not isinstance(s, self._s_type):
+            raise TypeError(f"s must be {self._s_type.__name__}, not {type(s).__name__}")
+
+    def _strip(self, s, left, right):
+        if left:
+            match = self._left_match(s)
+            if match:
+                s = s[match.end(0):]
+        if right:
+            match = self._right_search(s)
+            if match:
+                s = s[:match.start(0)]
+        return s
+
+    def split(self, s, maxsplit=-1):
+        """
+        Splits s, exactly like multisplit.  Returns an iterator.
+        """
+        self._check(s)
+        if maxsplit is not None:
+            maxsplit = operator.index(maxsplit)
+
+        keep = internally_keep_separators = self.keep
+        reverse = self.reverse
+        strip = self.strip_mode
+
+        if strip:
+            if strip == PROGRESSIVE:
+                if (maxsplit is None) or (maxsplit == -1):
+                    strip = left = right = True
+                else:
+                    left = not reverse
+                    right = reverse
+                    internally_keep_separators = True
+            else:
+                left = strip != RIGHT
+                right = strip != LEFT
+            s = self._strip(s, left, right)
+            if not s:
+                maxsplit = 0
+
+        finditer = self._reversed_finditer if reverse else self._finditer
+        return _multisplit(s, self.separators, keep, maxsplit, reverse, self.separate, strip, self._is_bytes, internally_keep_separators, finditer)
+
+    def split_many(self, iterable, maxsplit=-1):
+        """
+        Splits every string in iterable.  Returns an iterator
+        yielding a list of the values split from each string.
+        """
+        split = self.split
+        for s in iterable:
+            yield list(split(s, maxsplit))
+
+    def strip(self, s, left=True, right=True):
+        """
+        Strips leading and/or trailing separators from s,
+        exactly like multistrip.
+        """
+        self._check(s)
+        return self._strip(s, left, right)
+
+    def _partition(self, s, count, reverse):
+        self._check(s)
+        count = operator.index(count)
+        if count < 0:
+            raise ValueError("count must be positive")
+        finditer = self._reversed_finditer if reverse else self._finditer
+        result = list(_multisplit(s, self.separators, ALTERNATING, count, reverse, self.separate, False, self._is_bytes, ALTERNATING, finditer))
+        return _multipartition_result(s, result, count, reverse)
+
+    def partition(self, s, count=1):
+        """
+        Partitions s, exactly like multipartition.
+        """
+        return self._partition(s, count, self.reverse)
+
+    def rpartition(self, s, count=1):
+        """
+        Partitions s, exactly like multirpartition.
+        """
+        return self._partition(s, count, not self.reverse)
+
 @export
 def format_map(s, mapping):
     """
@@ -1859,6 +2982,41 @@ def normalize_whitespace(s, separators=None, replacement=None):
     normalize_whitespace will only return str or bytes objects.
     """
 
+    separators, replacement, empty = _normalize_whitespace_arguments(s, separators, replacement)
+
+    # normalize_whitespace has a fast path for
+    # normalizing whitespace on str objects.
+    # if your "separators" qualifies,
+    # it'll automatically use the fast path.
+    #
+    # we can't use the fast path for bytes objects,
+    # because it won't work with encoded whitespace
+    # characters > chr(127).
+    #
+    # (it'd *usually* work, sure.
+    # but "usually" isn't good enough for big!)
+    if (   (separators is whitespace_without_crlf)
+        or (separators is whitespace)
+        ):
+        return _normalize_whitespace_split(s, replacement, empty)
+
+    if not s:
+        return s
+    words = list(multisplit(s, separators, keep=False, separate=False, strip=False, reverse=False, maxsplit=-1))
+    cleaned = replacement.join(words)
+    del words
+    if s == cleaned:
+        return s
+    return cleaned
+
+def _normalize_whitespace_arguments(s, separators, replacement):
+    """
+    Validates the separators and replacement arguments
+    for normalize_whitespace.  s is the string we'll normalize,
+    or a sample of it, used only for its type.
+
+    Returns a tuple (separators, replacement, empty).
+    """
     if isinstance(s, bytes):
         empty = b''
         default_replacement = b' '
@@ -1896,39 +3054,72 @@ def normalize_whitespace(s, separators=None, replacement=None):
     elif not isinstance(replacement, s_type):
         raise TypeError("replacement must be the same type as s, or None")
 
+    return separators, replacement, empty
+
+def _normalize_whitespace_split(s, replacement, empty):
+    # the fast path: str.split splits on exactly
+    # the characters in whitespace_without_crlf.
     if not s:
         return s
-
-    # normalize_whitespace has a fast path for
-    # normalizing whitespace on str objects.
-    # if your "separators" qualifies,
-    # it'll automatically use the fast path.
-    #
-    # we can't use the fast path for bytes objects,
-    # because it won't work with encoded whitespace
-    # characters > chr(127).
-    #
-    # (it'd *usually* work, sure.
-    # but "usually" isn't good enough for big!)
-    if (   (separators is whitespace_without_crlf)
-        or (separators is whitespace)
-        ):
-        if not s.strip():
-            return replacement
-        words = s.split()
-        if s[:1].isspace():
-            words.insert(0, empty)
-        if s[-1:].isspace():
-            words.append(empty)
-        cleaned = replacement.join(words)
-    else:
-        words = list(multisplit(s, separators, keep=False, separate=False, strip=False, reverse=False, maxsplit=-1))
-        cleaned = replacement.join(words)
-        del words
+    if not s.strip():
+        return replacement
+    words = s.split()
+    if s[:1].isspace():
+        words.insert(0, empty)
+    if s[-1:].isspace():
+        words.append(empty)
+    cleaned = replacement.join(words)
     if s == cleaned:
         return s
     return cleaned
 
+@export
+def normalize_whitespace_many(iterable, separators=None, replacement=None, *, max_workers=None, chunk_size=4096):
+    """
+    Like normalize_whitespace, but normalizes every string in iterable.
+
+    iterable should be an iterable of str or bytes objects,
+    all the same type.  separators and replacement work just
+    like they do with normalize_whitespace.  normalize_whitespace_many
+    validates its arguments and compiles its regular expression once,
+    rather than once per string.
+
+    Returns a list of the normalized strings, in the same order.
+    If iterable is a NumPy array, returns a NumPy array
+    of the same shape instead.
+
+    If max_workers is not None, normalize_whitespace_many
+    normalizes the strings in a ThreadPoolExecutor with
+    max_workers threads, in batches of chunk_size strings.
+    Python's re module holds the GIL, so this is only faster
+    on free-threaded builds of Python.
+    """
+    def prepare(sample):
+        nonlocal separators, replacement
+        separators, replacement, empty = _normalize_whitespace_arguments(sample, separators, replacement)
+        is_bytes = isinstance(sample, bytes)
+
+        if (   (separators is whitespace_without_crlf)
+            or (separators is whitespace)
+            ):
+            return lambda s: _normalize_whitespace_split(s, replacement, empty)
+
+        # re.sub is equivalent to splitting with multisplit
+        # (separate=False) and joining with replacement.
+        # but re.sub interprets backslashes in its replacement.
+        sub = re.compile(__separators_to_re(separators, is_bytes, separate=False, keep=False)).sub
+        backslash = b'\\' if is_bytes else '\\'
+        template = replacement.replace(backslash, backslash + backslash)
+
+        def normalize(s):
+            cleaned = sub(template, s)
+            if s == cleaned:
+                return s
+            return cleaned
+        return normalize
+
+    return _map_many('normalize_whitespace_many', iterable, prepare, max_workers, chunk_size)
+
 
 
 ##
@@ -1969,79 +3160,338 @@ def normalize_whitespace(s, separators=None, replacement=None):
 _sqs_quotes_str   = ( '"',  "'")
 _sqs_quotes_bytes = (b'"', b"'")
 
-_sqs_escape_str   =  '\\'
-_sqs_escape_bytes = b'\\'
+_sqs_escape_str   =  '\\'
+_sqs_escape_bytes = b'\\'
+
+
+def _sqs_shadows(r, t):
+    """
+    Returns True if an occurrence of the separator r
+    can overlap an occurrence of the separator t,
+    and be matched first, hiding t.
+
+    That happens if r starts earlier than t and runs into it,
+    or if r starts at the same place as t and is longer.
+    (Separators are matched longest first.)
+    """
+    if (len(r) > len(t)) and r.startswith(t):
+        return True
+    for i in range(1, len(r)):
+        tail = r[i:]
+        if tail.startswith(t) or t.startswith(tail):
+            return True
+    return False
+
+
+def _sqs_relevant_separators(separators, initial):
+    """
+    Returns the subset of separators that a split_quoted_strings
+    parser state has to search for.
+
+    initial is the set of separators the state actually acts on.
+    Every other separator is simply part of the text--unless it
+    can hide one of the relevant separators, in which case it's
+    relevant too.  (And so is anything that can hide *that*.)
+    Searching for just these separators finds exactly the same
+    matches as tokenizing the string with all of them.
+    """
+    relevant = set(initial)
+    changed = True
+    while changed:
+        changed = False
+        for r in separators:
+            if (r not in relevant) and any(_sqs_shadows(r, t) for t in relevant):
+                relevant.add(r)
+                changed = True
+    return relevant
+
+
+def _split_quoted_strings(s, patterns, all_quotes_set, multiline_quotes_set, laden, state):
+    """
+    This is the generator function implementing the split_quoted_strings
+    iterator.  The public split_quoted_strings analyzes its arguments,
+    ensuring that they're valid (or raising an exception if they're not).
+    If the inputs are valid, it calls this generator and returns the
+    resulting iterator.
+
+    patterns maps every parser state to the compiled regular
+    expression for that state.  The state is the current quote
+    delimiter, or an empty string when we're not in a quoted string.
+    Each pattern only matches the separators that matter in that
+    state, so the parser jumps straight from one to the next.
+    """
+    empty = s[0:0]
+
+    quote = state
+    # the start of the text of the current segment
+    start = 0
+    position = 0
+
+    while True:
+        match = patterns[quote].search(s, position)
+        if not match:
+            break
+        end = match.start()
+        position = match.end()
+        # slice s, rather than calling match.group,
+        # so we preserve str subclasses.
+        separator = s[end:position]
+
+        if not quote:
+            # not currently quoted.
+            # (escaped quote marks are just text.)
+            if separator not in all_quotes_set:
+                continue
+            if end > start:
+                yield (empty, s[start:end], empty)
+            quote = separator
+            start = position
+            continue
+
+        # in quote
+        if separator != quote:
+            continue
+
+        text = s[start:end]
+        if text and (quote not in multiline_quotes_set):
+            # see treatise above
+            if (len(text.splitlines()) > 1) or (len( (text[-1:] + laden).splitlines()) > 1):
+                raise SyntaxError(f"unterminated quoted string, {s!r}")
+        if state:
+            state = None
+            yield (empty, text, separator)
+        else:
+            yield (quote, text, separator)
+        quote = empty
+        start = position
+
+    text = s[start:]
+    if text or quote:
+        if quote and text and (quote not in multiline_quotes_set):
+            # see treatise above
+            if (len(text.splitlines()) > 1) or (len( (text[-1:] + laden).splitlines()) > 1):
+                raise SyntaxError(f"unterminated quoted string, {s!r}")
+        if state:
+            quote = empty
+        yield (quote, text, empty)
+
+
+def _sqs_arguments(is_bytes, quotes, escape, multiline_quotes):
+    """
+    Validates the quotes, escape, and multiline_quotes arguments
+    to split_quoted_strings and QuotedStringSplitter.
+
+    Returns a tuple:
+        (escape, quotes_set, multiline_quotes_set)
+    """
+    if multiline_quotes is None:
+        multiline_quotes = ()
+
+    if is_bytes:
+        s_type = bytes
+        if quotes in (_sqs_quotes_str, None):
+            quotes = _sqs_quotes_bytes
+        else:
+            if isinstance(quotes, bytes):
+                quotes = tuple(_iterate_over_bytes(quotes))
+            for q in quotes:
+                if not isinstance(q, s_type):
+                    raise TypeError(f"values in quotes must match s (str or bytes), not {q!r}")
+                if not q:
+                    raise ValueError("quotes cannot contain an empty string")
+        if escape in (_sqs_escape_str, None):
+            escape = _sqs_escape_bytes
+        if multiline_quotes:
+            if isinstance(multiline_quotes, bytes):
+                multiline_quotes = tuple(_iterate_over_bytes(multiline_quotes))
+            for q in multiline_quotes:
+                if not isinstance(q, s_type):
+                    raise TypeError(f"values in multiline_quotes must match s (str or bytes), not {q!r}")
+                if not q:
+                    raise ValueError("multiline_quotes cannot contain an empty string")
+        elif not isinstance(escape, s_type):
+            raise TypeError(f"escape must match s (str or bytes), not {escape!r}")
+    else:
+        s_type = str
+        if quotes in (_sqs_quotes_bytes, None):
+            quotes = _sqs_quotes_str
+        else:
+            for q in quotes:
+                if not isinstance(q, s_type):
+                    raise TypeError(f"values in quotes must match s (str or bytes), not {q!r}")
+                if not q:
+                    raise ValueError("quotes cannot contain an empty string")
+        if escape in (_sqs_escape_bytes, None):
+            escape = _sqs_escape_str
+        if multiline_quotes:
+            for q in multiline_quotes:
+                if not isinstance(q, s_type):
+                    raise TypeError(f"values in multiline_quotes must match s (str or bytes), not {q!r}")
+                if not q:
+                    raise ValueError("multiline_quotes cannot contain an empty string")
+        elif not isinstance(escape, s_type):
+            raise TypeError(f"escape must match s (str or bytes), not {escape!r}")
+
+    quotes_set = set(quotes)
+    multiline_quotes_set = set(multiline_quotes)
+    all_quotes_set = quotes_set | multiline_quotes_set
+
+    if not all_quotes_set:
+        raise ValueError("either quotes or multiline_quotes must be non-empty")
+
+    if len(quotes_set) != len(quotes):
+        repeated = set()
+        seen = set()
+        for q in quotes:
+            if q in seen:
+                repeated.add(q)
+            seen.add(q)
+        repeated = list(repeated)
+        repeated.sort()
+        raise ValueError("quotes contains repeated quote markers: " + ", ".join(repr(q) for q in repeated))
+
+    if len(multiline_quotes_set) != len(multiline_quotes):
+        repeated = set()
+        seen = set()
+        for q in multiline_quotes:
+            if q in seen:
+                repeated.add(q)
+            seen.add(q)
+        repeated = list(repeated)
+        repeated.sort()
+        raise ValueError("multiline_quotes contains repeated quote markers: " + ", ".join(repr(q) for q in repeated))
+
+    in_both_quotes_sets = quotes_set & multiline_quotes_set
+    if in_both_quotes_sets:
+        in_both_quotes_sets = list(in_both_quotes_sets)
+        if len(in_both_quotes_sets) == 1:
+            s = repr(list(in_both_quotes_sets)[0])
+        else:
+            in_both_quotes_sets.sort()
+            s = ', '.join(repr(_) for _ in in_both_quotes_sets)
+        raise ValueError(f"{s} appears in both quotes and multiline_quotes")
+
+    return escape, quotes_set, multiline_quotes_set
+
+
+def _sqs_state(s, s_type, state, all_quotes_set):
+    """
+    Validates the state argument to split_quoted_strings.
+    Returns the initial state for the parser.
+    """
+    if state in (None, '', b''):
+        return s[0:0]
+    if not isinstance(state, s_type):
+        raise TypeError(f"state must match s (str or bytes), not {state!r}")
+    if state not in all_quotes_set:
+        raise ValueError(f"state must be be one of the delimiters listed in the quotes or multiline_quotes arguments, not {state!r}")
+    return state
+
+
+@export
+class QuotedStringSplitter:
+    """
+    A precompiled, reusable split_quoted_strings.
+
+    QuotedStringSplitter validates quotes, escape, and
+    multiline_quotes, and compiles its regular expressions,
+    once, in the constructor.  Calling split() on it then
+    behaves identically to calling
+
+        split_quoted_strings(s, quotes, escape=escape,
+            multiline_quotes=multiline_quotes, state=state)
+
+    but without any per-call setup.
+
+    The splitter works with str if quotes, escape, and
+    multiline_quotes are str, and with bytes if they're bytes.
+    (If you pass in bytes quotes, the default escape is b'\\\\'.)
+
+    Internally, the parser has a separate regular expression
+    for every state--unquoted, and inside each kind of quote.
+    Each one only matches the separators that matter in that
+    state, so the parser jumps straight from one relevant
+    separator to the next with a single search call.
+    """
+    def __init__(self, quotes=_sqs_quotes_str, *, escape=_sqs_escape_str, multiline_quotes=()):
+        is_bytes = None
+        for value in (quotes, multiline_quotes):
+            if (value is None) or (value == _sqs_quotes_str):
+                continue
+            if isinstance(value, (str, bytes)):
+                is_bytes = isinstance(value, bytes)
+                break
+            for q in value:
+                is_bytes = isinstance(q, bytes)
+                break
+            if is_bytes is not None:
+                break
+        if is_bytes is None:
+            is_bytes = isinstance(escape, bytes)
+
+        escape, quotes_set, multiline_quotes_set = _sqs_arguments(is_bytes, quotes, escape, multiline_quotes)
+        self._compile(is_bytes, escape, quotes_set, multiline_quotes_set)
 
+    def _compile(self, is_bytes, escape, quotes_set, multiline_quotes_set):
+        self._is_bytes = is_bytes
+        self._s_type = bytes if is_bytes else str
+        self._laden = b'x' if is_bytes else 'x'
+        self.escape = escape
+        self.quotes = tuple(sorted(quotes_set))
+        self.multiline_quotes = tuple(sorted(multiline_quotes_set))
+
+        self._multiline_quotes_set = multiline_quotes_set = frozenset(multiline_quotes_set)
+        self._all_quotes_set = all_quotes_set = frozenset(quotes_set) | multiline_quotes_set
+
+        # separators is a list containing all quote marks,
+        separators = list(all_quotes_set)
+
+        # and also all escaped quote marks.
+        escapes = []
+        if escape:
+            for first_character in {q[0:] for q in quotes_set}:
+                escapes.append(escape + first_character)
+            escapes.append(escape + escape)
+        separators.extend(escapes)
+
+        def compile(initial):
+            relevant = _sqs_relevant_separators(separators, initial)
+            return re.compile(_separators_to_re(tuple(sorted(relevant)), is_bytes, separate=True))
+
+        empty = b'' if is_bytes else ''
+        # when unquoted, we're looking for the start of any quote.
+        patterns = {empty: compile(all_quotes_set)}
+        # when quoted, we're looking for the end of that quote,
+        # and we have to skip over escaped quote marks.
+        for quote in all_quotes_set:
+            patterns[quote] = compile(set(escapes) | {quote})
+        self._patterns = patterns
 
-def split_quoted_strings(s, separators, all_quotes_set, quotes, multiline_quotes, empty, laden, state):
-    """
-    This is the generator function implementing the split_quoted_strings
-    iterator.  The public split_quoted_strings analyzes its arguments,
-    ensuring that they're valid (or raising an exception if they're not).
-    If the inputs are valid, it calls this generator and returns the
-    resulting iterator.
-    """
-    text = s[0:0]
+    def __repr__(self):
+        return f"{self.__class__.__name__}({self.quotes!r}, escape={self.escape!r}, multiline_quotes={self.multiline_quotes!r})"
 
-    quote = state
-    for pair in multisplit(s, separators, keep=AS_PAIRS, separate=True):
-        literal, separator = pair
+    def split(self, s, state=None):
+        """
+        Splits s into quoted and unquoted segments.
 
-        if literal:
-            if text:
-                text += literal
-            else:
-                text = literal
-        if not quote:
-            # not currently quoted
-            if separator not in all_quotes_set:
-                if text:
-                    text += separator
-                else:
-                    text = separator
-                continue
-            if text:
-                length = len(text)
-                leading_empty = text[0:0]
-                trailing_empty = text[length:length]
-                yield (leading_empty, text, trailing_empty)
-                text = trailing_empty
-            quote = separator
-            continue
-        # in quote
-        if separator != quote:
-            if text:
-                text += separator
-            else:
-                text = separator
-            continue
-        # separator == quote
-        if quote or text:
-            if quote and text and (quote not in multiline_quotes):
-                # see treatise above
-                if (len(text.splitlines()) > 1) or (len( (text[-1:] + laden).splitlines()) > 1):
-                    raise SyntaxError("unterminated quoted string, {s!r}")
-            if state:
-                state = None
-                yield (text[0:0], text, separator)
-            else:
-                yield (quote, text, separator)
-        length = len(text)
-        text = text[length:length]
-        quote = text
+        Returns an iterator yielding 3-tuples, exactly like
+        split_quoted_strings.  s must be str if the splitter
+        uses str, or bytes if the splitter uses bytes.
+        state works the same as the state argument to
+        split_quoted_strings.
+        """
+        if not isinstance(s, self._s_type):
+            raise TypeError(f"s must be {self._s_type.__name__}, not {type(s).__name__}")
+        state = _sqs_state(s, self._s_type, state, self._all_quotes_set)
+        return _split_quoted_strings(s, self._patterns, self._all_quotes_set, self._multiline_quotes_set, self._laden, state)
 
-    if text or quote:
-        if quote and text and (quote not in multiline_quotes):
-            # see treatise above
-            if (len(text.splitlines()) > 1) or (len( (text[-1:] + laden).splitlines()) > 1):
-                raise SyntaxError(f"unterminated quoted string, {s!r}")
-        if state:
-            # state = None
-            quote = text[0:0]
-        length = len(text)
-        yield (quote, text, text[length:length])
 
-_split_quoted_strings = split_quoted_strings
+@functools.lru_cache(re._MAXCACHE)
+def _cached_quoted_string_splitter(is_bytes, escape, quotes_set, multiline_quotes_set):
+    # the arguments have already been validated.
+    splitter = QuotedStringSplitter.__new__(QuotedStringSplitter)
+    splitter._compile(is_bytes, escape, quotes_set, multiline_quotes_set)
+    return splitter
 
 
 @export
@@ -2126,120 +3576,14 @@ def split_quoted_strings(s, quotes=_sqs_quotes_str, *, escape=_sqs_escape_str, m
       different strings, use split_delimiters.
     """
 
-    if multiline_quotes is None:
-        multiline_quotes = ()
-
     is_bytes = isinstance(s, bytes)
-    if is_bytes:
-        s_type = bytes
-        empty = b''
-        laden = b'x'
-        if quotes in (_sqs_quotes_str, None):
-            quotes = _sqs_quotes_bytes
-        else:
-            if isinstance(quotes, bytes):
-                quotes = tuple(_iterate_over_bytes(quotes))
-            for q in quotes:
-                if not isinstance(q, s_type):
-                    raise TypeError(f"values in quotes must match s (str or bytes), not {q!r}")
-                if not q:
-                    raise ValueError("quotes cannot contain an empty string")
-        if escape in (_sqs_escape_str, None):
-            escape = _sqs_escape_bytes
-        if multiline_quotes:
-            if isinstance(multiline_quotes, bytes):
-                multiline_quotes = tuple(_iterate_over_bytes(multiline_quotes))
-            for q in multiline_quotes:
-                if not isinstance(q, s_type):
-                    raise TypeError(f"values in multiline_quotes must match s (str or bytes), not {q!r}")
-                if not q:
-                    raise ValueError("multiline_quotes cannot contain an empty string")
-        elif not isinstance(escape, s_type):
-            raise TypeError(f"escape must match s (str or bytes), not {escape!r}")
-    else:
-        s_type = str
-        empty = ""
-        laden = 'x'
-        if quotes in (_sqs_quotes_bytes, None):
-            quotes = _sqs_quotes_str
-        else:
-            for q in quotes:
-                if not isinstance(q, s_type):
-                    raise TypeError(f"values in quotes must match s (str or bytes), not {q!r}")
-                if not q:
-                    raise ValueError("quotes cannot contain an empty string")
-        if escape in (_sqs_escape_bytes, None):
-            escape = _sqs_escape_str
-        if multiline_quotes:
-            for q in multiline_quotes:
-                if not isinstance(q, s_type):
-                    raise TypeError(f"values in multiline_quotes must match s (str or bytes), not {q!r}")
-                if not q:
-                    raise ValueError("multiline_quotes cannot contain an empty string")
-        elif not isinstance(escape, s_type):
-            raise TypeError(f"escape must match s (str or bytes), not {escape!r}")
-
-    quotes_set = set(quotes)
-    multiline_quotes_set = set(multiline_quotes)
+    escape, quotes_set, multiline_quotes_set = _sqs_arguments(is_bytes, quotes, escape, multiline_quotes)
     all_quotes_set = quotes_set | multiline_quotes_set
+    state = _sqs_state(s, bytes if is_bytes else str, state, all_quotes_set)
 
-    if not all_quotes_set:
-        raise ValueError("either quotes or multiline_quotes must be non-empty")
-
-    if state in (None, '', b''):
-        state = s[0:0]
-    else:
-        if not isinstance(state, s_type):
-            raise TypeError("state must match s (str or bytes), not {state!r}")
-        if state not in all_quotes_set:
-            raise ValueError(f"state must be be one of the delimiters listed in the quotes or multiline_quotes arguments, not {state!r}")
-
-    if len(quotes_set) != len(quotes):
-        repeated = set()
-        seen = set()
-        for q in quotes:
-            if q in seen:
-                repeated.add(q)
-            seen.add(q)
-        repeated = list(repeated)
-        repeated.sort()
-        raise ValueError("quotes contains repeated quote markers: " + ", ".join(repr(q) for q in repeated))
-
-    if len(multiline_quotes_set) != len(multiline_quotes):
-        repeated = set()
-        seen = set()
-        for q in multiline_quotes:
-            if q in seen:
-                repeated.add(q)
-            seen.add(q)
-        repeated = list(repeated)
-        repeated.sort()
-        raise ValueError("multiline_quotes contains repeated quote markers: " + ", ".join(repr(q) for q in repeated))
-
-    in_both_quotes_sets = quotes_set & multiline_quotes_set
-    if in_both_quotes_sets:
-        in_both_quotes_sets = list(in_both_quotes_sets)
-        if len(in_both_quotes_sets) == 1:
-            s = repr(list(in_both_quotes_sets)[0])
-        else:
-            in_both_quotes_sets.sort()
-            s = ', '.join(repr(_) for _ in in_both_quotes_sets)
-        raise ValueError(f"{s} appears in both quotes and multiline_quotes")
-
-    # separators is a list containing all quote marks,
-    separators = list(quotes_set)
-    separators.extend(multiline_quotes_set)
-
-    # and also all escaped quote marks.
-    if escape:
-        for first_character in {q[0:] for q in quotes}:
-            separators.append(escape + first_character)
-        separators.append(escape + escape)
-
-    # help multisplit work better--it memoizes the conversion to a regular expression
-    separators.sort()
-
-    return _split_quoted_strings(s, separators, all_quotes_set, quotes_set, multiline_quotes_set, empty, laden, state)
+    # the splitter memoizes the conversion to regular expressions.
+    splitter = _cached_quoted_string_splitter(is_bytes, escape, frozenset(quotes_set), frozenset(multiline_quotes_set))
+    return _split_quoted_strings(s, splitter._patterns, splitter._all_quotes_set, splitter._multiline_quotes_set, splitter._laden, state)
 
 
 @export
@@ -3262,6 +4606,68 @@ _delimiters_cache.append(
     )
 
 
+def _split_delimiters_arguments(delimiters, is_bytes, state, yields):
+    """
+    Validates the arguments to split_delimiters (and
+    DelimiterParser), and looks up or computes the parser
+    tables.  Returns a 5-tuple:
+
+        (str_or_bytes, all_tokens, current, stack, yields)
+    """
+    initial_state = all_tokens = None
+
+    if is_bytes:
+        str_or_bytes = bytes
+        if delimiters is None:
+            delimiters = split_delimiters_default_delimiters_bytes
+        elif not delimiters:
+            raise ValueError("invalid delimiters")
+        elif b'\\' in delimiters:
+            raise ValueError("open delimiter must not be b'\\'")
+    else:
+        str_or_bytes = str
+        if delimiters is None:
+            delimiters = split_delimiters_default_delimiters
+        elif not delimiters:
+            raise ValueError("invalid delimiters")
+        elif '\\' in delimiters:
+            raise ValueError("open delimiter must not be '\\'")
+
+    for d, cache, default_yields in _delimiters_cache:
+        if delimiters == d:
+            initial_state, all_tokens = cache
+            if yields is None:
+                yields = default_yields
+            break
+
+    if not initial_state:
+        initial_state, all_tokens = _delimiters_to_state_and_tokens(tuple(delimiters.items()), is_bytes)
+    assert initial_state
+    assert all_tokens
+
+    if yields is None:
+        yields = 3
+    elif not yields in (3, 4):
+        raise ValueError("yields must be None, 3, or 4")
+
+    stack = []
+    push = stack.append
+
+    current = initial_state
+
+    if state:
+        for i, delimiter in enumerate(_iterate_over_bytes(state)):
+            action = current.get(delimiter, _ACTION_FLUSH)
+            if isinstance(action, dict):
+                push((current, delimiter))
+                current = action
+                continue
+
+            raise ValueError(f"delimiter #{i} specified in state is invalid: {delimiter!r}")
+
+    return str_or_bytes, all_tokens, current, stack, yields
+
+
 @export
 def split_delimiters(s, delimiters=split_delimiters_default_delimiters, *, state=(), yields=None):
     """
@@ -3353,63 +4759,212 @@ def split_delimiters(s, delimiters=split_delimiters_default_delimiters, *, state
     See the Delimiter object for how delimiters are defined, and how
     you can define your own delimiters.
     """
-    initial_state = all_tokens = None
-
     is_bytes = isinstance(s, bytes)
-    if is_bytes:
-        str_or_bytes = bytes
-        if delimiters is None:
-            delimiters = split_delimiters_default_delimiters_bytes
-        elif not delimiters:
-            raise ValueError("invalid delimiters")
-        elif b'\\' in delimiters:
-            raise ValueError("open delimiter must not be b'\\'")
-    else:
-        str_or_bytes = str
-        if delimiters is None:
-            delimiters = split_delimiters_default_delimiters
-        elif not delimiters:
-            raise ValueError("invalid delimiters")
-        elif '\\' in delimiters:
-            raise ValueError("open delimiter must not be '\\'")
+    str_or_bytes, all_tokens, current, stack, yields = _split_delimiters_arguments(delimiters, is_bytes, state, yields)
 
     s_length = len(s)
     empty = s[s_length:]
 
-    for d, cache, default_yields in _delimiters_cache:
-        if delimiters == d:
-            initial_state, all_tokens = cache
-            if yields is None:
-                yields = default_yields
-            break
+    return _split_delimiters(s, all_tokens, current, stack, empty, str_or_bytes, yields)
 
-    if not initial_state:
-        initial_state, all_tokens = _delimiters_to_state_and_tokens(tuple(delimiters.items()), is_bytes)
-    assert initial_state
-    assert all_tokens
 
-    if yields is None:
-        yields = 3
-    elif not yields in (3, 4):
-        raise ValueError("yields must be None, 3, or 4")
+@export
+class DelimiterParser:
+    """
+    An incremental, chunk-fed split_delimiters.
+
+    Pass in delimiters, state, and yields exactly as you would
+    to split_delimiters.  Then call feed() with each chunk of
+    text as it arrives, and close() when there's no more text.
+    feed() and close() both return a list of the
+    SplitDelimitersValue objects that became certain; joined
+    together, the values returned from every call are the same
+    values split_delimiters would have yielded for the
+    concatenated text.
+
+    Chunks may split the text anywhere--even in the middle of
+    a multi-character delimiter or escape string.  The parser
+    only holds on to the text of the current value (the text
+    since the last delimiter), the delimiter stack, and at most
+    one token's worth of unexamined text.  So memory use
+    scales with nesting depth, not with the size of the input.
+
+    If delimiters is None, the parser uses the default
+    delimiters for str or bytes, depending on the type of
+    the first chunk.  All chunks must be the same type.
+    """
+    def __init__(self, delimiters=split_delimiters_default_delimiters, *, state=(), yields=None):
+        self._delimiters = delimiters
+        self._state = state
+        self._yields = yields
+        self._s_type = None
+        self._closed = False
+
+        if delimiters is not None:
+            is_bytes = False
+            for open in delimiters:
+                is_bytes = isinstance(open, bytes)
+                break
+            self._setup(is_bytes)
+
+    def _setup(self, is_bytes):
+        str_or_bytes, all_tokens, current, stack, yields = _split_delimiters_arguments(self._delimiters, is_bytes, self._state, self._yields)
+        self._s_type = str_or_bytes
+        self._empty = str_or_bytes()
+        self._current = current
+        self._stack = stack
+        self._yields = yields
+        self._search = re.compile(_separators_to_re(tuple(sorted(all_tokens)), is_bytes, separate=True)).search
+        self._maxlen = max(len(token) for token in all_tokens)
+
+        # text we haven't examined yet, and its index in the input.
+        self._text = self._empty
+        self._offset = 0
+        # the text of the value we're currently accumulating.
+        self._buffer = []
+        self._escaped = self._empty
 
-    stack = []
-    push = stack.append
+    def __repr__(self):
+        return f"{self.__class__.__name__}({self._delimiters!r}, state={self._state!r}, yields={self._yields!r})"
 
-    current = initial_state
-    open = None
+    def feed(self, chunk):
+        """
+        Parses the next chunk of text.
 
-    if state:
-        for i, delimiter in enumerate(_iterate_over_bytes(state)):
-            action = current.get(delimiter, _ACTION_FLUSH)
-            if isinstance(action, dict):
-                push((current, delimiter))
-                current = action
+        Returns a list of the SplitDelimitersValue objects
+        that are now certain.  (The list may be empty.)
+        """
+        if self._closed:
+            raise ValueError("DelimiterParser is closed")
+        if self._s_type is None:
+            self._setup(isinstance(chunk, bytes))
+        if not isinstance(chunk, self._s_type):
+            raise TypeError(f"chunk must be {self._s_type.__name__}, not {type(chunk).__name__}")
+        self._text += chunk
+        return self._parse(False)
+
+    def close(self):
+        """
+        Tells the parser there's no more text.
+
+        Returns a list of the remaining SplitDelimitersValue
+        objects.  Like split_delimiters, close doesn't react
+        if the text ends with unterminated delimiters, but
+        raises SyntaxError if it ends with an escape string.
+        """
+        if self._closed or (self._s_type is None):
+            self._closed = True
+            return []
+        self._closed = True
+
+        values = self._parse(True)
+        buffer = self._buffer
+        if buffer:
+            if self._escaped:
+                raise SyntaxError(f"text ends with escape string {self._escaped!r}")
+            empty = self._empty
+            s = empty.join(buffer)
+            buffer.clear()
+            if s:
+                values.append(SplitDelimitersValue(s, empty, empty, empty, self._yields))
+        return values
+
+    def _parse(self, eof):
+        # this is the loop from split_delimiters, with one
+        # extra rule: we only act on a token once we're sure
+        # it's the same token we'd see if we had all the text.
+        # that's true once the maxlen characters starting
+        # at the token are all in self._text.
+        text = self._text
+        length = len(text)
+        search = self._search
+        maxlen = self._maxlen
+        append = self._buffer.append
+
+        values = []
+        pos = 0
+
+        while pos < length:
+            if self._escaped:
+                # the character after an escape string is always literal.
+                append(text[pos:pos + 1])
+                pos += 1
+                self._escaped = self._empty
                 continue
 
-            raise ValueError(f"delimiter #{i} specified in state is invalid: {delimiter!r}")
+            match = search(text, pos)
+            if match:
+                start, end = match.span()
+                certain = eof or ((start + maxlen) <= length)
+            else:
+                start = end = length
+                certain = eof
+
+            if not certain:
+                # no token can start before limit,
+                # so that text is certainly part of the current value.
+                limit = max(pos, min(start, length - maxlen + 1))
+                if limit > pos:
+                    append(text[pos:limit])
+                    pos = limit
+                break
 
-    return _split_delimiters(s, all_tokens, current, stack, empty, str_or_bytes, yields)
+            if start > pos:
+                append(text[pos:start])
+            pos = start
+            if match:
+                pos += self._token(text[start:end], self._offset + start, values)
+
+        self._text = text[pos:]
+        self._offset += pos
+        return values
+
+    def _token(self, delimiter, index, values):
+        # handles one token, exactly like split_delimiters.
+        # returns how many characters of it we consumed.
+        current = self._current
+        stack = self._stack
+        buffer = self._buffer
+        empty = self._empty
+
+        action = current.get(delimiter, _ACTION_FLUSH)
+
+        if isinstance(action, _ACTION_TRUNCATE_TO_S_AND_RESPLIT):
+            delimiter = delimiter[:len(self._s_type(action))]
+            action = current.get(delimiter, _ACTION_FLUSH)
+
+        if isinstance(action, dict):
+            s = empty.join(buffer)
+            buffer.clear()
+            if isinstance(action, _ACTION_GOTO_STATE):
+                values.append(SplitDelimitersValue(s, empty, empty, delimiter, self._yields))
+                stack[-1] = (stack[-1][0], delimiter)
+            else:
+                values.append(SplitDelimitersValue(s, delimiter, empty, empty, self._yields))
+                stack.append((current, delimiter))
+            self._current = action
+        elif action is _ACTION_POP:
+            s = empty.join(buffer)
+            buffer.clear()
+            values.append(SplitDelimitersValue(s, empty, delimiter, empty, self._yields))
+            self._current, _ = stack.pop()
+        elif action is _ACTION_ESCAPE:
+            buffer.append(delimiter)
+            self._escaped = delimiter
+        elif action is _ACTION_FLUSH:
+            buffer.append(delimiter)
+        elif action is _ACTION_FLUSH_1_AND_RESPLIT:
+            buffer.append(delimiter[0:1])
+            return 1
+        elif action is _ACTION_ILLEGAL:
+            raise SyntaxError(f"index {index}: illegal string {delimiter!r}")
+        elif action is _ACTION_ILLEGAL_LINEBREAK:
+            assert stack
+            raise SyntaxError(f"index {index}: linebreak character {delimiter!r} is illegal inside delimiter {stack[-1][1]!r}")
+        else: # pragma: nocover
+            raise RuntimeError(f"index {index}: unhandled action {action!r}")
+
+        return len(delimiter)
 
 
 
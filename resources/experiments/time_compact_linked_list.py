@@ -0,0 +1,102 @@
+#!/usr/bin/env python3
+
+_license = """
+big
+Copyright 2022-2026 Larry Hastings
+All rights reserved.
+
+Permission is hereby granted, free of charge, to any person obtaining a
+copy of this software and associated documentation files (the "Software"),
+to deal in the Software without restriction, including without limitation
+the rights to use, copy, modify, merge, publish, distribute, sublicense,
+and/or sell copies of the Software, and to permit persons to whom the
+Software is furnished to do so, subject to the following conditions:
+
+The above copyright notice and this permission notice shall be included
+in all copies or substantial portions of the Software.
+
+THE SOFTWARE IS PROVIDED "AS IS", WITHOUT WARRANTY OF ANY KIND,
+EXPRESS OR IMPLIED, INCLUDING BUT NOT LIMITED TO THE WARRANTIES OF
+MERCHANTABILITY, FITNESS FOR A PARTICULAR PURPOSE AND NONINFRINGEMENT.
+IN NO EVENT SHALL THE AUTHORS OR COPYRIGHT HOLDERS BE LIABLE FOR ANY CLAIM,
+DAMAGES OR OTHER LIABILITY, WHETHER IN AN ACTION OF CONTRACT, TORT OR
+OTHERWISE, ARISING FROM, OUT OF OR IN CONNECTION WITH THE SOFTWARE OR
+THE USE OR OTHER DEALINGS IN THE SOFTWARE.
+"""
+
+#
+# Measures what compact=True costs linked_list, and what it buys.
+#
+# A compact linked_list stores its nodes in parallel arrays, and
+# only creates node objects when an iterator needs one.  This script
+# builds the same list both ways, measures the memory each one uses
+# with tracemalloc, then times some common operations on each.
+#
+
+import os.path
+import random
+import sys
+import time
+import tracemalloc
+
+sys.path.insert(0, os.path.join(os.path.dirname(os.path.abspath(__file__)), '..', '..'))
+
+from big.types import linked_list
+
+
+length = 200_000
+lookups = 200
+
+
+def timed(fn):
+    start = time.perf_counter()
+    fn()
+    return time.perf_counter() - start
+
+
+def append_and_popleft(compact):
+    t = linked_list(compact=compact)
+    for i in range(length):
+        t.append(i)
+    for i in range(length):
+        t.popleft()
+
+
+def measure(compact):
+    tracemalloc.start()
+    t = linked_list(range(length), compact=compact)
+    memory, _ = tracemalloc.get_traced_memory()
+    tracemalloc.stop()
+
+    indices = random.Random(1234).sample(range(length), lookups)
+    results = {
+        'memory': memory,
+        'build': timed(lambda: linked_list(range(length), compact=compact)),
+        'iterate': timed(lambda: sum(1 for _ in t)),
+        'reversed': timed(lambda: sum(1 for _ in reversed(t))),
+        f'{lookups} t[i]': timed(lambda: [t[i] for i in indices]),
+        'copy': timed(lambda: t.copy()),
+        '==': timed(lambda: t == t.copy()),
+        'append+popleft': timed(lambda: append_and_popleft(compact)),
+        }
+    return results
+
+
+def main():
+    normal = measure(False)
+    compact = measure(True)
+
+    print(f"linked_list of {length:,} ints")
+    print()
+    print(f"{'':<16} {'normal':>10} {'compact':>10} {'ratio':>7}")
+    for name in normal:
+        before = normal[name]
+        after = compact[name]
+        if name == 'memory':
+            print(f"{name:<16} {before / 1_000_000:>8.1f}MB {after / 1_000_000:>8.1f}MB {after / before:>6.2f}x")
+        else:
+            print(f"{name:<16} {before:>9.3f}s {after:>9.3f}s {after / before:>6.2f}x")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,132 @@
+#!/usr/bin/env python3
+
+_license = """
+big
+Copyright 2022-2026 Larry Hastings
+All rights reserved.
+
+Permission is hereby granted, free of charge, to any person obtaining a
+copy of this software and associated documentation files (the "Software"),
+to deal in the Software without restriction, including without limitation
+the rights to use, copy, modify, merge, publish, distribute, sublicense,
+and/or sell copies of the Software, and to permit persons to whom the
+Software is furnished to do so, subject to the following conditions:
+
+The above copyright notice and this permission notice shall be included
+in all copies or substantial portions of the Software.
+
+THE SOFTWARE IS PROVIDED "AS IS", WITHOUT WARRANTY OF ANY KIND,
+EXPRESS OR IMPLIED, INCLUDING BUT NOT LIMITED TO THE WARRANTIES OF
+MERCHANTABILITY, FITNESS FOR A PARTICULAR PURPOSE AND NONINFRINGEMENT.
+IN NO EVENT SHALL THE AUTHORS OR COPYRIGHT HOLDERS BE LIABLE FOR ANY CLAIM,
+DAMAGES OR OTHER LIABILITY, WHETHER IN AN ACTION OF CONTRACT, TORT OR
+OTHERWISE, ARISING FROM, OUT OF OR IN CONNECTION WITH THE SOFTWARE OR
+THE USE OR OTHER DEALINGS IN THE SOFTWARE.
+"""
+
+#
+# Benchmarks for reversed_re_finditer, using patterns with
+# dense and overlapping matches.
+#
+# reversed_re_finditer has two implementations:
+#   * the general algorithm, which finds every forward match,
+#     then re-matches inside them, right to left, only as far
+#     as it needs to, and
+#   * the bounded algorithm, used when the longest possible match
+#     has a fixed length, which only looks back from the end of
+#     the string as far as it needs to.
+#
+# For each case we time iterating over every match with both,
+# and fetching just the last match (what re_rpartition does)
+# with both.  The general algorithm has to find every forward
+# match before it can yield anything; the bounded algorithm
+# only examines the end of the string.
+#
+# Patterns with no maximum width (like r'\w+ ') can only use
+# the general algorithm, and it can't use the width to decide
+# when to stop re-matching.  The second table times those.
+#
+
+import os.path
+import re
+import sys
+import time
+
+sys.path.insert(0, os.path.join(os.path.dirname(os.path.abspath(__file__)), '..', '..'))
+
+import big.text
+
+
+cases = [
+    # (description, pattern, string)
+    ("every character matches",
+        r'.', 'abcdefgh' * 25_000),
+    ("two-character matches overlapping at every position",
+        r'..', 'abcdefgh' * 25_000),
+    ("long and short alternatives overlapping",
+        r'abcdefghij|abcde|bc|cd|de|ef|fg|gh|hi|ij', 'abcdefghij' * 20_000),
+    ("long forward matches hiding later matches",
+        r'cdefghijk|bcd|fgh|jkl', 'abcdefghijklmnopqrstuvwxyz' * 8_000),
+    ("bounded repeats, fully overlapping",
+        r'a{1,8}', 'a' * 200_000),
+    ("sparse matches at the start of a long string",
+        r'xyz|yz', 'xyz' + ('-' * 200_000)),
+    ]
+
+words = ' '.join(('alpha', 'beta', 'gamma', 'delta', 'epsilon', 'zeta', 'eta', 'theta')) + ' '
+
+unbounded_cases = [
+    # (description, pattern, string)
+    ("words followed by a space",
+        r'\w+ ', words * 32_000),
+    ("words",
+        r'\w+', words * 32_000),
+    ("runs of a repeated character",
+        r'a+', ('a' * 50 + '-') * 30_000),
+    ]
+
+
+def timeit(fn, repeat=3):
+    best = None
+    for _ in range(repeat):
+        start = time.perf_counter()
+        fn()
+        elapsed = time.perf_counter() - start
+        if (best is None) or (elapsed < best):
+            best = elapsed
+    return best
+
+
+def main():
+    print(f"{'':<54} {'all matches':>21} {'last match only':>21}")
+    print(f"{'case':<54} {'general':>10} {'bounded':>10} {'general':>10} {'bounded':>10}")
+    for description, pattern, s in cases:
+        p = re.compile(pattern)
+        width = big.text._reversed_re_finditer_width(p)
+        assert width, f"{pattern!r} should use the bounded algorithm"
+
+        general = lambda: big.text._reversed_re_finditer(p, s)
+        bounded = lambda: big.text._reversed_re_finditer_bounded(p, s, width)
+        assert [m.span() for m in general()] == [m.span() for m in bounded()]
+
+        general_all = timeit(lambda: sum(1 for _ in general()))
+        bounded_all = timeit(lambda: sum(1 for _ in bounded()))
+        general_last = timeit(lambda: next(general()))
+        bounded_last = timeit(lambda: next(bounded()))
+        print(f"{description:<54} {general_all:>9.4f}s {bounded_all:>9.4f}s {general_last:>9.4f}s {bounded_last:>9.4f}s")
+
+    print()
+    print(f"{'unbounded case':<54} {'all matches':>21} {'last match only':>21}")
+    for description, pattern, s in unbounded_cases:
+        p = re.compile(pattern)
+        assert not big.text._reversed_re_finditer_width(p), f"{pattern!r} shouldn't have a maximum width"
+
+        general = lambda: big.text._reversed_re_finditer(p, s)
+
+        general_all = timeit(lambda: sum(1 for _ in general()))
+        general_last = timeit(lambda: next(general()))
+        print(f"{description:<54} {general_all:>20.4f}s {general_last:>20.4f}s")
+
+
+if __name__ == "__main__":
+    main()
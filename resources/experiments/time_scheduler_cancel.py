@@ -0,0 +1,111 @@
+#!/usr/bin/env python3
+
+_license = """
+big
+Copyright 2022-2026 Larry Hastings
+All rights reserved.
+
+Permission is hereby granted, free of charge, to any person obtaining a
+copy of this software and associated documentation files (the "Software"),
+to deal in the Software without restriction, including without limitation
+the rights to use, copy, modify, merge, publish, distribute, sublicense,
+and/or sell copies of the Software, and to permit persons to whom the
+Software is furnished to do so, subject to the following conditions:
+
+The above copyright notice and this permission notice shall be included
+in all copies or substantial portions of the Software.
+
+THE SOFTWARE IS PROVIDED "AS IS", WITHOUT WARRANTY OF ANY KIND,
+EXPRESS OR IMPLIED, INCLUDING BUT NOT LIMITED TO THE WARRANTIES OF
+MERCHANTABILITY, FITNESS FOR A PARTICULAR PURPOSE AND NONINFRINGEMENT.
+IN NO EVENT SHALL THE AUTHORS OR COPYRIGHT HOLDERS BE LIABLE FOR ANY CLAIM,
+DAMAGES OR OTHER LIABILITY, WHETHER IN AN ACTION OF CONTRACT, TORT OR
+OTHERWISE, ARISING FROM, OUT OF OR IN CONNECTION WITH THE SOFTWARE OR
+THE USE OR OTHER DEALINGS IN THE SOFTWARE.
+"""
+
+#
+# Benchmarks for canceling Scheduler events and removing
+# values from a Heap, comparing the current implementations
+# with the ones they replaced.
+#
+# The old Scheduler.cancel called Heap.remove, and the old
+# Heap.remove called list.remove and then re-heapified the whole
+# list: O(n) Python-level comparisons per removal.  Scheduler.cancel
+# now only marks the event as canceled, and Heap.remove sifts the
+# replacement value into place in O(log n).
+#
+# The "before" cancel benchmark takes a minute or two.
+#
+
+from heapq import heapify
+import os.path
+import random
+import sys
+import time
+
+sys.path.insert(0, os.path.join(os.path.dirname(os.path.abspath(__file__)), '..', '..'))
+
+import big.heap
+import big.scheduler
+
+
+events = 20_000
+canceled = 18_000
+
+heap_size = 20_000
+heap_removals = 5_000
+
+
+def old_heap_remove(heap, o):
+    # Heap.remove, as it used to be.
+    heap._queue.remove(o)
+    heapify(heap._queue)
+    heap._version += 1
+
+
+def time_cancel(old):
+    scheduler = big.scheduler.Scheduler()
+    scheduled = [scheduler.schedule(i, 1_000_000 + i, absolute=True) for i in range(events)]
+    doomed = random.Random(1234).sample(scheduled, canceled)
+    start = time.perf_counter()
+    if old:
+        # Scheduler.cancel, as it used to be.
+        for event in doomed:
+            with scheduler.regulator.lock:
+                old_heap_remove(scheduler.heap, event)
+                scheduler.regulator.wake()
+    else:
+        for event in doomed:
+            scheduler.cancel(event)
+    return time.perf_counter() - start
+
+
+def time_heap_remove(old):
+    values = list(range(heap_size))
+    random.Random(5678).shuffle(values)
+    heap = big.heap.Heap(values)
+    doomed = random.Random(9012).sample(values, heap_removals)
+    start = time.perf_counter()
+    if old:
+        for value in doomed:
+            old_heap_remove(heap, value)
+    else:
+        for value in doomed:
+            heap.remove(value)
+    return time.perf_counter() - start
+
+
+def main():
+    print(f"{'case':<52} {'before':>9} {'after':>9}")
+    for description, fn in (
+        (f"Scheduler.cancel, {canceled:,} of {events:,} events", time_cancel),
+        (f"Heap.remove, {heap_removals:,} of {heap_size:,} ints", time_heap_remove),
+        ):
+        after = fn(False)
+        before = fn(True)
+        print(f"{description:<52} {before:>8.2f}s {after:>8.2f}s")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,96 @@
+#!/usr/bin/env python3
+
+_license = """
+big
+Copyright 2022-2026 Larry Hastings
+All rights reserved.
+
+Permission is hereby granted, free of charge, to any person obtaining a
+copy of this software and associated documentation files (the "Software"),
+to deal in the Software without restriction, including without limitation
+the rights to use, copy, modify, merge, publish, distribute, sublicense,
+and/or sell copies of the Software, and to permit persons to whom the
+Software is furnished to do so, subject to the following conditions:
+
+The above copyright notice and this permission notice shall be included
+in all copies or substantial portions of the Software.
+
+THE SOFTWARE IS PROVIDED "AS IS", WITHOUT WARRANTY OF ANY KIND,
+EXPRESS OR IMPLIED, INCLUDING BUT NOT LIMITED TO THE WARRANTIES OF
+MERCHANTABILITY, FITNESS FOR A PARTICULAR PURPOSE AND NONINFRINGEMENT.
+IN NO EVENT SHALL THE AUTHORS OR COPYRIGHT HOLDERS BE LIABLE FOR ANY CLAIM,
+DAMAGES OR OTHER LIABILITY, WHETHER IN AN ACTION OF CONTRACT, TORT OR
+OTHERWISE, ARISING FROM, OUT OF OR IN CONNECTION WITH THE SOFTWARE OR
+THE USE OR OTHER DEALINGS IN THE SOFTWARE.
+"""
+
+#
+# Measures what predecessor tracking costs TopologicalSorter,
+# and what it buys.
+#
+# With predecessors=True, the graph stores every edge in reverse,
+# so remove() can find a node's dependencies directly, rather than
+# scanning every node in the graph.  This script builds the same
+# random graph with and without predecessor tracking, measures the
+# memory each one uses with tracemalloc, then times removing nodes.
+#
+
+import os.path
+import random
+import sys
+import time
+import tracemalloc
+
+sys.path.insert(0, os.path.join(os.path.dirname(os.path.abspath(__file__)), '..', '..'))
+
+import big.graph
+
+
+nodes = 20_000
+edges = 60_000
+removals = 1_000
+
+
+def make_edges():
+    # every edge points to an earlier node, so the graph has no cycles.
+    r = random.Random(1234)
+    result = []
+    for _ in range(edges):
+        node = r.randrange(1, nodes)
+        result.append((node, r.randrange(node)))
+    return result
+
+
+def build(predecessors, edge_list):
+    graph = big.graph.TopologicalSorter(predecessors=predecessors)
+    for node in range(nodes):
+        graph.add(node)
+    for node, dependency in edge_list:
+        graph.add(node, dependency)
+    return graph
+
+
+def main():
+    edge_list = make_edges()
+    doomed = random.Random(5678).sample(range(nodes), removals)
+
+    print(f"{nodes:,} nodes, {edges:,} edges, removing {removals:,} nodes")
+    print()
+    print(f"{'predecessors':<14} {'memory':>10} {'remove()':>12}")
+    for predecessors in (False, True):
+        tracemalloc.start()
+        graph = build(predecessors, edge_list)
+        memory, _ = tracemalloc.get_traced_memory()
+        tracemalloc.stop()
+
+        start = time.perf_counter()
+        for node in doomed:
+            graph.remove(node)
+        elapsed = time.perf_counter() - start
+
+        per_remove = elapsed / removals * 1_000_000
+        print(f"{str(predecessors):<14} {memory / 1_000_000:>8.1f}MB {per_remove:>10.1f}us")
+
+
+if __name__ == "__main__":
+    main()
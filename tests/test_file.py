@@ -87,6 +87,102 @@ class BigFileTests(unittest.TestCase):
         with self.assertRaises(ValueError):
             self.assertEqual(big.fgrep(p, b"b", encoding="utf-8"))
 
+    def test_lazy_grep_and_fgrep(self):
+        test_dir = os.path.dirname(__file__)
+        grepfile = os.path.join(test_dir, "grepfile")
+        for c in (unchanged, to_bytes):
+            i = big.grep(c(grepfile), c("b"), lazy=True)
+            self.assertNotIsInstance(i, list)
+            self.assertEqual(list(i), c(['bbbb', 'abc']))
+            self.assertEqual(list(big.grep(c(grepfile), c("b"), flags=re.I, enumerate=True, lazy=True)), c([(2, 'bbbb'), (3, 'abc'), (7, 'BBBB'), (8, 'ABC')]))
+            self.assertEqual(list(big.grep(Path(grepfile), c("^[ac]"), lazy=True)), c(['aaaa', 'abc', 'cccc']))
+            self.assertEqual(list(big.grep(c(grepfile), c("c$"), enumerate=True, lazy=True)), c([(3, 'abc'), (4, 'cccc')]))
+            # the final line of grepfile is empty
+            self.assertEqual(list(big.grep(c(grepfile), c("^$"), enumerate=True, lazy=True)), c([(11, '')]))
+
+            i = big.fgrep(c(grepfile), c("b"), lazy=True)
+            self.assertNotIsInstance(i, list)
+            self.assertEqual(list(i), c(['bbbb', 'abc']))
+            self.assertEqual(list(big.fgrep(c(grepfile), c("B"), case_insensitive=True, lazy=True)), c(['bbbb', 'abc', 'BBBB', 'ABC']))
+            self.assertEqual(list(big.fgrep(c(grepfile), c("b"), case_insensitive=True, enumerate=True, lazy=True)), c([(2, 'bbbb'), (3, 'abc'), (7, 'BBBB'), (8, 'ABC')]))
+            self.assertEqual(list(big.fgrep(Path(grepfile), c("d"), enumerate=True, lazy=True)), c([(5, 'ddddd')]))
+            self.assertEqual(list(big.fgrep(c(grepfile), c("b\nc"), lazy=True)), [])
+
+        with self.assertRaises(ValueError):
+            big.grep(grepfile, b"b", encoding="utf-8", lazy=True)
+        with self.assertRaises(ValueError):
+            big.fgrep(grepfile, b"b", encoding="utf-8", lazy=True)
+
+        # lazy results should always match the eager results.
+        # shrink the block size to exercise lines spanning blocks.
+        contents = 'alpha\r\nBeta\n\ngamma \u0130 delta\rKELVIN \u212a\nalphabet'
+        saved_block_size = big.file._grep_block_size
+        with tempfile.TemporaryDirectory() as tmp:
+            path = os.path.join(tmp, 'lazy')
+            for text in (contents, contents + '\n', '', ('x' * 50) + 'alpha' + ('y' * 50) + '\nalpha\n' + ('z' * 40)):
+                with open(path, 'wt', encoding='utf-8', newline='') as f:
+                    f.write(text)
+                try:
+                    for block_size in (1, 3, 7, saved_block_size):
+                        big.file._grep_block_size = block_size
+                        for encoding, c in ((None, lambda s: s.encode('utf-8')), ('utf-8', unchanged)):
+                            for want_enumerate in (False, True):
+                                for needle in ('alpha', 'a', 'i\u0307', 'k', 'E', ''):
+                                    for case_insensitive in (False, True):
+                                        kwargs = dict(encoding=encoding, enumerate=want_enumerate, case_insensitive=case_insensitive)
+                                        self.assertEqual(list(big.fgrep(path, c(needle), lazy=True, **kwargs)), big.fgrep(path, c(needle), **kwargs))
+                                for pattern in ('a', '^a', 'a$', '^$', 'a\\s*b', '[^a]', '(?i)k'):
+                                    kwargs = dict(encoding=encoding, enumerate=want_enumerate)
+                                    self.assertEqual(list(big.grep(path, c(pattern), lazy=True, **kwargs)), big.grep(path, c(pattern), **kwargs))
+                finally:
+                    big.file._grep_block_size = saved_block_size
+
+    def test_grep_many(self):
+        test_dir = os.path.dirname(__file__)
+        grepfile = os.path.join(test_dir, "grepfile")
+        with tempfile.TemporaryDirectory() as tmp:
+            paths = []
+            for i in range(12):
+                path = os.path.join(tmp, f"file{i}")
+                with open(path, "wt") as f:
+                    f.write("x\n" * i)
+                    f.write(f"match {i}\n")
+                    if i % 3:
+                        f.write("another match\n")
+                paths.append(path)
+            paths.append(grepfile)
+
+            expected = [(path, line_number, line) for path in paths for line_number, line in big.grep(path, "match|b", enumerate=True)]
+
+            import concurrent.futures
+            with concurrent.futures.ThreadPoolExecutor(max_workers=3) as executor:
+                for max_pending in (1, 2, 5, None):
+                    self.assertEqual(list(big.grep_many(paths, "match|b", executor=executor, max_pending=max_pending)), expected)
+                    unordered = list(big.grep_many(iter(paths), re.compile("match|b"), executor=executor, max_pending=max_pending, ordered=False))
+                    self.assertEqual(sorted(unordered), sorted(expected))
+
+                # grep_many doesn't read paths any faster than it needs to
+                consumed = []
+                def path_generator():
+                    for path in paths:
+                        consumed.append(path)
+                        yield path
+                i = big.grep_many(path_generator(), "match", executor=executor, max_pending=2)
+                self.assertEqual(next(i), (paths[0], 1, "match 0"))
+                self.assertLessEqual(len(consumed), 3)
+                i.close()
+
+                with self.assertRaises(FileNotFoundError):
+                    list(big.grep_many([os.path.join(tmp, "does not exist")], "x", executor=executor))
+
+            # default executor is a process pool
+            self.assertEqual(list(big.grep_many(paths[:4], "match", max_workers=2)), [(path, line_number, line) for path in paths[:4] for line_number, line in big.grep(path, "match", enumerate=True)])
+
+        with self.assertRaises(ValueError):
+            big.grep_many([grepfile], b"b", encoding="utf-8")
+        with self.assertRaises(ValueError):
+            big.grep_many([grepfile], "b", max_pending=0)
+
     def test_pushd(self):
         cwd = os.getcwd()
         with big.pushd(".."):
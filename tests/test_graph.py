@@ -28,6 +28,7 @@ import bigtestlib
 bigtestlib.preload_local_big()
 
 from big.all import TopologicalSorter
+import big.graph
 import itertools
 import unittest
 
@@ -61,13 +62,13 @@ class TopologicalSortTests(unittest.TestCase):
         # we try every ordering of adding the nodes
         # and, if there are removals, for each of those
         #    we try every ordering of the removals
-        for args in itertools.permutations(args):
+        for args, incremental in itertools.product(itertools.permutations(args), (False, True)):
             if remove:
                 remove_iterator = itertools.permutations(remove)
             else:
                 remove_iterator = (None,)
             for removals in remove_iterator:
-                graph = TopologicalSorter()
+                graph = TopologicalSorter(incremental=incremental)
                 for a in args:
                     graph.add(*a)
                 if removals:
@@ -300,6 +301,303 @@ class TopologicalSortTests(unittest.TestCase):
             g.remove('Q')
 
 
+    def test_regression_copy_registers_views_with_copy(self):
+        g = TopologicalSorter()
+        g.add('B', 'A')
+        g2 = g.copy()
+        self.assertEqual(len(g.views), 2)
+        self.assertEqual(len(g2.views), 2)
+        g2.add('C', 'B')
+        self.assertEqual(list(g2.static_order()), ['A', 'B', 'C'])
+        g.remove('A')
+        self.assertEqual(list(g.static_order()), ['B'])
+
+    def test_incremental_cycle_detection(self):
+        def assert_ordered(g):
+            for node, (_, successors) in g.nodes.items():
+                for successor in successors:
+                    self.assertLess(g._order[node], g._order[successor])
+
+        g = TopologicalSorter(incremental=True)
+        g.add('B', 'A')
+        g.add('C', 'B')
+        g.add('D', 'C')
+        g.add('E')
+        # these edges all violate the current order
+        g.add('A', 'E')
+        g.add('B', 'D2')
+        g.add('E', 'X')
+        self.assertFalse(g.dirty)
+        assert_ordered(g)
+        self.assertEqual(g.cycle(), None)
+        self.assertEqual(list(g.static_order()), ['D2', 'X', 'E', 'A', 'B', 'C', 'D'])
+
+        # the cycle is found as soon as the edge is added
+        g.add('A', 'D')
+        self.assertTrue(g.dirty)
+        self.assertEqual(g.cycle(), ('A', 'B', 'C', 'D'))
+        with self.assertRaises(big.graph.CycleError):
+            g.ready()
+        g2 = g.copy()
+        self.assertEqual(g2.cycle(), ('A', 'B', 'C', 'D'))
+
+        # adds still work while the graph has a cycle
+        g.add('F', 'D')
+        g.add('G', 'F')
+        self.assertEqual(g.cycle(), ('A', 'B', 'C', 'D'))
+
+        # removing a node breaks the cycle, and incremental detection resumes
+        g.remove('C')
+        self.assertEqual(g.cycle(), None)
+        self.assertFalse(g.dirty)
+        assert_ordered(g)
+        g.add('C', 'G')
+        g.add('E', 'C')
+        self.assertEqual(g.cycle(), None)
+        assert_ordered(g)
+        g.add('D', 'B')
+        self.assertEqual(g.cycle(), ('D', 'A', 'B'))
+
+        g2.remove('D')
+        self.assertEqual(g2.cycle(), None)
+
+        g = TopologicalSorter(incremental=True)
+        g.add('A', 'A')
+        self.assertEqual(g.cycle(), ('A',))
+
+        # compare against the non-incremental detector on lots of random graphs
+        import random
+        r = random.Random(8675309)
+        for _ in range(300):
+            g = TopologicalSorter(incremental=True)
+            g2 = TopologicalSorter()
+            for _ in range(25):
+                if (r.random() < 0.8) or (not g.nodes):
+                    args = [r.randrange(10) for _ in range(r.randint(1, 3))]
+                    g.add(*args)
+                    g2.add(*args)
+                else:
+                    node = r.choice(list(g.nodes))
+                    g.remove(node)
+                    g2.remove(node)
+                cycle = g.cycle()
+                self.assertEqual(bool(cycle), bool(g2.cycle()))
+                if cycle:
+                    for i, node in enumerate(cycle):
+                        self.assertIn(cycle[(i + 1) % len(cycle)], g.nodes[node][1])
+                else:
+                    assert_ordered(g)
+
+    def test_regression_dependency_on_done_node(self):
+        g = TopologicalSorter()
+        g.add('A')
+        self.assertEqual(g.ready(), ('A',))
+        g.done('A')
+        g.add('B', 'A')
+        self.assertEqual(g.ready(), ('B',))
+        g.done('B')
+        self.assertFalse(g)
+
+    def test_remove_edge(self):
+        for incremental, predecessors in itertools.product((False, True), (False, True)):
+            g = TopologicalSorter(incremental=incremental, predecessors=predecessors)
+            g.add('B', 'A')
+            g.add('C', 'A', 'B')
+            g.add('D', 'C')
+            v = g.view()
+            self.assertEqual(v.ready(), ('A',))
+
+            g.remove_edge('C', 'B')
+            self.assertEqual(g.nodes['C'][0], 1)
+            self.assertNotIn('C', g.nodes['B'][1])
+            g.remove_edge('B', 'A')
+            self.assertEqual(g.ready(), ('A', 'B'))
+            self.assertEqual(v.ready(), ('B',))
+            v.done('A')
+            self.assertEqual(v.ready(), ('C',))
+
+            with self.assertRaises(ValueError):
+                g.remove_edge('B', 'A')
+            with self.assertRaises(ValueError):
+                g.remove_edge('Q', 'A')
+            with self.assertRaises(ValueError):
+                g.remove_edge('A', 'Q')
+
+            # removing an edge between a yielded node and a done node
+            # clears the conflict, making the view coherent again
+            g.add('A', 'B')
+            with self.assertRaises(RuntimeError):
+                bool(v)
+            g.remove_edge('A', 'B')
+            self.assertTrue(v)
+
+            # removing an edge breaks a cycle
+            g = TopologicalSorter(incremental=incremental, predecessors=predecessors)
+            g.add('B', 'A')
+            g.add('C', 'B')
+            g.add('A', 'C')
+            self.assertTrue(g.cycle())
+            g.remove_edge('A', 'C')
+            self.assertEqual(g.cycle(), None)
+            self.assertEqual(list(g.static_order()), ['A', 'B', 'C'])
+
+    def test_predecessor_tracking(self):
+        import random
+        r = random.Random(5551212)
+        for incremental in (False, True):
+            for _ in range(200):
+                g = TopologicalSorter(incremental=incremental, predecessors=True)
+                g2 = TopologicalSorter()
+                v = g.view()
+                v2 = g2.view()
+                for _ in range(30):
+                    x = r.random()
+                    if (x < 0.6) or (not g.nodes):
+                        args = [r.randrange(12) for _ in range(r.randint(1, 3))]
+                        g.add(*args)
+                        g2.add(*args)
+                    elif x < 0.8:
+                        node = r.choice(list(g.nodes))
+                        g.remove(node)
+                        g2.remove(node)
+                    else:
+                        node = r.choice(list(g.nodes))
+                        if g._reverse[node]:
+                            dependency = r.choice(list(g._reverse[node]))
+                            g.remove_edge(node, dependency)
+                            g2.remove_edge(node, dependency)
+                    self.assertEqual(g.nodes, g2.nodes)
+                    for node, (_, successors) in g.nodes.items():
+                        for successor in successors:
+                            self.assertIn(node, g._reverse[successor])
+                    self.assertEqual(sum(len(p) for p in g._reverse.values()), sum(p for p, _ in g.nodes.values()))
+                    self.assertEqual(bool(g.cycle()), bool(g2.cycle()))
+                    if (not g.cycle()) and (not v._conflicts):
+                        ready = v.ready()
+                        self.assertEqual(set(ready), set(v2.ready()))
+                        if ready:
+                            node = r.choice(ready)
+                            v.done(node)
+                            v2.done(node)
+
+    def test_run(self):
+        import concurrent.futures
+        import threading
+
+        def make_graph():
+            g = TopologicalSorter()
+            g.add('A')
+            g.add('X')
+            g.add('Y')
+            g.add('B', 'A')
+            g.add('C', 'B')
+            return g
+
+        lock = threading.Lock()
+        calls = []
+        def f(node):
+            with lock:
+                calls.append(node)
+            return node.lower()
+
+        g = make_graph()
+        result = g.run(f, max_workers=1)
+        self.assertEqual(calls, ['A', 'X', 'Y', 'B', 'C'])
+        self.assertEqual(result.results, {'A': 'a', 'B': 'b', 'C': 'c', 'X': 'x', 'Y': 'y'})
+        self.assertEqual(set(result.timings), set('ABCXY'))
+        self.assertTrue(all(t >= 0 for t in result.timings.values()))
+        self.assertGreaterEqual(result.makespan, 0)
+        self.assertIn("5 nodes", repr(result))
+        # run uses its own view
+        self.assertEqual(len(g.views), 2)
+        self.assertEqual(g.ready(), ('A', 'X', 'Y'))
+
+        calls.clear()
+        g.run(f, max_workers=1, critical_path=True, costs={'C': 10})
+        self.assertEqual(calls, ['A', 'B', 'C', 'X', 'Y'])
+
+        # dependencies are respected with lots of workers, too
+        with concurrent.futures.ThreadPoolExecutor(4) as executor:
+            calls.clear()
+            result = g.run(f, executor=executor, critical_path=True)
+            self.assertLess(calls.index('A'), calls.index('B'))
+            self.assertLess(calls.index('B'), calls.index('C'))
+            self.assertEqual(len(result.results), 5)
+
+        # View.run runs the nodes remaining in that view
+        v = g.view()
+        v.done(*v.ready())
+        calls.clear()
+        result = v.run(f)
+        self.assertEqual(calls, ['B', 'C'])
+        self.assertFalse(v)
+
+        def fail(node):
+            if node == 'B':
+                raise KeyError(node)
+            return node
+        with self.assertRaises(KeyError):
+            g.run(fail, max_workers=2)
+        self.assertEqual(len(g.views), 3)
+
+        with self.assertRaises(ValueError):
+            g.run(f, max_workers=0)
+        g.add('A', 'C')
+        with self.assertRaises(big.graph.CycleError):
+            g.run(f)
+        v.close()
+        with self.assertRaises(ValueError):
+            v.run(f)
+
+    def test_run_async(self):
+        import asyncio
+
+        g = TopologicalSorter()
+        g.add('A')
+        g.add('X')
+        g.add('B', 'A')
+        g.add('C', 'B')
+        calls = []
+
+        async def f(node):
+            calls.append(node)
+            await asyncio.sleep(0)
+            return node.lower()
+
+        def sync_f(node):
+            calls.append(node)
+            return node.lower()
+
+        loop = asyncio.new_event_loop()
+        try:
+            result = loop.run_until_complete(g.run_async(f, max_workers=1))
+            self.assertEqual(calls, ['A', 'X', 'B', 'C'])
+            self.assertEqual(result.results, {'A': 'a', 'B': 'b', 'C': 'c', 'X': 'x'})
+            self.assertEqual(set(result.timings), set('ABCX'))
+
+            calls.clear()
+            result = loop.run_until_complete(g.run_async(sync_f, max_workers=1, critical_path=True, costs={'C': 10}))
+            self.assertEqual(calls, ['A', 'B', 'C', 'X'])
+            self.assertEqual(len(g.views), 2)
+
+            calls.clear()
+            result = loop.run_until_complete(g.run_async(f))
+            self.assertEqual(sorted(calls), ['A', 'B', 'C', 'X'])
+
+            async def fail(node):
+                if node == 'A':
+                    await asyncio.sleep(0)
+                    raise KeyError(node)
+                await asyncio.sleep(10)
+            with self.assertRaises(KeyError):
+                loop.run_until_complete(g.run_async(fail))
+            self.assertEqual(len(g.views), 2)
+
+            with self.assertRaises(ValueError):
+                loop.run_until_complete(g.run_async(f, max_workers=0))
+        finally:
+            loop.close()
+
     def test_close(self):
         g = TopologicalSorter()
         v = g.view()
@@ -148,6 +148,22 @@ class BigTests(unittest.TestCase):
         self.assertEqual(h[:], sorted_values)
         self.assertEqual(h[:], h.queue)
 
+    def test_remove(self):
+        import random
+        r = random.Random(31337)
+        for _ in range(200):
+            values = [r.randrange(50) for _ in range(r.randrange(1, 40))]
+            h = big.Heap(values)
+            while values:
+                value = r.choice(values)
+                values.remove(value)
+                h.remove(value)
+                self.assertEqual(h.queue, sorted(values))
+                # the heap invariant still holds
+                self.assertEqual(list(h), sorted(values))
+            with self.assertRaises(ValueError):
+                h.remove(5)
+
     def test_reprs(self):
         h = big.Heap(original_values)
         self.assertEqual(repr(h)[:6], '<Heap ')
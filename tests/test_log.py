@@ -274,6 +274,160 @@ class TestFile(unittest.TestCase):
 
 
 
+class TestBinaryFile(unittest.TestCase):
+    """Tests for the BinaryFile destination and read_binary_log."""
+
+    def test_round_trip(self):
+        with tempfile.TemporaryDirectory() as tmpdir:
+            path = os.path.join(tmpdir, "log.bin")
+            sink = big.Log.Sink()
+            log = big.Log(sink, big.Log.BinaryFile(path), threading=False, formats={"warning": {"template": "!! {message}"}})
+            log("hello")
+            log.write("raw text\n")
+            with log.enter("subsystem"):
+                log.warning("caf\xe9")
+            log.close()
+            log.reset()
+            log("again")
+            log.close()
+
+            events = list(big.read_binary_log(path))
+            self.assertEqual(len(events), len(sink.events))
+            for binary, expected in zip(events, sink.events):
+                self.assertEqual(type(binary), type(expected))
+                for name in ("number", "depth", "elapsed", "duration", "ns", "epoch", "format", "message"):
+                    self.assertEqual(getattr(binary, name), getattr(expected, name), name)
+                if expected.type == 'write':
+                    self.assertEqual(binary.formatted, expected.formatted)
+                if expected.thread is None:
+                    self.assertIsNone(binary.thread)
+                else:
+                    self.assertEqual(binary.thread.name, expected.thread.name)
+                    self.assertEqual(binary.thread.ident, expected.thread.ident)
+            self.assertEqual([e.number for e in events if e.type == 'start'], [1, 2])
+
+            lines = []
+            big.print_binary_log(path, print=lines.append)
+            self.assertTrue(lines[0].endswith("   start] "))
+            self.assertTrue(lines[1].endswith("MainThread    print] hello"))
+            self.assertTrue(lines[2].endswith("MainThread         ] raw text"))
+            self.assertIn("MainThread  warning]     caf\xe9", lines[4])
+            self.assertTrue(lines[-1].endswith("     end] "))
+
+    def test_no_formatting(self):
+        # with only BinaryFile destinations, the log never formats messages.
+        with tempfile.TemporaryDirectory() as tmpdir:
+            path = os.path.join(tmpdir, "log.bin")
+            log = big.Log(big.Log.BinaryFile(path), threading=False, formats={"start": None, "end": None})
+            formatted = []
+            format_message = log._format_message
+            def record(elapsed, thread, format, message):
+                formatted.append(format)
+                return format_message(elapsed, thread, format, message)
+            log._format_message = record
+            log("hello")
+            log.close()
+            self.assertNotIn('print', formatted)
+            self.assertEqual([(e.format, e.message) for e in big.read_binary_log(path) if e.type == 'log'], [('print', 'hello')])
+
+            # but with any other destination, it does.
+            sink = big.Log.Sink()
+            log = big.Log(big.Log.BinaryFile(path), sink, threading=False, prefix='', formats={"start": None, "end": None})
+            log("hello")
+            log.close()
+            self.assertEqual([e.formatted for e in sink if e.type == 'log'], ["hello\n"])
+
+    def test_truncated_file(self):
+        with tempfile.TemporaryDirectory() as tmpdir:
+            path = os.path.join(tmpdir, "log.bin")
+            log = big.Log(big.Log.BinaryFile(path), threading=False)
+            log("one")
+            log("two")
+            log.close()
+
+            with open(path, "rb") as f:
+                data = f.read()
+            complete = list(big.read_binary_log(path))
+            with open(path, "wb") as f:
+                f.write(data[:-3])
+            truncated = list(big.read_binary_log(path))
+            self.assertEqual(truncated, complete[:-1])
+
+            with open(path, "wb") as f:
+                f.write(b"not a log")
+            with self.assertRaises(ValueError):
+                list(big.read_binary_log(path))
+
+
+class TestRotatingFile(unittest.TestCase):
+    """Tests for the RotatingFile destination."""
+
+    def read(self, path):
+        with open(path, 'rt') as f:
+            return f.read()
+
+    def test_invalid_arguments(self):
+        with self.assertRaises(ValueError):
+            big.Log.RotatingFile('x', max_bytes=0)
+        with self.assertRaises(ValueError):
+            big.Log.RotatingFile('x', interval=0)
+        with self.assertRaises(ValueError):
+            big.Log.RotatingFile('x', backups=-1)
+
+    def test_rotate_by_size(self):
+        with tempfile.TemporaryDirectory() as tmpdir:
+            path = os.path.join(tmpdir, "log.txt")
+            with open(path, "wt") as f:
+                f.write("old\n")
+            log = big.Log(big.Log.RotatingFile(path, max_bytes=10, backups=2), threading=False, formats={"start": None, "end": None}, prefix='')
+            for s in ("aaaa", "bbbb", "cccc", "dddd", "eeee"):
+                log(s)
+            # nothing is written until the log is flushed
+            self.assertEqual(self.read(path), "")
+            log.close()
+
+            self.assertEqual(sorted(os.listdir(tmpdir)), ["log.txt", "log.txt.1", "log.txt.2"])
+            self.assertEqual(self.read(path), "dddd\neeee\n")
+            self.assertEqual(self.read(path + ".1"), "bbbb\ncccc\n")
+            self.assertEqual(self.read(path + ".2"), "old\naaaa\n")
+
+            # a message bigger than max_bytes still gets written
+            log.reset()
+            log("x" * 20)
+            log.close()
+            self.assertEqual(self.read(path), "x" * 20 + "\n")
+            self.assertEqual(self.read(path + ".1"), "dddd\neeee\n")
+            self.assertEqual(self.read(path + ".2"), "bbbb\ncccc\n")
+
+    def test_rotate_by_time_with_no_backups(self):
+        with tempfile.TemporaryDirectory() as tmpdir:
+            path = os.path.join(tmpdir, "log.txt")
+            log = big.Log(big.Log.RotatingFile(path, interval=0.01, backups=0), threading=False, formats={"start": None, "end": None}, prefix='')
+            log("first")
+            time.sleep(0.02)
+            log("second")
+            log.close()
+            self.assertEqual(os.listdir(tmpdir), ["log.txt"])
+            self.assertEqual(self.read(path), "second\n")
+
+    def test_compress(self):
+        import gzip
+
+        with tempfile.TemporaryDirectory() as tmpdir:
+            path = os.path.join(tmpdir, "log.txt")
+            log = big.Log(big.Log.RotatingFile(path, max_bytes=6, backups=2, compress=True), threading=True, formats={"start": None, "end": None}, prefix='')
+            for s in ("aaaa", "bbbb", "cccc", "dddd"):
+                log(s)
+            log.close()
+
+            self.assertEqual(sorted(os.listdir(tmpdir)), ["log.txt", "log.txt.1.gz", "log.txt.2.gz"])
+            self.assertEqual(self.read(path), "dddd\n")
+            with gzip.open(path + ".1.gz", "rt") as f:
+                self.assertEqual(f.read(), "cccc\n")
+            with gzip.open(path + ".2.gz", "rt") as f:
+                self.assertEqual(f.read(), "bbbb\n")
+
+
 class TestFileHandle(unittest.TestCase):
     """Tests for the FileHandle destination."""
 
@@ -299,6 +453,75 @@ class TestFileHandle(unittest.TestCase):
         fh_destination.flush()  # Should not raise
 
 
+class TestBatching(unittest.TestCase):
+    """Tests for batched dispatch to destinations."""
+
+    class CountingStringIO(io.StringIO):
+        def __init__(self):
+            super().__init__()
+            self.writes = 0
+
+        def write(self, s):
+            self.writes += 1
+            return super().write(s)
+
+    def test_threaded_batch_is_one_write(self):
+        buffer = self.CountingStringIO()
+        log = big.Log(big.Log.FileHandle(buffer), threading=True, formats={"start": None, "end": None}, prefix='')
+        log("first")
+        log.flush()
+        self.assertEqual(buffer.getvalue(), "first\n")
+
+        # stall the worker thread, so the next messages pile up in the queue
+        blocker = threading.Lock()
+        blocker.acquire()
+        log._dispatch([(blocker.acquire, ())])
+        for i in range(10):
+            log(i)
+        self.assertFalse(log._queue.empty())
+        writes = buffer.writes
+        blocker.release()
+        log.flush()
+        self.assertTrue(log._queue.empty())
+        self.assertEqual(buffer.getvalue(), "first\n" + "".join(f"{i}\n" for i in range(10)))
+        self.assertEqual(buffer.writes, writes + 1)
+        log.close()
+
+    def test_unthreaded_batch_per_call(self):
+        for flush in (False, True):
+            buffer = self.CountingStringIO()
+            log = big.Log(big.Log.FileHandle(buffer, flush=flush), threading=False, formats={"start": None, "end": None}, prefix='')
+            log("a")
+            self.assertEqual(buffer.getvalue(), "a\n")
+            log.box("b")
+            self.assertEqual(buffer.writes, 2)
+            log.close()
+
+    def test_file_flush_mode_batches(self):
+        with tempfile.TemporaryDirectory() as tmpdir:
+            path = os.path.join(tmpdir, "log.txt")
+            log = big.Log(big.Log.File(path, "wt", flush=True), threading=False, formats={"start": None, "end": None}, prefix='')
+            log("a")
+            with open(path, "rt") as f:
+                self.assertEqual(f.read(), "a\n")
+            log("b")
+            log.close()
+            with open(path, "rt") as f:
+                self.assertEqual(f.read(), "a\nb\n")
+
+    def test_print_batches(self):
+        captured = []
+        original_print = builtins.print
+        builtins.print = lambda *args, **kwargs: captured.append((args, kwargs))
+        try:
+            log = big.Log(big.Log.Print(), threading=False, formats={"start": None, "end": None}, prefix='')
+            log("a\nb")
+            log.close()
+        finally:
+            builtins.print = original_print
+        self.assertEqual(captured, [(("a\nb\n",), {"end": "", "flush": True})])
+
+
 class TestLogBasics(unittest.TestCase):
     """Basic tests for the Log class."""
 
@@ -895,6 +1118,134 @@ class TestLogThreading(unittest.TestCase):
         log.flush()
 
 
+class TestLogQueueSize(unittest.TestCase):
+    """Tests for the bounded queue in threaded mode."""
+
+    def stuck_log(self, overflow, prefix=''):
+        # returns a log whose worker thread is stuck writing "first",
+        # the output list, and the Event that unsticks it.
+        output = []
+        writing = threading.Event()
+        gate = threading.Event()
+        def slow(s):
+            writing.set()
+            gate.wait()
+            output.append(s)
+        log = big.Log(slow, prefix=prefix, formats={"start": None, "end": None}, queue_size=3, overflow=overflow)
+        log("first")
+        writing.wait()
+        return log, output, gate
+
+    def test_drop_newest(self):
+        log, output, gate = self.stuck_log('drop-newest')
+        for i in range(10):
+            log(i)
+        self.assertEqual(log.queue_depth, 3)
+        self.assertEqual(log.dropped, 7)
+        # enter and exit are never dropped
+        with log.enter("sub"):
+            pass
+        self.assertEqual(log.queue_depth, 5)
+        gate.set()
+        log.close()
+        self.assertEqual(output[:4], ["first\n", "0\n", "1\n", "2\n"])
+        self.assertEqual(log.nesting, ())
+
+    def test_drop_oldest(self):
+        log, output, gate = self.stuck_log('drop-oldest')
+        for i in range(10):
+            log(i)
+        self.assertEqual(log.queue_depth, 3)
+        self.assertEqual(log.dropped, 7)
+        gate.set()
+        log.close()
+        self.assertEqual(output, ["first\n", "7\n", "8\n", "9\n"])
+
+    def test_block(self):
+        log, output, gate = self.stuck_log('block')
+        timer = threading.Timer(0.05, gate.set)
+        timer.start()
+        for i in range(10):
+            log(i)
+        self.assertGreater(log.blocked, 0)
+        self.assertEqual(log.dropped, 0)
+        log.close()
+        timer.join()
+        self.assertEqual(output, ["first\n"] + [f"{i}\n" for i in range(10)])
+
+    def test_block_never_blocks_control_work(self):
+        # regression test: with the queue full, flush waited for room
+        # while holding the log's lock--which the worker needed to
+        # close the log.  so they deadlocked.  now only messages wait.
+        log, output, gate = self.stuck_log('block')
+        for i in range(3):
+            log(i)
+        def close_and_flush():
+            log.close(block=False)
+            log.flush()
+        thread = threading.Thread(target=close_and_flush, daemon=True)
+        thread.start()
+        # close and flush are queued even though the queue is full.
+        deadline = time.monotonic() + 5
+        while (log.queue_depth < 5) and (time.monotonic() < deadline):
+            time.sleep(0.001)
+        self.assertEqual(log.queue_depth, 5)
+        self.assertEqual(log.blocked, 0)
+        gate.set()
+        thread.join(timeout=5)
+        self.assertFalse(thread.is_alive())
+        self.assertEqual(output, ["first\n", "0\n", "1\n", "2\n"])
+
+    def test_spill(self):
+        def log_stuff(log):
+            def in_thread():
+                for i in range(3):
+                    log("thread", i)
+            for i in range(5):
+                log(i)
+            with log.enter("sub"):
+                thread = threading.Thread(target=in_thread, name="other")
+                thread.start()
+                thread.join()
+                log.write("written\n")
+                log.print("a", "b", sep='-', end='!')
+            log("done")
+
+        prefix = '{thread.name} '
+        expected = []
+        log = big.Log(expected.append, prefix=prefix, formats={"start": None, "end": None})
+        expected.append("first\n")
+        log_stuff(log)
+        log.close()
+        expected = [s.replace("first\n", "MainThread first\n") for s in expected]
+
+        log, output, gate = self.stuck_log('spill', prefix=prefix)
+        log_stuff(log)
+        self.assertEqual(log.dropped, 0)
+        self.assertEqual(log.blocked, 0)
+        self.assertGreater(log.spilled, 0)
+        gate.set()
+        log.flush()
+        self.assertEqual(log.spilled, 8)
+        # once it's read everything back, it empties the file.
+        self.assertEqual(os.fstat(log._queue.spill_file.fileno()).st_size, 0)
+        log.close()
+        self.assertEqual(output, expected)
+        self.assertEqual(log.spilled, 8)
+
+    def test_invalid(self):
+        with self.assertRaises(ValueError):
+            big.Log([], queue_size=0)
+        with self.assertRaises(ValueError):
+            big.Log([], queue_size=3, overflow='discard')
+
+        log = big.Log([], threading=False, queue_size=3)
+        self.assertEqual(log.queue_size, 3)
+        self.assertEqual(log.overflow, 'block')
+        self.assertEqual(log.queue_depth, 0)
+        self.assertEqual(log.dropped, 0)
+
+
 class TestLogFormatting(unittest.TestCase):
     """Tests for Log formatting options."""
 
@@ -967,6 +1318,68 @@ class TestLogFormatting(unittest.TestCase):
         expected = 'START\n[PREFIX] z\n'
         self.assertEqual(s.getvalue(), expected)
 
+    def test_format_fields(self):
+        self.assertEqual(log_module._format_fields('[{elapsed:08.3f} {thread.name}] {message}'), frozenset(('elapsed', 'thread', 'message')))
+        self.assertEqual(log_module._format_fields('{{not a field}} {x[0]:{width}}'), frozenset(('x', 'width')))
+        self.assertEqual(log_module._format_fields('plain'), frozenset())
+        self.assertIsNone(log_module._format_fields('{} {0}'))
+        self.assertIsNone(log_module._format_fields('{x:{}}'))
+        self.assertIsNone(log_module._format_fields('{oops'))
+
+    def test_unused_substitutions_are_skipped(self):
+        calls = []
+        def timestamp_format(t):
+            calls.append(t)
+            return "TIMESTAMP"
+
+        array = []
+        log = big.Log(array, threading=False, formats={"start": None, "end": None}, prefix='', timestamp_format=timestamp_format)
+        log("no timestamp here")
+        self.assertEqual(calls, [])
+        log = big.Log(array, threading=False, formats={"start": None, "end": None, "stamped": {"template": "{timestamp} {message}"}}, prefix='', timestamp_format=timestamp_format)
+        log.stamped("hello")
+        self.assertEqual(len(calls), 1)
+        self.assertEqual(array[-1], "TIMESTAMP hello\n")
+
+        # formats that format_map can't handle still raise the same errors
+        log = big.Log(array, threading=False, formats={"start": None, "end": None}, prefix='{bogus}')
+        with self.assertRaises(KeyError):
+            log("x")
+        log = big.Log(array, threading=False, formats={"start": None, "end": None}, prefix='{0}')
+        with self.assertRaises(ValueError):
+            log("x")
+
+    def test_cached_timestamps(self):
+        import random
+        log = big.Log(None, threading=False)
+        r = random.Random(8675309)
+        for i in range(2000):
+            t = 1_700_000_000 + (r.random() * 100_000)
+            if i % 2:
+                # near the rounding boundary at the end of a second
+                t = int(t) + 0.9999995 + (r.random() * 0.000001)
+            self.assertEqual(log._timestamp(t), big.timestamp_human(t))
+        self.assertEqual(log._timestamp(1_700_000_000), big.timestamp_human(1_700_000_000))
+
+        array = []
+        log = big.Log(array, threading=False, formats={"start": {"template": "{timestamp}"}, "end": None}, prefix='')
+        log("x")
+        log.close()
+        self.assertEqual(array[0], big.timestamp_human(log.start_time_epoch) + "\n")
+
+    def test_str_of_mutable_args_is_not_deferred(self):
+        array = []
+        log = big.Log(array, threading=True, formats={"start": None, "end": None}, prefix='')
+        blocker = threading.Lock()
+        blocker.acquire()
+        log._dispatch([(blocker.acquire, ())])
+        l = [1, 2]
+        log(l, 3, 4.5, None, "six")
+        l.append(99)
+        blocker.release()
+        log.close()
+        self.assertEqual(array, ["[1, 2] 3 4.5 None six\n"])
+
     def test_system_formats_are_disallowed(self):
         log = big.Log(None, threading=False)
 
@@ -982,6 +1395,99 @@ class TestLogFormatting(unittest.TestCase):
 
 
 
+class TestLogRateLimiting(unittest.TestCase):
+    """Tests for sampled and rate-limited formats."""
+
+    def test_sample(self):
+        output = []
+        log = big.Log(output, threading=False, prefix='', formats={"start": None, "end": None, "print": {"sample": 3}})
+        for i in range(8):
+            log(i)
+        log.close()
+        self.assertEqual(output, [
+            "0\n",
+            "[suppressed 2 'print' messages]\n",
+            "3\n",
+            "[suppressed 2 'print' messages]\n",
+            "6\n",
+            "[suppressed 1 'print' message]\n",
+            ])
+        self.assertEqual(log.suppressed, {'print': 5})
+
+    def test_rate(self):
+        now = [0]
+        def clock():
+            return now[0]
+        output = []
+        log = big.Log(output, threading=False, prefix='', clock=clock,
+            formats={"start": None, "end": None, "noisy": {"template": "{message}", "rate": 2, "burst": 2}})
+        # the burst gets through, then the bucket is empty
+        for i in range(4):
+            log.noisy(f"a{i}")
+        # half a second refills one token
+        now[0] += 500_000_000
+        log.noisy("b")
+        log.noisy("c")
+        log.flush()
+        self.assertEqual(output, ["a0\n", "a1\n", "[suppressed 2 'noisy' messages]\n", "b\n", "[suppressed 1 'noisy' message]\n"])
+        self.assertEqual(log.suppressed, {'noisy': 3})
+        log.close()
+
+    def test_dropped_message_still_flushes(self):
+        # "b" is sampled out, but its flush=True still flushes the log,
+        # on top of the flush when the log closes.
+        for flush, flushes in ((False, 1), (True, 2)):
+            esink = EventSink()
+            log = big.Log(esink, threading=False, formats={"print": {"sample": 2}})
+            log("a")
+            log("b", flush=flush)
+            log.close()
+            self.assertEqual(esink.value.count("flush"), flushes)
+            self.assertEqual(log.suppressed, {'print': 1})
+
+    def test_dropped_message_is_still_validated(self):
+        # every message after the first would be sampled out,
+        # but bad arguments must raise anyway.
+        log = big.Log([], threading=False, formats={"print": {"sample": 100}, "noisy": {"template": "{message}", "sample": 100}})
+        log("a")
+        log.noisy("a")
+        with self.assertRaises(TypeError):
+            log("b", sep=3)
+        with self.assertRaises(TypeError):
+            log("b", end=b'\n')
+        with self.assertRaises(ValueError):
+            log("b", format='undefined')
+        with self.assertRaises(ValueError):
+            log("b", format='enter')
+        with self.assertRaises(TypeError):
+            log.noisy(3)
+        log.close()
+        # the bad calls didn't count against the limits.
+        self.assertEqual(log.suppressed, {'print': 0, 'noisy': 0})
+
+    def test_threaded(self):
+        output = []
+        log = big.Log(output, prefix='', formats={"start": None, "end": None, "print": {"sample": 10}})
+        for i in range(100):
+            log(i)
+        log.close()
+        self.assertEqual(output[0], "0\n")
+        self.assertEqual(output.count("[suppressed 9 'print' messages]\n"), 10)
+        self.assertEqual(log.suppressed, {'print': 90})
+
+    def test_invalid(self):
+        for formats in (
+            {"print": {"sample": 0}},
+            {"print": {"sample": 1.5}},
+            {"print": {"rate": 0}},
+            {"print": {"rate": 1, "burst": 0}},
+            {"start": {"sample": 2}},
+            {"enter": {"rate": 2}},
+            ):
+            with self.assertRaises(ValueError):
+                big.Log([], formats=formats)
+
+
 class TestSink(unittest.TestCase):
     """Tests for Sink."""
 
@@ -1146,6 +1652,229 @@ class TestSink(unittest.TestCase):
 
 
 
+class TestRingSink(unittest.TestCase):
+    """Tests for RingSink."""
+
+    def test_matches_sink(self):
+        sink = big.Log.Sink()
+        ring = big.Log.RingSink(100)
+        log = big.Log(sink, ring, threading=False)
+        log("hello")
+        log.write("raw text\n")
+        with log.enter("subsystem"):
+            log("inside")
+        log.close()
+        log.reset()
+        log("again")
+        log.close()
+
+        self.assertEqual(len(ring), len(sink.events))
+        self.assertEqual(ring.events, sink.events)
+        for r, s in zip(ring, sink):
+            self.assertEqual(type(r), type(s))
+            for name in ("duration", "format", "formatted", "configuration"):
+                self.assertEqual(getattr(r, name), getattr(s, name), name)
+
+        output = []
+        ring.print(print=output.append)
+        expected = []
+        sink.print(print=expected.append)
+        self.assertEqual(len(output), len(expected))
+
+    def test_capacity(self):
+        sink = big.Log.Sink()
+        ring = big.Log.RingSink(3)
+        log = big.Log(sink, ring, threading=False, formats={"start": None, "end": None}, prefix='')
+        for i in range(10):
+            log(f"message {i}")
+        self.assertEqual(len(ring), 3)
+        self.assertEqual([e.message for e in ring], ["message 7", "message 8", "message 9"])
+        self.assertEqual(ring.events, sink.events[-3:])
+        log.close()
+        self.assertEqual([e.type for e in ring], ['log', 'log', 'end'])
+
+        with self.assertRaises(ValueError):
+            big.Log.RingSink(0)
+
+    def test_max_bytes(self):
+        ring = big.Log.RingSink(1000, max_bytes=1000)
+        log = big.Log(ring, threading=False, formats={"start": None, "end": None}, prefix='')
+        for i in range(100):
+            log(f"message {i}")
+        events = ring.events
+        self.assertLess(len(events), 100)
+        self.assertEqual(events[-1].message, "message 99")
+        self.assertLessEqual(ring._bytes, 1000)
+
+        # always retains the most recent event
+        log("x" * 2000)
+        self.assertEqual(len(ring), 1)
+        self.assertEqual(ring.events[0].message, "x" * 2000)
+
+    def test_dump(self):
+        output = []
+        ring = big.Log.RingSink(2, dump_destination=output)
+        log = big.Log(ring, threading=False, formats={"start": None, "end": None}, prefix='')
+        log("one")
+        log("two")
+        log("three")
+
+        dumped = []
+        ring.dump(dumped)
+        self.assertEqual(dumped, ["two\nthree\n"])
+
+        log.close()
+        # the end event pushed "two" out of the ring
+        self.assertEqual(output, ["three\n"])
+
+
+def _log_aggregator_child(proxy, n):
+    for i in range(3):
+        proxy(f"child {n} message {i}")
+    proxy.box("boxed")
+
+def _log_aggregator_late_child(proxy):
+    # far more than fits in a pipe.  if these went into the
+    # queue, nobody would read them, and this process would
+    # hang at exit waiting for the queue's feeder thread.
+    for i in range(1000):
+        proxy("x" * 1000)
+
+
+class TestLogAggregator(unittest.TestCase):
+    """Tests for LogAggregator and LogProxy."""
+
+    def test_in_process(self):
+        sink = big.Log.Sink()
+        log = big.Log(sink, threading=False, formats={"start": None, "end": None})
+        with big.LogAggregator(log) as aggregator:
+            proxy = aggregator.proxy()
+            proxy("hello", 3, sep=", ")
+            proxy.write("raw text\n")
+            with proxy.enter("subsystem"):
+                proxy.box("boxed")
+            proxy.flush()
+            with self.assertRaises(ValueError):
+                proxy("x", format="start")
+            with self.assertRaises(AttributeError):
+                proxy.not_a_format
+            proxy.close()
+            proxy("ignored")
+        log.close()
+
+        events = [e for e in sink if e.type in ('log', 'write', 'enter', 'exit')]
+        self.assertEqual([(e.type, e.format) for e in events], [
+            ('log', 'print'),
+            ('write', None),
+            ('log', 'enter'),
+            ('enter', 'enter'),
+            ('log', 'box'),
+            ('exit', 'exit'),
+            ('log', 'exit'),
+            ])
+        self.assertEqual(events[0].message, "hello, 3")
+        self.assertEqual(events[1].formatted, "raw text\n")
+        self.assertEqual(events[4].depth, 1)
+
+        thread = events[0].thread
+        self.assertEqual(thread.pid, os.getpid())
+        self.assertEqual(thread.ident, threading.current_thread().ident)
+        self.assertEqual(thread.name, f"{os.getpid()}:{threading.current_thread().name}")
+
+        elapsed = [e.elapsed for e in events]
+        self.assertEqual(elapsed, sorted(elapsed))
+
+    def test_sample(self):
+        # messages from proxies obey the log's sampling and rate limits.
+        output = []
+        log = big.Log(output, threading=False, prefix='', formats={"start": None, "end": None, "noisy": {"template": "{message}", "sample": 10}})
+        with big.LogAggregator(log) as aggregator:
+            proxy = aggregator.proxy()
+            for i in range(25):
+                proxy.noisy(str(i))
+        log.close()
+        self.assertEqual(output, [
+            "0\n",
+            "[suppressed 9 'noisy' messages]\n",
+            "10\n",
+            "[suppressed 9 'noisy' messages]\n",
+            "20\n",
+            "[suppressed 4 'noisy' messages]\n",
+            ])
+        self.assertEqual(log.suppressed, {'noisy': 22})
+
+    def test_flush(self):
+        # flush=True flushes the log after the message,
+        # on top of the flush when the log closes.
+        for flush, flushes in ((False, 1), (True, 2)):
+            esink = EventSink()
+            log = big.Log(esink, threading=False)
+            with big.LogAggregator(log) as aggregator:
+                proxy = aggregator.proxy()
+                proxy("x", flush=flush)
+                proxy.print("y")
+            log.close()
+            self.assertEqual(esink.value.count("flush"), flushes)
+
+    def test_after_close(self):
+        sink = big.Log.Sink()
+        log = big.Log(sink, threading=False, formats={"start": None, "end": None})
+        aggregator = big.LogAggregator(log)
+        proxy = aggregator.proxy()
+        proxy("before")
+        aggregator.close()
+        proxy("after")
+        proxy.flush()
+        log.close()
+        self.assertEqual([e.message for e in sink if e.type == 'log'], ["before"])
+
+    def test_child_logging_after_close(self):
+        import multiprocessing
+        if 'fork' not in multiprocessing.get_all_start_methods():
+            self.skipTest("requires the fork start method")
+        context = multiprocessing.get_context('fork')
+
+        log = big.Log([], formats={"start": None, "end": None})
+        aggregator = big.LogAggregator(log, context=context)
+        proxy = aggregator.proxy()
+        aggregator.close()
+        process = context.Process(target=_log_aggregator_late_child, args=(proxy,))
+        process.start()
+        process.join(30)
+        alive = process.is_alive()
+        if alive:
+            process.kill()
+            process.join()
+        log.close()
+        self.assertFalse(alive)
+        self.assertEqual(process.exitcode, 0)
+
+    def test_child_processes(self):
+        import multiprocessing
+        if 'fork' not in multiprocessing.get_all_start_methods():
+            self.skipTest("requires the fork start method")
+        context = multiprocessing.get_context('fork')
+
+        sink = big.Log.Sink()
+        log = big.Log(sink, formats={"start": None, "end": None})
+        log("parent")
+        with big.LogAggregator(log, context=context) as aggregator:
+            processes = [context.Process(target=_log_aggregator_child, args=(aggregator.proxy(), n)) for n in range(3)]
+            for process in processes:
+                process.start()
+            for process in processes:
+                process.join()
+        log.close()
+
+        messages = [e.message for e in sink if e.type == 'log']
+        self.assertEqual(messages[0], "parent")
+        self.assertEqual(len(messages), 13)
+        for n in range(3):
+            self.assertEqual([m for m in messages if m.startswith(f"child {n} ")], [f"child {n} message {i}" for i in range(3)])
+        pids = {e.thread.pid for e in sink if (e.type == 'log') and (e.message != "parent")}
+        self.assertEqual(pids, {p.pid for p in processes})
+
+
 class TestEventSink(unittest.TestCase):
     """Tests for our custom EventSink."""
 
@@ -337,6 +337,90 @@ class ScheduleTester(ScheduleTesterBase):
 
             mtt.assert_ready(0, '')
 
+    def test_cancel_many(self):
+        s = big.Scheduler()
+        events = [s.schedule(i, i) for i in range(100)]
+        s2 = big.Scheduler()
+        with self.assertRaises(ValueError):
+            s2.cancel(events[0])
+
+        for e in events[:40]:
+            e.cancel()
+        with self.assertRaises(ValueError):
+            events[0].cancel()
+        # canceled events linger in the heap until they're compacted away
+        self.assertEqual(len(s.heap), 100)
+        self.assertEqual([e.event for e in s.queue], list(range(40, 100)))
+        for e in events[40:60]:
+            s.cancel(e)
+        self.assertLess(len(s.heap), 100)
+        self.assertEqual([e.event for e in s.queue], list(range(60, 100)))
+
+        # canceled events at the front of the heap are skipped
+        events = events[60:]
+        for e in events[:10] + events[20:]:
+            e.cancel()
+        self.assertTrue(s)
+        self.assertEqual(list(s.non_blocking()), [])
+        e = s.schedule('now', 0, absolute=True)
+        self.assertEqual(list(s.non_blocking()), ['now'])
+        with self.assertRaises(ValueError):
+            e.cancel()
+        for e in events[10:20]:
+            e.cancel()
+        self.assertFalse(s)
+        self.assertEqual(s.queue, [])
+        self.assertEqual(list(s), [])
+
+    def test_async_iteration(self):
+        import asyncio
+
+        async def test():
+            s = big.Scheduler(big.AsyncioRegulator())
+            s.schedule(0.02, 0.02)
+            s.schedule(0, 0)
+            s.schedule(0.01, 0.01)
+            events = []
+            async for event in s:
+                events.append(event)
+            self.assertEqual(events, [0, 0.01, 0.02])
+
+            # scheduling an earlier event wakes the sleeping iterator
+            s.schedule('late', 10)
+            async def add_and_cancel():
+                await asyncio.sleep(0.01)
+                s.schedule('early', 0.01)
+                await asyncio.sleep(0.05)
+                s.cancel(late)
+            late = s.queue[0]
+            task = asyncio.ensure_future(add_and_cancel())
+            start = time.monotonic()
+            events = [event async for event in s]
+            self.assertEqual(events, ['early'])
+            self.assertLess(time.monotonic() - start, 1)
+            await task
+
+            # lots of schedulers sharing one event loop, and one thread
+            schedulers = [big.Scheduler(big.AsyncioRegulator()) for _ in range(100)]
+            for i, s in enumerate(schedulers):
+                s.schedule(i, (i % 5) / 200)
+            async def drain(s):
+                return [event async for event in s]
+            results = await asyncio.gather(*(drain(s) for s in schedulers))
+            self.assertEqual(results, [[i] for i in range(100)])
+
+            with self.assertRaises(TypeError):
+                s = big.Scheduler()
+                s.schedule(0, 1)
+                async for event in s:
+                    pass # pragma: no cover
+
+        loop = asyncio.new_event_loop()
+        try:
+            loop.run_until_complete(test())
+        finally:
+            loop.close()
+
     def test_four_threads_sleeping(self):
         # demonstrates that you can have multiple
         # threads all consuming events.
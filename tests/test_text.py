@@ -66,6 +66,11 @@ try:
 except ImportError: # pragma: no cover
     have_regex = False
 
+try:
+    import numpy
+except ImportError: # pragma: no cover
+    numpy = None
+
 
 _sentinel = object()
 
@@ -677,6 +682,104 @@ class BigTextTests(unittest.TestCase):
             # it never truncated
             test(r'cdefghijk|bcd|fgh|jkl', 'abcdefghijklmnopqrstuvwxyz', ('jkl', 'fgh', 'bcd'))
 
+            # regression test: the general algorithm only re-matched
+            # inside the last forward match, so it missed the longer
+            # "bb" starting inside the forward match "cab".
+            test(r'[ab]b|b|b|cab', 'cabb', ('bb',))
+            test(r'[ab]b|b|b|cab', 'abcabb', ('bb', 'ab'))
+
+    def test_reversed_re_finditer_bounded(self):
+        import big.text as big_text
+
+        width = big_text._reversed_re_finditer_width
+        self.assertEqual(width(re.compile('abc')), 3)
+        self.assertEqual(width(re.compile('a{2,7}|xyz')), 7)
+        self.assertEqual(width(re.compile(b'(?<=x)ab')), 2)
+        self.assertEqual(width(re.compile('^ab')), 2)
+        # unbounded, can match the empty string,
+        # or looks to the right of the match.
+        for pattern in ('a+', 'a*', 'a?', 'a$', r'a\Z', r'a\b', r'a\B', '(?=b)a', '(?!b)a', 'a{1,5000}'):
+            self.assertIsNone(width(re.compile(pattern)), pattern)
+
+        def brute_force(pattern, string):
+            # of the matches ending at or before limit,
+            # the rightmost-ending, then the longest.
+            result = []
+            limit = len(string)
+            while limit > 0:
+                best = None
+                for pos in range(limit):
+                    match = pattern.match(string, pos, limit)
+                    if match and ((best is None) or (match.end() > best.end())):
+                        best = match
+                if not best:
+                    break
+                result.append(best.span())
+                limit = best.start()
+            return result
+
+        patterns = [
+            '.', '..', 'ab|b', 'b|ab', '[ab]b|b|b|cab', 'a{1,4}', 'a{2,3}|b',
+            'abc|bcd|cde|b', '(?<=a)b{1,3}?', 'ba{0,2}b', '[^c]{3}',
+            ]
+        strings = ['', 'a', 'b', 'ab', 'abab', 'cabb', 'abcabb', 'aaaaaaa', 'abcdeabcdebbb', 'baabaaab', 'xyz']
+        for pattern in patterns:
+            p = re.compile(pattern)
+            w = width(p)
+            self.assertTrue(w, pattern)
+            for string in strings:
+                expected = brute_force(p, string)
+                got = [m.span() for m in big_text._reversed_re_finditer_bounded(p, string, w)]
+                self.assertEqual(got, expected, (pattern, string))
+                got = [m.span() for m in big.reversed_re_finditer(p, string)]
+                self.assertEqual(got, expected, (pattern, string))
+
+        # long strings make the bounded algorithm
+        # extend its window to the left several times.
+        p = re.compile('x|yx')
+        s = 'yx' + ('-' * 10_000) + 'x' + ('-' * 5_000)
+        self.assertEqual([m.span() for m in big.reversed_re_finditer(p, s)], [(10_002, 10_003), (0, 2)])
+        self.assertEqual(big.re_rpartition(s, p)[0], s[:10_002])
+
+        # the general algorithm must agree with the bounded one.
+        # each unbounded variant adds an alternative that never
+        # matches, but forces reversed_re_finditer onto the general path.
+        for pattern in patterns:
+            p = re.compile(pattern)
+            variants = [re.compile(pattern + suffix) for suffix in ('|q+', '|(?=q)q')]
+            for variant in variants:
+                self.assertIsNone(width(variant), variant.pattern)
+            for string in strings:
+                expected = brute_force(p, string)
+                got = [m.span() for m in big_text._reversed_re_finditer(p, string)]
+                self.assertEqual(got, expected, (pattern, string))
+                for variant in variants:
+                    got = [m.span() for m in big.reversed_re_finditer(variant, string)]
+                    self.assertEqual(got, expected, (variant.pattern, string))
+                    if expected:
+                        start, end = expected[0]
+                        before, separator, after = big.re_rpartition(string, variant)
+                        self.assertEqual((before, separator.group(0), after), (string[:start], string[start:end], string[end:]), (variant.pattern, string))
+
+        # the general algorithm doesn't keep the matches inside a
+        # forward match that end inside it, until it yields one
+        # that ends past it.  here "b" is hidden inside "abcd"
+        # until it yields "cde".
+        p = re.compile('abcd|b|cde|q+')
+        self.assertEqual([m.span() for m in big.reversed_re_finditer(p, 'abcde')], brute_force(p, 'abcde'))
+        self.assertEqual([m.span() for m in big.reversed_re_finditer(p, 'abcde')], [(2, 5), (1, 2)])
+
+        # unbounded patterns, where it has to ask re whether
+        # anything further left could end further right.
+        for pattern in (r'\w+ ', r'\w+', 'a+', r'a+b|ba+', r'[ab]+c|bc+'):
+            p = re.compile(pattern)
+            for string in ('alpha beta gamma ' * 10, ('a' * 20 + '-') * 10, 'aaabaaac' * 5, 'abcccbabcc' * 5):
+                expected = brute_force(p, string)
+                got = [m.span() for m in big.reversed_re_finditer(p, string)]
+                self.assertEqual(got, expected, (pattern, string))
+                got = [m.span() for m in itertools.islice(big.reversed_re_finditer(p, string), 1)]
+                self.assertEqual(got, expected[:1], (pattern, string))
+
     def test_re_partition(self):
         def test_re_partition(s, pattern, count, expected):
             self.assertEqual(group0(big.re_partition(c(s), c(pattern), count)), c(expected))
@@ -1011,6 +1114,12 @@ class BigTextTests(unittest.TestCase):
         with self.assertRaises(ValueError):
             big.multistrip('abcde', ('c', ''))
 
+        # regression test: multistrip used to anchor the right strip with '$',
+        # which also matches just before a trailing linebreak.
+        self.assertEqual(big.multistrip('a,\n', ','), 'a,\n')
+        self.assertEqual(big.multistrip(b'a,\n', b','), b'a,\n')
+        self.assertEqual(big.multistrip('a,\n', ',\n'), 'a')
+
 
     def test_multisplit(self):
         """
@@ -2124,6 +2233,95 @@ class BigTextTests(unittest.TestCase):
             )
 
 
+    def test_multisplit_stream(self):
+        """
+        multisplit_stream should always produce exactly the
+        same output as multisplit, no matter how you chunk the input.
+        """
+        def chunked(s, size):
+            return [s[i:i+size] for i in range(0, len(s), size)]
+
+        strings = (
+            '',
+            'a',
+            ',',
+            'a,b',
+            ',a,,b,',
+            ' a b  c   ',
+            'a  b\t\tc\n\n',
+            '\r\n a\r\nb \r\n\r',
+            'a,b,\n',
+            'xaab',
+            'xaabaa',
+            'XabcdabcY',
+            'abcXXabcabcYYabc',
+            'WWabXXcdYYabZZab',
+            'oqaXaaXbbqXbo',
+            )
+
+        all_separators = (
+            None,
+            ',',
+            ',\n',
+            ('aa', 'ab'),
+            ('a', 'abc', 'ab'),
+            ('ab', 'cd', 'abcd', 'bc'),
+            ('aX', 'Xb', 'o'),
+            ('\r\n', '\r', '\n', ' '),
+            )
+
+        for s, separators, c in itertools.product(strings, all_separators, (unchanged, to_bytes)):
+            if (c == to_bytes) and (separators is None) and (not s):
+                # an empty stream with separators=None is always str
+                continue
+            s = c(s)
+            if separators is not None:
+                separators = c(separators)
+            for keep, separate, strip, maxsplit in itertools.product(
+                (False, True, big.ALTERNATING, big.AS_PAIRS),
+                (False, True),
+                (False, True, big.LEFT, big.RIGHT, big.PROGRESSIVE),
+                (-1, 0, 1, 3),
+                ):
+                kwargs = dict(keep=keep, separate=separate, strip=strip, maxsplit=maxsplit)
+                expected = list(big.multisplit(s, separators, **kwargs))
+                for size in (1, 3, 50):
+                    got = list(big.multisplit_stream(chunked(s, size), separators, **kwargs))
+                    self.assertEqual(got, expected, msg=f"s={s!r} separators={separators!r} size={size} {kwargs}")
+
+        # file-like objects
+        import io
+        text = 'alpha beta\tgamma\n\ndelta  epsilon\n' * 100
+        self.assertEqual(list(big.multisplit_stream(io.StringIO(text), chunk_size=7)), list(big.multisplit(text)))
+        data = text.encode('ascii')
+        self.assertEqual(list(big.multisplit_stream(io.BytesIO(data), (b'\n', b' '), keep=True, chunk_size=13)), list(big.multisplit(data, (b'\n', b' '), keep=True)))
+
+        # it really is incremental
+        def generator():
+            yield 'a,b,c'
+            raise RuntimeError("read too far!")
+        i = big.multisplit_stream(generator(), ',')
+        self.assertEqual(next(i), 'a')
+        self.assertEqual(next(i), 'b')
+        with self.assertRaises(RuntimeError):
+            next(i)
+
+        # empty streams
+        self.assertEqual(list(big.multisplit_stream([])), [''])
+        self.assertEqual(list(big.multisplit_stream([], b',')), [b''])
+        self.assertEqual(list(big.multisplit_stream([], [b','], keep=big.AS_PAIRS)), [(b'', b'')])
+
+        with self.assertRaises(TypeError):
+            big.multisplit_stream(['abc'], b',')
+        with self.assertRaises(TypeError):
+            big.multisplit_stream([b'abc'], ',')
+        with self.assertRaises(TypeError):
+            big.multisplit_stream([3], ',')
+        with self.assertRaises(TypeError):
+            list(big.multisplit_stream(['abc', b'def'], ','))
+        with self.assertRaises(ValueError):
+            big.multisplit_stream(['abc'], ())
+
     def test_multipartition(self):
         def test_multipartition(s, separator, count, expected, *, reverse=False):
              for _ in range(2):
@@ -2218,6 +2416,149 @@ class BigTextTests(unittest.TestCase):
         with self.assertRaises(ValueError):
             big.multipartition("a x x b y y c", (" x ", " y "), -1)
 
+    def test_multisplit_reverse_window(self):
+        # reverse multisplit only reverses a window at the end of s,
+        # growing it as needed.  shrink the window so these short
+        # strings need several windows, and check we get the same
+        # answers as when the window covers the whole string.
+        import big.text as big_text
+        saved = big_text._multisplit_reversed_window
+        strings = ['', 'a', 'xxaxybyyc', 'A x x Z', 'ab b a b aab', ' a  b   c    ', 'xyxyxyx y xyx']
+        try:
+            for separators in (None, ('x', 'xy', 'y'), (' x ',), ('ab', 'b', 'a b'), ('xyx', 'yxy', 'x')):
+                for keep, separate, strip in itertools.product(
+                    (False, True, big.ALTERNATING, big.AS_PAIRS),
+                    (False, True),
+                    (False, True, big.LEFT, big.RIGHT, big.PROGRESSIVE),
+                    ):
+                    for s in strings:
+                        for maxsplit in (-1, 1, 2, 3):
+                            big_text._multisplit_reversed_window = 2**30
+                            expected = list(big.multisplit(s, separators, keep=keep, maxsplit=maxsplit, reverse=True, separate=separate, strip=strip))
+                            for window in (1, 2, 3):
+                                big_text._multisplit_reversed_window = window
+                                got = list(big.multisplit(s, separators, keep=keep, maxsplit=maxsplit, reverse=True, separate=separate, strip=strip))
+                                self.assertEqual(got, expected)
+        finally:
+            big_text._multisplit_reversed_window = saved
+
+    def test_separators_trie(self):
+        # large sets of separators use a trie-shaped pattern.
+        # it must match exactly what the alternation matches.
+        import big.text as big_text
+        saved_threshold = big.set_multisplit_trie_threshold(1)
+        saved_max_depth = big_text._separators_trie_max_depth
+
+        try:
+            self.assertEqual(big_text._separators_to_re(('abc', 'abd', 'ab', 'x', 'a'), False), '(?:a(?:b(?:c|d)?)?|x)+')
+            self.assertEqual(big_text._separators_to_re(('xyz', 'xy'), False, separate=True), 'xy(?:z)?')
+            self.assertEqual(big_text._separators_to_re((b'a ', b'a\n', b' '), True, separate=True, keep=True), b'(a(?: |\n)| )')
+
+            # too deep?  use the alternation.
+            big_text._separators_trie_max_depth = 2
+            self.assertEqual(big_text._separators_to_re(('a', 'aa', 'aaa', 'aaaa'), False, separate=True), 'aaaa|aaa|aa|a')
+            big_text._separators_trie_max_depth = saved_max_depth
+
+            strings = ['', 'a', 'xxaxybyyc', 'A x x Z', 'ab b a b aab', ' a  b   c    ', 'xyxyxyx y xyx', 'abcabdab xab\n']
+            for separators in (('x', 'xy', 'y'), (' x ',), ('ab', 'b', 'a b'), ('xyx', 'yxy', 'x'), ('abc', 'abd', 'ab', 'x', ' ', '\n', 'b a')):
+                for c in (unchanged, to_bytes):
+                    separators = c(separators)
+                    for s in strings:
+                        s = c(s)
+                        results = []
+                        for threshold in (None, 1):
+                            big.set_multisplit_trie_threshold(threshold)
+                            result = []
+                            for keep, separate, strip, reverse in itertools.product(
+                                (False, True, big.ALTERNATING, big.AS_PAIRS),
+                                (False, True),
+                                (False, True, big.LEFT, big.RIGHT, big.PROGRESSIVE),
+                                (False, True),
+                                ):
+                                result.append(list(big.multisplit(s, separators, keep=keep, separate=separate, strip=strip, reverse=reverse)))
+                            result.append(big.multistrip(s, separators))
+                            result.append(big.multipartition(s, separators))
+                            result.append(big.multirpartition(s, separators, 2))
+                            result.append(big.normalize_whitespace(s, separators))
+                            results.append(result)
+                        self.assertEqual(results[0], results[1])
+
+            # and the default threshold kicks in for a big set of separators.
+            self.assertEqual(big.set_multisplit_trie_threshold(saved_threshold), 1)
+            self.assertEqual(saved_threshold, 32)
+            separators = tuple(f"<{i}>" for i in range(1000))
+            self.assertTrue(big_text._separators_to_re(separators, False).startswith('(?:<(?:'))
+            self.assertEqual(list(big.multisplit('a<1>b<999><7>c<1000>d', separators)), ['a', 'b', 'c<1000>d'])
+            self.assertEqual(big.multistrip('<12><1>x<3>y<0><99>', separators), 'x<3>y')
+            big.set_multisplit_trie_threshold(None)
+            self.assertFalse(big_text._separators_to_re(separators, False).startswith('(?:<(?:'))
+            self.assertEqual(list(big.multisplit('a<1>b<999><7>c<1000>d', separators)), ['a', 'b', 'c<1000>d'])
+        finally:
+            big.set_multisplit_trie_threshold(saved_threshold)
+            big_text._separators_trie_max_depth = saved_max_depth
+
+        with self.assertRaises(TypeError):
+            big.set_multisplit_trie_threshold('32')
+        with self.assertRaises(ValueError):
+            big.set_multisplit_trie_threshold(0)
+
+    def test_splitter(self):
+        # Splitter must behave exactly like the functions it replaces.
+        strings = ['', ' ', 'a', ' a b  c ', 'xxaxybyyc', 'A x x Z', 'ax\nyb\n', 'x y x y']
+        for separators in (None, ('x', 'xy', 'y'), (' x ',), (' ', '\n')):
+            function_separators = separators or big.whitespace
+            for keep, reverse, separate, strip in itertools.product(
+                (False, True, big.ALTERNATING, big.AS_PAIRS),
+                (False, True),
+                (False, True),
+                (False, True, big.LEFT, big.RIGHT, big.PROGRESSIVE),
+                ):
+                splitter = big.Splitter(separators, keep=keep, reverse=reverse, separate=separate, strip=strip)
+                for s in strings:
+                    for maxsplit in (-1, 0, 1, 2, None):
+                        self.assertEqual(
+                            list(splitter.split(s, maxsplit)),
+                            list(big.multisplit(s, separators, keep=keep, maxsplit=maxsplit, reverse=reverse, separate=separate, strip=strip)))
+                    for count in (0, 1, 2):
+                        self.assertEqual(splitter.partition(s, count), big.multipartition(s, function_separators, count, reverse=reverse, separate=separate))
+                        self.assertEqual(splitter.rpartition(s, count), big.multirpartition(s, function_separators, count, reverse=reverse, separate=separate))
+                    for left, right in itertools.product((False, True), repeat=2):
+                        self.assertEqual(splitter.strip(s, left, right), big.multistrip(s, function_separators, left, right))
+
+                self.assertEqual(
+                    list(splitter.split_many(strings)),
+                    [list(splitter.split(s)) for s in strings])
+
+        splitter = big.Splitter(big.bytes_whitespace, keep=big.ALTERNATING)
+        self.assertEqual(list(splitter.split(b' a  b')), [b'', b' ', b'a', b'  ', b'b'])
+        self.assertEqual(splitter.strip(b' a  b '), b'a  b')
+        self.assertEqual(splitter.partition(b'a b c'), (b'a', b' ', b'b c'))
+        self.assertEqual(splitter.rpartition(b'a b c'), (b'a b', b' ', b'c'))
+        self.assertEqual(list(splitter.split_many([b'a b', b'c'], 0)), [[b'a b'], [b'c']])
+
+        splitter = big.Splitter(',;')
+        self.assertEqual(splitter.separators, (',', ';'))
+        self.assertEqual(list(splitter.split('a,b;c')), ['a', 'b', 'c'])
+        self.assertEqual(repr(splitter), "Splitter((',', ';'), keep=False, reverse=False, separate=False, strip=False)")
+        self.assertEqual(list(big.Splitter(b',;').split(b'a,b')), [b'a', b'b'])
+
+        with self.assertRaises(TypeError):
+            splitter.split(b'a,b')
+        with self.assertRaises(TypeError):
+            splitter.strip(b'a,b')
+        with self.assertRaises(TypeError):
+            splitter.partition(b'a,b')
+        with self.assertRaises(ValueError):
+            splitter.partition('a,b', -1)
+        with self.assertRaises(ValueError):
+            big.Splitter(())
+        with self.assertRaises(TypeError):
+            big.Splitter(('a', b'b'))
+        with self.assertRaises(TypeError):
+            big.Splitter(('a', ''))
+        with self.assertRaises(TypeError):
+            big.Splitter(3)
+
 
     def test_wrap_words(self):
         def test(words, expected, margin=79):
@@ -2849,11 +3190,64 @@ class BigTextTests(unittest.TestCase):
             big.gently_title(b"the \"string's\" the thing", double_quotes=(b'"', b''))
 
 
+    def test_many(self):
+        strings = ['  a  b ', 'x\t\ty', '', '   ', 'c,d,,', ',,e']
+        separators = (' ', ',', '\t')
+        for c in (unchanged, to_bytes):
+            s = [c(o) for o in strings]
+            seps = c(separators)
+            for max_workers, chunk_size in ((None, 4096), (2, 1), (3, 2)):
+                self.assertEqual(big.multistrip_many(s, seps, max_workers=max_workers, chunk_size=chunk_size), [big.multistrip(o, seps) for o in s])
+                self.assertEqual(big.multistrip_many(iter(s), seps, left=False, max_workers=max_workers, chunk_size=chunk_size), [big.multistrip(o, seps, left=False) for o in s])
+                self.assertEqual(big.multistrip_many(tuple(s), seps, right=False), [big.multistrip(o, seps, right=False) for o in s])
+                self.assertEqual(big.multistrip_many(s, seps, left=False, right=False), s)
+                self.assertEqual(big.normalize_whitespace_many(s, max_workers=max_workers, chunk_size=chunk_size), [big.normalize_whitespace(o) for o in s])
+                self.assertEqual(big.normalize_whitespace_many(s, seps, c('\\1'), max_workers=max_workers, chunk_size=chunk_size), [big.normalize_whitespace(o, seps, c('\\1')) for o in s])
+
+        self.assertEqual(big.multistrip_many([], ' '), [])
+        self.assertEqual(big.normalize_whitespace_many(()), [])
+
+        with self.assertRaises(TypeError):
+            big.multistrip_many(['a', b'b'], 'ab')
+        with self.assertRaises(TypeError):
+            big.multistrip_many(['a', None], 'ab')
+        with self.assertRaises(TypeError):
+            big.multistrip_many([b'a'], 'ab')
+        with self.assertRaises(TypeError):
+            big.normalize_whitespace_many(['a', b'b'])
+        with self.assertRaises(TypeError):
+            big.normalize_whitespace_many(['a', 'b'], b' ')
+        with self.assertRaises(ValueError):
+            big.normalize_whitespace_many(['a', 'b'], [])
+        with self.assertRaises(ValueError):
+            big.normalize_whitespace_many(['a', 'b'], chunk_size=0)
+        with self.assertRaises(TypeError):
+            big.multistrip_many(['a', b'b'], 'ab', max_workers=2, chunk_size=1)
+
+        if numpy is None: # pragma: no cover
+            return
+
+        a = numpy.array(['  a  b ', 'x\t\ty', ''])
+        result = big.normalize_whitespace_many(a)
+        self.assertIsInstance(result, numpy.ndarray)
+        self.assertEqual(result.tolist(), [' a b ', 'x y', ''])
+        result = big.multistrip_many(numpy.array([b' a ', b'bb  ']), b' ')
+        self.assertEqual(result.dtype.kind, 'S')
+        self.assertEqual(result.tolist(), [b'a', b'bb'])
+        a = numpy.array([['  a', 'x'], ['b  ', ' ']], dtype=object)
+        result = big.normalize_whitespace_many(a, replacement='--', max_workers=2, chunk_size=1)
+        self.assertEqual(result.dtype, object)
+        self.assertEqual(result.shape, (2, 2))
+        self.assertEqual(result.tolist(), [['--a', 'x'], ['b--', '--']])
+        self.assertEqual(big.multistrip_many(numpy.array([], dtype='U'), ' ').shape, (0,))
+
     def test_normalize_whitespace(self):
         def test(s, expected, *, separators=None, replacement=" "):
             for i in range(2):
                 result = big.normalize_whitespace(s, separators=separators, replacement=replacement)
                 self.assertEqual(result, expected)
+                result = big.normalize_whitespace_many([s, s + s, s], separators=separators, replacement=replacement)
+                self.assertEqual(result, [expected, big.normalize_whitespace(s + s, separators=separators, replacement=replacement), expected])
                 if i:
                     break
 
@@ -2916,6 +3310,16 @@ class BigTextTests(unittest.TestCase):
         def test(s, expected, **kwargs):
             got = list(big.split_quoted_strings(s, **kwargs))
 
+            # QuotedStringSplitter must produce identical results
+            splitter_kwargs = dict(kwargs)
+            state = splitter_kwargs.pop('state', None)
+            if splitter_kwargs.get('quotes') in (None, big.text._sqs_quotes_str, big.text._sqs_quotes_bytes):
+                splitter_kwargs['quotes'] = big.text._sqs_quotes_bytes if isinstance(s, bytes) else big.text._sqs_quotes_str
+            if splitter_kwargs.get('escape') in (big.text._sqs_escape_str, big.text._sqs_escape_bytes):
+                del splitter_kwargs['escape']
+            splitter = big.QuotedStringSplitter(**splitter_kwargs)
+            self.assertEqual(got, list(splitter.split(s, state)))
+
             if 0:
                 import pprint
                 print("\n\n")
@@ -3234,6 +3638,60 @@ class BigTextTests(unittest.TestCase):
                 )
 
 
+    def test_split_quoted_strings_str_subclass(self):
+        # every string yielded is sliced from s, so it's the same
+        # str subclass as s--including the quote marks.
+        # (big.template relies on this.)
+        s = StrSubclass('a "b\\"" \'c\' """d\ne""" f')
+        result = list(big.split_quoted_strings(s, multiline_quotes=('"""',)))
+        self.assertEqual(result, [
+            ('', 'a ', ''),
+            ('"', 'b\\"', '"'),
+            ('', ' ', ''),
+            ("'", 'c', "'"),
+            ('', ' ', ''),
+            ('"""', 'd\ne', '"""'),
+            ('', ' f', ''),
+            ])
+        for t in result:
+            for o in t:
+                self.assertIsInstance(o, StrSubclass)
+
+    def test_quoted_string_splitter(self):
+        splitter = big.QuotedStringSplitter(multiline_quotes=('"""',))
+        self.assertEqual(splitter.quotes, ('"', "'"))
+        self.assertEqual(splitter.escape, '\\')
+        self.assertEqual(splitter.multiline_quotes, ('"""',))
+        self.assertEqual(repr(splitter), "QuotedStringSplitter(('\"', \"'\"), escape='\\\\', multiline_quotes=('\"\"\"',))")
+
+        # reusable
+        for _ in range(2):
+            self.assertEqual(list(splitter.split('a "b\\"" """c\nd""" \'e')),
+                [('', 'a ', ''), ('"', 'b\\"', '"'), ('', ' ', ''), ('"""', 'c\nd', '"""'), ('', ' ', ''), ("'", 'e', '')])
+        self.assertEqual(list(splitter.split("x' y", state="'")), [('', 'x', "'"), ('', ' y', '')])
+
+        # a single-quoted string can't contain a linebreak
+        with self.assertRaises(SyntaxError):
+            list(splitter.split('"a\nb"'))
+
+        with self.assertRaises(TypeError):
+            splitter.split(b'abc')
+        with self.assertRaises(ValueError):
+            splitter.split('abc', state='`')
+
+        # quotes that overlap each other, and the escape
+        splitter = big.QuotedStringSplitter(('ab', 'a'), escape='b', multiline_quotes=('aab',))
+        self.assertEqual(list(splitter.split('xaaby aab ab')), [('', 'x', ''), ('aab', 'y ', 'aab'), ('', ' ', ''), ('ab', '', '')])
+
+        bytes_splitter = big.QuotedStringSplitter((b'"',))
+        self.assertEqual(bytes_splitter.escape, b'\\')
+        self.assertEqual(list(bytes_splitter.split(b'a "b" c')), [(b'', b'a ', b''), (b'"', b'b', b'"'), (b'', b' c', b'')])
+
+        with self.assertRaises(ValueError):
+            big.QuotedStringSplitter(())
+        with self.assertRaises(ValueError):
+            big.QuotedStringSplitter(('"', '"'))
+
     def test_split_delimiters(self):
 
         D = big.Delimiter
@@ -3247,6 +3705,15 @@ class BigTextTests(unittest.TestCase):
             for i in range(2):
                 got = tuple(big.split_delimiters(s, delimiters=delimiters, state=state, yields=yields))
 
+                # DelimiterParser must produce the same values, however we chunk s.
+                for chunk_size in (1, 2, 5):
+                    parser = big.DelimiterParser(delimiters, state=state, yields=yields)
+                    values = []
+                    for j in range(0, len(s), chunk_size):
+                        values.extend(parser.feed(s[j:j + chunk_size]))
+                    values.extend(parser.close())
+                    self.assertEqual(got, tuple(values))
+
                 flattened = []
                 for t in got:
                     flattened.extend(t)
@@ -3608,6 +4075,70 @@ class BigTextTests(unittest.TestCase):
             self.assertIsInstance(close, SS)
             self.assertIsInstance(change, SS)
 
+    def test_delimiter_parser(self):
+        def SDV(t, o, cl, ch, yields=3):  return big.SplitDelimitersValue(t, o, cl, ch, yields)
+
+        # values come out as soon as they're certain.
+        parser = big.DelimiterParser()
+        self.assertEqual(parser.feed('foo(b'), [SDV('foo', '(', '', '')])
+        self.assertEqual(parser.feed('ar) "x'), [SDV('bar', '', ')', ''), SDV(' ', '"', '', '')])
+        self.assertEqual(parser.feed(' \\'), [])
+        self.assertEqual(parser.feed('" y"'), [SDV('x \\" y', '', '"', '')])
+        self.assertEqual(parser.close(), [])
+        self.assertEqual(parser.close(), [])
+        with self.assertRaises(ValueError):
+            parser.feed('x')
+
+        # a quote mark might be the start of a triple-quote,
+        # so the parser waits for more text.
+        parser = big.DelimiterParser(big.python_delimiters)
+        self.assertEqual(parser.feed('x = "'), [])
+        self.assertEqual(parser.feed('""abc""'), [SDV('x = ', '"""', '', '', 4)])
+        self.assertEqual(parser.feed('"'), [])
+        self.assertEqual(parser.close(), [SDV('abc', '', '"""', '', 4)])
+
+        # tokens straddling chunks.
+        source = 'x = f"""a{b!r:>{width}}c""" # (comment\ny = rb\'\\\'\'\n'
+        expected = list(big.split_delimiters(source, big.python_delimiters))
+        for chunk_size in range(1, 8):
+            parser = big.DelimiterParser(big.python_delimiters)
+            got = []
+            for i in range(0, len(source), chunk_size):
+                got.extend(parser.feed(source[i:i + chunk_size]))
+            got.extend(parser.close())
+            self.assertEqual(got, expected)
+
+        # state and yields work just like split_delimiters.
+        parser = big.DelimiterParser(state='([', yields=4)
+        self.assertEqual(parser.feed('a]b)c'), [SDV('a', '', ']', '', 4), SDV('b', '', ')', '', 4)])
+        self.assertEqual(parser.close(), [SDV('c', '', '', '', 4)])
+
+        # delimiters=None picks the defaults based on the first chunk.
+        parser = big.DelimiterParser(None)
+        self.assertEqual(parser.feed(b'(x)'), [SDV(b'', b'(', b'', b''), SDV(b'x', b'', b')', b'')])
+        with self.assertRaises(TypeError):
+            parser.feed('y')
+
+        # nothing fed, nothing returned.
+        self.assertEqual(big.DelimiterParser(None).close(), [])
+
+        # errors are reported with their index in the whole input.
+        parser = big.DelimiterParser()
+        parser.feed('abc(')
+        with self.assertRaises(SyntaxError) as cm:
+            parser.feed('de]')
+        self.assertIn('index 6', str(cm.exception))
+
+        parser = big.DelimiterParser()
+        parser.feed('"abc\\')
+        with self.assertRaises(SyntaxError):
+            parser.close()
+
+        with self.assertRaises(ValueError):
+            big.DelimiterParser({})
+        with self.assertRaises(ValueError):
+            big.DelimiterParser(state='x')
+
 
 
     def test_lines(self):
@@ -6095,6 +6095,230 @@ class BigLinkedListTests(unittest.TestCase):
 
         self.assertIs(linked_list([1]).__lt__(object()), NotImplemented)
 
+    def test_regression_list_index_skips_special_nodes(self):
+        # indexing into the list used to count special nodes,
+        # so removing a node an iterator pointed at threw off
+        # every subsequent index.
+        t = linked_list('abcdefg')
+        it = t.find('b')
+        t.remove('b')
+        it2 = t.find('f')
+        del t[4]
+        self.assertTrue(it.special)
+        self.assertTrue(it2.special)
+        self.assertEqual(t[1], 'c')
+        self.assertEqual(t[4], 'g')
+        self.assertEqual(t[-4], 'c')
+        self.assertEqual(list(t[1:]), ['c', 'd', 'e', 'g'])
+        self.assertEqual(list(t[::-1]), ['g', 'e', 'd', 'c', 'a'])
+        self.assertEqual(list(t[2:0:-1]), ['d', 'c'])
+        t.insert(1, 'B')
+        self.assertLinkedListEqual(t, ['a', 'B', 'c', 'd', 'e', 'g'])
+
+    def test_linked_list_indexed(self):
+        saved_block_size = big.types._linked_list_index_block_size
+        big.types._linked_list_index_block_size = 2
+        try:
+            t = linked_list(range(10), indexed=True)
+            self.assertEqual(repr(t), "linked_list([0, 1, 2, 3, 4, 5, 6, 7, 8, 9], indexed=True)")
+            self.assertEqual(t[7], 7)
+            self.assertEqual(t[-1], 9)
+
+            for copied in (
+                copy.copy(t),
+                t.copy(),
+                copy.deepcopy(t),
+                pickle.loads(pickle.dumps(t)),
+                t + [10],
+                t * 2,
+                ):
+                self.assertIsNotNone(copied._index)
+                self.assertEqual(copied[3], 3)
+            self.assertIsNone(t.cut()._index)
+            self.assertIsNone(linked_list([1, 2])._index)
+
+            # an indexed linked_list must behave identically to a list,
+            # including when iterators pin removed (special) nodes.
+            t = linked_list(indexed=True)
+            l = []
+            iterators = []
+            for i in range(600):
+                length = len(l)
+                op = i % 12
+                if op in (0, 1, 2):
+                    index = (i * 7) % (length + 3) - 1
+                    t.insert(index, i)
+                    l.insert(index, i)
+                elif op == 3:
+                    t.append(i)
+                    l.append(i)
+                elif op == 4:
+                    t.prepend(i)
+                    l.insert(0, i)
+                elif (op == 5) and length:
+                    index = (i * 5) % length
+                    self.assertEqual(t.pop(index), l.pop(index))
+                elif (op == 6) and length:
+                    index = (i * 3) % length
+                    it = iter(t)
+                    for _ in range(index + 1):
+                        next(it)
+                    iterators.append(it)
+                    if len(iterators) > 3:
+                        iterators.pop(0)
+                    del t[index]
+                    del l[index]
+                elif (op == 7) and iterators:
+                    it = iterators[i % len(iterators)]
+                    if it.special != 'tail':
+                        it.append(i)
+                        l = list(t)
+                elif (op == 8) and length:
+                    t[1:3] = [i]
+                    l[1:3] = [i]
+                elif op == 9:
+                    del t[::4]
+                    del l[::4]
+                elif op == 10:
+                    if i % 24 < 12:
+                        t.reverse()
+                        l.reverse()
+                    else:
+                        t.rotate(i)
+                        l = list(t)
+                elif (op == 11) and (length > 4):
+                    t2 = t.cut(t.find(l[1]), t.find(l[3]))
+                    t.splice(t2)
+                    l = list(t)
+                self.assertEqual(len(t), len(l))
+                for index in range(-len(l), len(l)):
+                    self.assertEqual(t[index], l[index])
+                self.assertEqual(list(t[1::3]), l[1::3])
+                self.assertEqual(list(t[::-2]), l[::-2])
+            self.assertLinkedListEqual(t, l)
+            t.clear()
+            self.assertEqual(len(t), 0)
+            with self.assertRaises(UndefinedIndexError):
+                t[0]
+            t.extend('abc')
+            self.assertEqual(t[2], 'c')
+        finally:
+            big.types._linked_list_index_block_size = saved_block_size
+
+    def test_linked_list_compact(self):
+        with self.assertRaises(ValueError):
+            linked_list(compact=True, indexed=True)
+
+        t = linked_list(range(5), compact=True)
+        self.assertEqual(repr(t), "linked_list([0, 1, 2, 3, 4], compact=True)")
+        self.assertLinkedListEqual(t, [0, 1, 2, 3, 4])
+        self.assertEqual(list(reversed(t)), [4, 3, 2, 1, 0])
+        self.assertEqual(t[3], 3)
+        self.assertEqual(list(t[::2]), [0, 2, 4])
+        self.assertEqual(t, linked_list(range(5)))
+
+        for copied in (
+            copy.copy(t),
+            t.copy(),
+            copy.deepcopy(t),
+            pickle.loads(pickle.dumps(t)),
+            t + [5],
+            t * 2,
+            ):
+            self.assertIsNotNone(copied._arena)
+            self.assertEqual(copied[3], 3)
+
+        # freed slots get reused
+        arena = t._arena
+        slots = len(arena.values)
+        for i in range(10):
+            t.popleft()
+            t.append(i)
+        self.assertEqual(len(arena.values), slots)
+
+        # special nodes, and iterators pinning them
+        t = linked_list('abcdef', compact=True)
+        it = t.find('c')
+        it2 = t.find('c')
+        t.remove('c')
+        self.assertEqual(it.special, 'special')
+        self.assertLinkedListEqual(t, list('abdef'))
+        self.assertEqual(it[1], 'd')
+        self.assertEqual(it[-1], 'b')
+        it.append('C')
+        self.assertLinkedListEqual(t, list('abCdef'))
+        t2, it3 = pickle.loads(pickle.dumps((t, it2)))
+        self.assertLinkedListEqual(t2, list('abCdef'))
+        self.assertIs(it3.linked_list, t2)
+        self.assertEqual(next(it3), 'C')
+        del it, it2, it3
+
+        t.sort(reverse=True)
+        self.assertLinkedListEqual(t, list('fedbaC'))
+        t.reverse()
+        self.assertLinkedListEqual(t, list('Cabdef'))
+        t.rotate(2)
+        self.assertLinkedListEqual(t, list('efCabd'))
+
+        # iterating and indexing walk the arrays directly
+        t = linked_list(range(3), compact=True)
+        t.extend(range(3, 6))
+        t.rextend('ab')
+        self.assertLinkedListEqual(t, ['a', 'b', 0, 1, 2, 3, 4, 5])
+        self.assertEqual([t[i] for i in range(-8, 8)], list(t) * 2)
+        it = t.find(2)
+        reverse_it = reversed(t.find(3))
+        t.remove(2)
+        t.remove(3)
+        self.assertEqual(it.special, 'special')
+        self.assertEqual(next(it), 4)
+        self.assertEqual(next(reverse_it), 1)
+        self.assertEqual(list(t), ['a', 'b', 0, 1, 4, 5])
+        self.assertEqual(list(reversed(t)), [5, 4, 1, 0, 'b', 'a'])
+        self.assertEqual(len(t._arena.values) - len(t._arena.free), 8)
+        self.assertLess(t, linked_list(['a', 'b', 0, 1, 4, 6]))
+        self.assertEqual(t, linked_list(['a', 'b', 0, 1, 4, 5], compact=True))
+        del it, reverse_it
+
+        # iterators follow their nodes through cut and splice
+        t = linked_list(range(10), compact=True)
+        three = t.find(3)
+        seven = t.find(7)
+        t2 = t.cut(t.find(2), t.find(6))
+        self.assertIsNotNone(t2._arena)
+        self.assertLinkedListEqual(t, [0, 1, 6, 7, 8, 9])
+        self.assertLinkedListEqual(t2, [2, 3, 4, 5])
+        self.assertIs(three.linked_list, t2)
+        self.assertIs(seven.linked_list, t)
+        three.remove(3)
+        self.assertEqual(three.special, 'special')
+        t.splice(t2, where=seven)
+        self.assertLinkedListEqual(t, [0, 1, 6, 7, 2, 4, 5, 8, 9])
+        self.assertLinkedListEqual(t2, [])
+        self.assertIs(three.linked_list, t)
+        self.assertEqual(next(three), 4)
+        self.assertEqual(seven[1], 2)
+
+        # splicing between compact and normal lists copies values
+        normal = linked_list('xyz')
+        t.splice(normal)
+        self.assertLinkedListEqual(t, [0, 1, 6, 7, 2, 4, 5, 8, 9, 'x', 'y', 'z'])
+        self.assertLinkedListEqual(normal, [])
+        normal.rsplice(t2)
+        compact = linked_list('uvw', compact=True)
+        normal.rsplice(compact)
+        self.assertLinkedListEqual(normal, ['u', 'v', 'w'])
+        self.assertLinkedListEqual(compact, [])
+        self.assertIsNone(normal._arena)
+
+        it = t.find(8)
+        it.truncate()
+        self.assertLinkedListEqual(t, [0, 1, 6, 7, 2, 4, 5])
+        t.clear()
+        self.assertLinkedListEqual(t, [])
+        del it, three, seven
+        self.assertEqual(len(t._arena.values) - len(t._arena.free), 2)
+
     def test_regression_imul_lock_coverage(self):
         class NoReenterLock:
             def __init__(self):